@@ -12,10 +12,11 @@ script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from utils import ConfigLoader, TagProcessor, SafeTensorsReader, YAMLHandler
+from utils import ConfigLoader, TagProcessor, SafeTensorsReader, YAMLHandler, YAMLKeyScanner
 
 # 설정 로드
 config = ConfigLoader()
+YAMLHandler.enable_cache_from_config(config)
 comfui_dir = config.get_comfui_dir()
 data_dir = config.get_data_dir()
 types = config.get_types()
@@ -52,14 +53,14 @@ def get_existing_keys_from_yml_files(lora_folder_path: str) -> set:
         if filename == 'char.yml':
             continue
         
-        yml_data = YAMLHandler.load_simple(yml_file)
-        if yml_data is None:
+        # 키만 필요하므로 전체 파싱 대신 최상위 키만 스캔 (처리할 수 없는 파일은 실제 파싱)
+        yml_keys = YAMLKeyScanner.load_keys(yml_file)
+        if yml_keys is None:
             print(f"  [오류] YML 파일을 로드할 수 없습니다: {yml_file}")
             print(f"  작업을 중단합니다.")
             sys.exit(1)
         
-        if yml_data and isinstance(yml_data, dict):
-            keys.update(yml_data.keys())
+        keys.update(yml_keys)
     
     return keys
 
@@ -87,14 +88,13 @@ def process_type(type_name: str):
     existing_keys = get_existing_keys_from_yml_files(lora_folder)
     print(f"  기존 yml 키 개수: {len(existing_keys)}개")
     
-    # lora.yml에서 기존 키 추출
-    lora_yml_data = yaml_handler.load(lora_yml_path)
-    if lora_yml_data is None:
+    # lora.yml에서 기존 키 추출 (키 스캔만 하고, 추가할 키가 있을 때만 주석 보존 방식으로 전체 로드)
+    lora_yml_keys = YAMLKeyScanner.load_keys(lora_yml_path)
+    if lora_yml_keys is None:
         print(f"  [오류] lora.yml 파일을 로드할 수 없습니다: {lora_yml_path}")
         print(f"  작업을 중단합니다.")
         sys.exit(1)
     
-    lora_yml_keys = set(lora_yml_data.keys()) if lora_yml_data else set()
     print(f"  lora.yml 키 개수: {len(lora_yml_keys)}개")
     
     # 모든 기존 키 통합
@@ -109,6 +109,12 @@ def process_type(type_name: str):
     
     print(f"  누락된 키 개수: {len(missing_keys)}개")
     
+    lora_yml_data = yaml_handler.load(lora_yml_path)
+    if lora_yml_data is None:
+        print(f"  [오류] lora.yml 파일을 로드할 수 없습니다: {lora_yml_path}")
+        print(f"  작업을 중단합니다.")
+        sys.exit(1)
+    
     # lora.yml에 누락된 키 추가
     added_count = 0
     no_tag_count = 0
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""
+해시 처리량 벤치마크 스크립트.
+
+이 PC 에서 calculate_sha256_lora.py 의 hash.block_size_mb / hash.workers 를 정하기 위해
+테스트 파일을 만든 뒤 (읽기/해시 방식) x (스레드/프로세스) x (워커 수) x (블록 크기) 조합별로
+MB/s 와 CPU 사용률을 측정하고, 표와 JSON(data_dir/hash_benchmark.json)으로 남깁니다.
+
+- 방식
+    readinto : FileHasher.sha256 (재사용 버퍼 + readinto, 기본 경로)
+    digests  : FileHasher.hash_digests (sha256 + autov1 + tensor 해시를 한 번에)
+    read     : 일반 f.read(block) + hashlib
+    mmap     : mmap 을 블록 단위로 hashlib 에 넣기
+- 테스트 파일은 safetensors 형식(8바이트 길이 + JSON 헤더 + 데이터)이라 digests 는 실제 모델처럼
+  전체 sha256 과 tensor_sha256 을 함께 계산합니다. 끝나면(중단해도) 삭제하고, --keep 이면 남겨서 다음에 다시 사용
+- --sparse 는 디스크를 쓰지 않는 희소 파일을 만들어 순수 해시(CPU) 속도를 봅니다
+- 실제 파일은 측정 전마다 posix_fadvise(DONTNEED) 로 페이지 캐시를 비우려고 시도합니다 (Linux, --warm 이면 생략)
+
+예:
+  python scripts/benchmark_hash.py --sizes-mb 512 --files 4
+  python scripts/benchmark_hash.py --sparse --strategies readinto,digests --workers 1,4,8
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from utils import ConfigLoader, FileHasher
+from utils.file_hasher import SUPPORTED_DIGESTS
+
+
+MIB = 1024 * 1024
+BENCH_DIRNAME = "hash_benchmark"
+BENCH_FILE_PREFIX = "bench_"
+RESULT_FILENAME = "hash_benchmark.json"
+STRATEGIES = ("readinto", "digests", "read", "mmap")
+EXECUTORS = ("thread", "process")
+
+
+def configure_console_encoding() -> None:
+    for stream_name in ("stdout", "stderr"):
+        stream = getattr(sys, stream_name, None)
+        if stream and hasattr(stream, "reconfigure"):
+            try:
+                stream.reconfigure(encoding="utf-8", errors="replace")
+            except Exception:
+                pass
+
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def parse_name_list(value: str, allowed: Tuple[str, ...]) -> List[str]:
+    names = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"알 수 없는 값: {', '.join(unknown)} (가능: {', '.join(allowed)})")
+    return names
+
+
+def safetensors_prefix(size: int) -> bytes:
+    """
+    전체 크기가 size 인 safetensors 파일의 앞부분(8바이트 길이 + JSON 헤더)을 만듭니다.
+    텐서 하나(U8)가 나머지 데이터 영역 전체를 차지하므로 digests 방식이 실제 모델처럼 tensor_sha256 까지 계산합니다.
+    """
+    header_size = 0
+    while True:
+        data_size = max(0, size - 8 - header_size)
+        header = json.dumps(
+            {
+                "__metadata__": {"format": "pt", "benchmark": "1"},
+                "bench": {"dtype": "U8", "shape": [data_size], "data_offsets": [0, data_size]},
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        needed = len(header) + (-(8 + len(header)) % 8)
+        if needed == header_size:
+            return struct.pack("<Q", header_size) + header + b" " * (header_size - len(header))
+        header_size = needed
+
+
+def generate_files(bench_dir: str, sizes_mb: List[int], count: int, sparse: bool) -> List[str]:
+    """
+    크기별 테스트 파일(safetensors 형식)을 만듭니다. 같은 크기/종류의 파일이 이미 있으면 다시 쓰지 않습니다.
+    """
+    os.makedirs(bench_dir, exist_ok=True)
+    kind = "sparse" if sparse else "real"
+    paths: List[str] = []
+    for size_mb in sizes_mb:
+        size = size_mb * MIB
+        for index in range(count):
+            path = os.path.join(bench_dir, f"{BENCH_FILE_PREFIX}{kind}_{size_mb}mb_{index}.safetensors")
+            paths.append(path)
+            if os.path.exists(path) and os.path.getsize(path) == size:
+                continue
+            print(f"  테스트 파일 생성: {path}")
+            prefix = safetensors_prefix(size)
+            with open(path, "wb") as f:
+                f.write(prefix)
+                if sparse:
+                    f.truncate(size)
+                    continue
+                remaining = size - len(prefix)
+                while remaining > 0:
+                    chunk = os.urandom(min(remaining, 8 * MIB))
+                    f.write(chunk)
+                    remaining -= len(chunk)
+    return paths
+
+
+def remove_files(bench_dir: str, remove_dir: bool = True) -> None:
+    """만든 테스트 파일(예전 형식 .bin 포함)을 지우고, remove_dir 이면 비어 있는 폴더도 지웁니다."""
+    if not os.path.isdir(bench_dir):
+        return
+    for name in os.listdir(bench_dir):
+        if name.startswith(BENCH_FILE_PREFIX) and name.endswith((".safetensors", ".bin")):
+            try:
+                os.remove(os.path.join(bench_dir, name))
+            except OSError:
+                pass
+    if remove_dir:
+        try:
+            os.rmdir(bench_dir)
+        except OSError:
+            pass
+
+
+def drop_cache(path: str) -> None:
+    """가능하면 파일의 페이지 캐시를 비웁니다 (Linux posix_fadvise, 실패해도 무시)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def hash_one(strategy: str, path: str, block_size: int) -> Tuple[int, float]:
+    """
+    파일 하나를 지정한 방식으로 해시합니다 (프로세스 풀에서도 쓰도록 모듈 최상위 함수).
+
+    Returns:
+        (읽은 bytes, 이 스레드가 쓴 CPU 시간 초)
+    """
+    cpu_start = time.thread_time()
+    size = os.path.getsize(path)
+    if strategy == "readinto":
+        FileHasher(block_size).sha256(path)
+    elif strategy == "digests":
+        FileHasher(block_size).hash_digests(path, SUPPORTED_DIGESTS)
+    elif strategy == "read":
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+    elif strategy == "mmap":
+        digest = hashlib.sha256()
+        if size:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, block_size):
+                        digest.update(view[offset:offset + block_size])
+                finally:
+                    view.release()
+    else:
+        raise ValueError(f"알 수 없는 방식: {strategy}")
+    return size, time.thread_time() - cpu_start
+
+
+def run_case(
+    paths: List[str], strategy: str, executor_kind: str, workers: int, block_size: int, repeat: int, warm: bool
+) -> Dict[str, Any]:
+    """조합 하나를 repeat 번 측정하고 가장 빠른 회차를 반환합니다."""
+    executor_class = ThreadPoolExecutor if executor_kind == "thread" else ProcessPoolExecutor
+    best: Dict[str, Any] = {}
+    with executor_class(max_workers=workers) as executor:
+        # 프로세스 풀 기동 비용이 측정에 섞이지 않도록 미리 워커를 띄움
+        if executor_kind == "process":
+            list(executor.map(abs, range(workers)))
+        for _ in range(max(1, repeat)):
+            if not warm:
+                for path in paths:
+                    drop_cache(path)
+            started = time.perf_counter()
+            results = list(executor.map(hash_one, [strategy] * len(paths), paths, [block_size] * len(paths)))
+            wall = time.perf_counter() - started
+            total_bytes = sum(size for size, _ in results)
+            cpu = sum(cpu_seconds for _, cpu_seconds in results)
+            mb_per_sec = total_bytes / wall / MIB if wall > 0 else 0.0
+            if not best or mb_per_sec > best["mb_per_sec"]:
+                best = {
+                    "strategy": strategy,
+                    "executor": executor_kind,
+                    "workers": workers,
+                    "block_size_mb": block_size / MIB,
+                    "bytes": total_bytes,
+                    "seconds": round(wall, 4),
+                    "mb_per_sec": round(mb_per_sec, 1),
+                    "cpu_seconds": round(cpu, 4),
+                    "cpu_percent": round(cpu / wall * 100, 1) if wall > 0 else 0.0,
+                }
+    return best
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    header = f"{'방식':<10}{'실행':<9}{'워커':>5}{'블록MiB':>9}{'MB/s':>10}{'CPU%':>8}{'초':>9}"
+    print(header)
+    print("-" * 60)
+    for row in rows:
+        print(
+            f"{row['strategy']:<10}{row['executor']:<9}{row['workers']:>5}{row['block_size_mb']:>9g}"
+            f"{row['mb_per_sec']:>10.1f}{row['cpu_percent']:>8.1f}{row['seconds']:>9.3f}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="해시 처리량 벤치마크 (블록 크기 / 워커 수 / 읽기 방식 비교)")
+    parser.add_argument("--dir", help=f"테스트 파일 폴더 (기본: data_dir/{BENCH_DIRNAME}, 측정할 디스크에 두기)")
+    parser.add_argument("--sizes-mb", type=parse_int_list, default=[256], help="테스트 파일 크기 MiB 목록 (기본 256)")
+    parser.add_argument("--files", type=int, default=4, help="크기별 파일 수 (기본 4)")
+    parser.add_argument("--sparse", action="store_true", help="희소 파일 사용 (디스크 읽기 없이 해시 속도만 측정)")
+    parser.add_argument(
+        "--strategies",
+        type=lambda value: parse_name_list(value, STRATEGIES),
+        default=["readinto", "digests", "mmap"],
+        help=f"비교할 방식 (기본 readinto,digests,mmap / 가능: {','.join(STRATEGIES)})",
+    )
+    parser.add_argument(
+        "--executors",
+        type=lambda value: parse_name_list(value, EXECUTORS),
+        default=list(EXECUTORS),
+        help="thread,process 중 비교할 실행 방식",
+    )
+    parser.add_argument("--workers", type=parse_int_list, default=[1, 2, 4], help="워커 수 목록 (기본 1,2,4)")
+    parser.add_argument("--block-sizes-mb", type=parse_int_list, default=[1, 8, 32], help="블록 크기 MiB 목록 (기본 1,8,32)")
+    parser.add_argument("--repeat", type=int, default=1, help="조합마다 반복 횟수 (가장 빠른 회차 사용)")
+    parser.add_argument("--warm", action="store_true", help="측정 전에 페이지 캐시를 비우지 않음")
+    parser.add_argument("--output", help=f"JSON 결과 경로 (기본: data_dir/{RESULT_FILENAME})")
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="끝나도 테스트 파일을 남김 (다음 실행에서 다시 사용, 기본은 중단해도 삭제)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    configure_console_encoding()
+    args = parse_args()
+    config = ConfigLoader()
+    data_dir = config.get_data_dir()
+    bench_dir = args.dir or os.path.join(data_dir, BENCH_DIRNAME)
+    output_path = args.output or os.path.join(data_dir, RESULT_FILENAME)
+
+    print("=" * 60)
+    print(f"해시 벤치마크: {bench_dir} ({'희소' if args.sparse else '실제'} 파일)")
+    print("=" * 60)
+    try:
+        return run_benchmark(args, bench_dir, output_path)
+    finally:
+        if not args.keep:
+            # 사용자가 지정한 폴더는 테스트 파일만 지우고 폴더는 남김
+            remove_files(bench_dir, remove_dir=not args.dir)
+            print(f"  테스트 파일 삭제: {bench_dir}")
+
+
+def run_benchmark(args: argparse.Namespace, bench_dir: str, output_path: str) -> int:
+    """테스트 파일을 만들고 모든 조합을 측정한 뒤 표 / 추천 설정 / JSON 을 남깁니다."""
+    paths = generate_files(bench_dir, args.sizes_mb, args.files, args.sparse)
+    total_mb = sum(os.path.getsize(path) for path in paths) / MIB
+    cases = [
+        (strategy, executor_kind, workers, block_mb)
+        for strategy in args.strategies
+        for executor_kind in args.executors
+        for workers in args.workers
+        for block_mb in args.block_sizes_mb
+    ]
+    print(f"파일 {len(paths)}개 ({total_mb:.0f}MiB), 조합 {len(cases)}개\n")
+
+    rows: List[Dict[str, Any]] = []
+    try:
+        for index, (strategy, executor_kind, workers, block_mb) in enumerate(cases, 1):
+            row = run_case(paths, strategy, executor_kind, workers, block_mb * MIB, args.repeat, args.warm)
+            rows.append(row)
+            print(
+                f"  [{index}/{len(cases)}] {strategy} {executor_kind} x{workers} {block_mb}MiB: "
+                f"{row['mb_per_sec']:.1f}MB/s, CPU {row['cpu_percent']:.0f}%"
+            )
+    except KeyboardInterrupt:
+        print("\n중단됨: 측정한 조합까지만 저장합니다.")
+
+    if rows:
+        print()
+        print_table(sorted(rows, key=lambda row: -row["mb_per_sec"]))
+        best = max(rows, key=lambda row: row["mb_per_sec"])
+        print(
+            f"\n가장 빠른 조합: {best['strategy']} / {best['executor']} / 워커 {best['workers']} / "
+            f"블록 {best['block_size_mb']:g}MiB ({best['mb_per_sec']:.1f}MB/s)"
+        )
+        # calculate_sha256_lora.py 는 스레드 워커로 hash_digests 를 실행하므로 그 조합에서만 설정을 제안
+        usable = [row for row in rows if row["executor"] == "thread" and row["strategy"] == "digests"]
+        if usable:
+            suggest = max(usable, key=lambda row: row["mb_per_sec"])
+            print(
+                f"  config.yml 예 (digests / thread 중 가장 빠른 조합, {suggest['mb_per_sec']:.1f}MB/s): "
+                f"hash: {{workers: {suggest['workers']}, block_size_mb: {max(1, int(suggest['block_size_mb']))}}}"
+            )
+        else:
+            print("  config.yml 예: digests / thread 조합을 측정하지 않아 제안할 수 없음 (--strategies digests --executors thread)")
+
+        result = {
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "host": {"platform": sys.platform, "cpu_count": os.cpu_count(), "python": sys.version.split()[0]},
+            "files": {"dir": bench_dir, "count": len(paths), "sizes_mb": args.sizes_mb, "sparse": args.sparse},
+            "warm": args.warm,
+            "repeat": args.repeat,
+            "results": rows,
+        }
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"  결과 저장: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,17 +1,15 @@
 # -*- coding: utf-8 -*-
 """
 LoRA 및 Checkpoint 파일의 SHA256 해시를 계산하고 YAML로 저장하는 스크립트
-병렬 처리 및 점진적 업데이트 지원
+디스크별 병렬 처리 및 점진적 업데이트 지원
 """
 import sys
 import os
-import glob
-import hashlib
+import argparse
 import threading
+import random
 import signal
-import shutil
-import yaml
-from typing import Dict, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 from collections import defaultdict
 from datetime import datetime
 
@@ -20,8 +18,30 @@ script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from utils import ConfigLoader, YAMLHandler
-
+from utils import (
+    BlockTreeHasher,
+    ConfigLoader,
+    FileHasher,
+    HashCatalog,
+    HashJob,
+    HashProgress,
+    HashScheduler,
+    HashStore,
+    HashTargets,
+    SafeTensorsReader,
+    TokenBucket,
+    YAMLHandler,
+)
+from utils.file_hasher import DEFAULT_BLOCK_SIZE, SUPPORTED_DIGESTS
+
+
+# --tree 블록 진행 상태 저장 폴더 (data_dir 아래)
+TREE_STATE_DIRNAME = "hash_blocks"
+# verify 결과 보고서 파일명 (data_dir 아래)
+VERIFY_REPORT_FILENAME = "verify_report.yml"
+# 처리량 지표 파일명 (data_dir 아래)
+HASH_METRICS_FILENAME = "hash_metrics.json"
+VERIFY_METRICS_FILENAME = "verify_metrics.json"
 
 # 전역 변수 - 취소 신호 처리
 shutdown_event = threading.Event()
@@ -33,105 +53,9 @@ def signal_handler(signum, frame):
     shutdown_event.set()
 
 
-def calculate_sha256(file_path: str, chunk_size: int = 65536) -> Optional[str]:
+def calculate_sha256(file_path: str, block_size: int = DEFAULT_BLOCK_SIZE) -> Optional[str]:
     """파일의 SHA256 해시를 계산합니다."""
-    sha256_hash = hashlib.sha256()
-    
-    try:
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(chunk_size), b''):
-                if shutdown_event.is_set():
-                    return None
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
-    except Exception as e:
-        print(f"  오류: SHA256 계산 실패 - {file_path}: {e}")
-        return None
-
-
-def load_existing_sha256(output_path: str, yaml_handler: YAMLHandler) -> Dict[str, str]:
-    """기존 YAML 파일에서 SHA256 정보를 로드합니다."""
-    if os.path.exists(output_path):
-        # 파일 크기 확인 (빈 파일은 건너뛰기)
-        file_size = os.path.getsize(output_path)
-        if file_size == 0:
-            print(f"  ⚠️  빈 YAML 파일: {output_path}")
-            return {}
-        
-        try:
-            # 먼저 yaml.safe_load로 안전하게 로드 시도
-            with open(output_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
-            if isinstance(data, dict):
-                return data
-            elif data is None:
-                print(f"  ⚠️  YAML 파일이 비어있음: {output_path}")
-                return {}
-                
-        except Exception as e:
-            # yaml.safe_load 실패 시 백업 생성
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = f"{output_path}.backup_{timestamp}"
-            try:
-                shutil.copy2(output_path, backup_path)
-                print(f"  ⚠️  YAML 파일 읽기 오류: {type(e).__name__}: {e}")
-                print(f"  💾 손상된 파일 백업 생성: {backup_path}")
-                print(f"  🔄 새로 생성하여 작업을 계속합니다...")
-            except Exception as backup_error:
-                print(f"  ❌ YAML 파일 읽기 실패: {type(e).__name__}: {e}")
-                print(f"  ⚠️  백업 생성 실패: {backup_error}")
-                print(f"  🔄 새로 생성하여 작업을 계속합니다...")
-    return {}
-
-
-def get_safetensors_sha256(folder_dir: str, existing_sha256: Dict[str, str], 
-                          yaml_handler: YAMLHandler, output_path: str, save_cnt: int=10) -> Dict[str, str]:
-    """폴더의 safetensors 파일들의 SHA256을 계산합니다 (점진적 업데이트)."""
-    sha256_dict = existing_sha256.copy()
-    
-    if not os.path.exists(folder_dir):
-        print(f"  경고: 디렉토리가 존재하지 않습니다: {folder_dir}")
-        return sha256_dict
-    
-    pattern = os.path.join(folder_dir, '*.safetensors')
-    safetensors_files = glob.glob(pattern)
-    
-    total_files = len(safetensors_files)
-    new_files = 0
-    
-    print(f"  발견된 파일: {total_files}개")
-    
-    sorted_files = sorted(safetensors_files)
-    
-    for idx, file_path in enumerate(sorted_files, 1):
-        if shutdown_event.is_set():
-            print(f"  취소됨: {idx-1}/{total_files}개 처리 후 중단")
-            break
-        
-        filename = os.path.basename(file_path)
-        name_without_ext = os.path.splitext(filename)[0]
-        
-        # 이미 계산된 파일 건너띄기
-        if name_without_ext in existing_sha256:
-            # print(f"    [{idx}/{total_files}] {name_without_ext} (기존)")
-            continue
-        
-        # SHA256 계산
-        sha256_value = calculate_sha256(file_path)
-        
-        if sha256_value:
-            sha256_dict[name_without_ext] = sha256_value
-            new_files += 1
-            print(f"    [{idx}/{total_files}] {name_without_ext} (신규)")
-            
-            # 주기적으로 저장 (취소 시에도 부분 저장 가능)
-            if new_files % save_cnt == 0:
-                save_sha256_yaml(sha256_dict, output_path, yaml_handler)
-        else:
-            print(f"    [{idx}/{total_files}] {name_without_ext} (실패)")
-    
-    return sha256_dict
+    return FileHasher(block_size, cancel_event=shutdown_event).sha256(file_path)
 
 
 def find_duplicate_hashes(sha256_dict: Dict[str, str]) -> Dict[str, list]:
@@ -146,41 +70,14 @@ def find_duplicate_hashes(sha256_dict: Dict[str, str]) -> Dict[str, list]:
     return duplicates
 
 
-def get_existing_safetensors_names(folder_dir: str) -> Set[str]:
-    """현재 디스크에 존재하는 safetensors 파일명(stem)만 수집합니다."""
-    if not os.path.exists(folder_dir):
-        return set()
-
-    pattern = os.path.join(folder_dir, '*.safetensors')
-    return {
-        os.path.splitext(os.path.basename(file_path))[0]
-        for file_path in glob.glob(pattern)
-    }
-
-
-def save_sha256_yaml(sha256_dict: Dict[str, str], output_path: str, yaml_handler: YAMLHandler) -> bool:
-    """SHA256 딕셔너리를 YAML 파일로 저장합니다."""
-    try:
-        # 디렉토리 생성
-        output_dir = os.path.dirname(output_path)
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
-            print(f"  디렉토리 생성: {output_dir}")
-        
-        # YAML 저장
-        if yaml_handler.save(output_path, sha256_dict):
-            print(f"  저장 완료: {output_path} ({len(sha256_dict)}개 항목)")
-            return True
-        return False
-    except Exception as e:
-        print(f"  오류: YAML 저장 실패 - {e}")
-        return False
-
-
 def save_duplicate_hashes_yaml(sha256_dict: Dict[str, str], output_path: str,
                                yaml_handler: YAMLHandler,
-                               existing_filenames: Optional[Set[str]] = None) -> bool:
-    """중복 해시를 {해시: [파일들]} 형태로 YAML 파일에 저장합니다."""
+                               existing_filenames: Optional[Set[str]] = None,
+                               distinct_by: Optional[Dict[str, str]] = None) -> bool:
+    """
+    중복 해시를 {해시: [파일들]} 형태로 YAML 파일에 저장합니다.
+    distinct_by 가 있으면 그 값(예: 파일 전체 sha256)이 그룹 안에서 2개 이상 다른 그룹만 남깁니다.
+    """
     duplicate_target = sha256_dict
     if existing_filenames is not None:
         duplicate_target = {
@@ -190,6 +87,12 @@ def save_duplicate_hashes_yaml(sha256_dict: Dict[str, str], output_path: str,
         }
 
     duplicates = find_duplicate_hashes(duplicate_target)
+    if distinct_by is not None:
+        duplicates = {
+            hash_value: files
+            for hash_value, files in duplicates.items()
+            if len({distinct_by.get(filename) for filename in files}) > 1
+        }
     
     if not duplicates:
         # 중복이 없으면 기존 파일 삭제 시도
@@ -216,163 +119,638 @@ def save_duplicate_hashes_yaml(sha256_dict: Dict[str, str], output_path: str,
         return False
 
 
-def process_char(type_name: str, config: ConfigLoader, yaml_handler: YAMLHandler):
-    """LoRA 파일을 처리합니다 (별도 스레드)."""
-    try:
-        comfui_dir = config.get_comfui_dir()
-        data_dir = config.get_data_dir()
-        
-        lora_dir = os.path.join(comfui_dir, 'models', 'loras', type_name, 'char')
-        lora_output_yaml = os.path.join(data_dir, type_name, 'sha256_char.yml')
-        
-        print(f"\n[char] {type_name} 처리 시작")
-        print(f"  원본 경로: {lora_dir}")
-        print(f"  저장 경로: {lora_output_yaml}")
-        
-        # 기존 데이터 로드
-        existing_loras = load_existing_sha256(lora_output_yaml, yaml_handler)
-        if existing_loras:
-            print(f"  기존 데이터 로드: {len(existing_loras)}개")
-        
-        # SHA256 계산
-        print("  SHA256 계산 중...")
-        lora_sha256_dict = get_safetensors_sha256(
-            lora_dir, existing_loras, yaml_handler, lora_output_yaml
-        )
-        existing_lora_names = get_existing_safetensors_names(lora_dir)
-        
-        # 최종 저장
-        if lora_sha256_dict:
-            save_sha256_yaml(lora_sha256_dict, lora_output_yaml, yaml_handler)
-            # 중복 해시 저장
-            lora_dup_output = lora_output_yaml.replace('sha256_char.yml', 'sha256_char_duplicates.yml')
-            save_duplicate_hashes_yaml(lora_sha256_dict, lora_dup_output, yaml_handler, existing_lora_names)
-            print(f"[char] {type_name} 처리 완료")
-        else:
-            print(f"[char] {type_name}: 처리할 파일이 없습니다.")
-    
-    except Exception as e:
-        print(f"[char] {type_name} 처리 중 오류: {e}")
+def prepare_target(target: Dict[str, Any], keep_provisional: bool = False) -> List[HashJob]:
+    """
+    기존 SHA256 을 로드하고, 새로 계산해야 하는 파일을 HashJob 목록으로 반환합니다.
 
-def process_lora(type_name: str, config: ConfigLoader, yaml_handler: YAMLHandler):
-    """LoRA 파일을 처리합니다 (별도 스레드)."""
-    try:
-        comfui_dir = config.get_comfui_dir()
-        data_dir = config.get_data_dir()
-        
-        lora_dir = os.path.join(comfui_dir, 'models', 'loras', type_name, 'etc')
-        lora_output_yaml = os.path.join(data_dir, type_name, 'sha256_loras.yml')
-        
-        print(f"\n[LoRA] {type_name} 처리 시작")
-        print(f"  원본 경로: {lora_dir}")
-        print(f"  저장 경로: {lora_output_yaml}")
-        
-        # 기존 데이터 로드
-        existing_loras = load_existing_sha256(lora_output_yaml, yaml_handler)
-        if existing_loras:
-            print(f"  기존 데이터 로드: {len(existing_loras)}개")
-        
-        # SHA256 계산
-        print("  SHA256 계산 중...")
-        lora_sha256_dict = get_safetensors_sha256(
-            lora_dir, existing_loras, yaml_handler, lora_output_yaml
-        )
-        
-        # 최종 저장
-        if lora_sha256_dict:
-            save_sha256_yaml(lora_sha256_dict, lora_output_yaml, yaml_handler)
-            # 중복 해시 저장
-            lora_dup_output = lora_output_yaml.replace('sha256_loras.yml', 'sha256_loras_duplicates.yml')
-            existing_lora_names = get_existing_safetensors_names(lora_dir)
-            save_duplicate_hashes_yaml(lora_sha256_dict, lora_dup_output, yaml_handler, existing_lora_names)
-            print(f"[LoRA] {type_name} 처리 완료")
-        else:
-            print(f"[LoRA] {type_name}: 처리할 파일이 없습니다.")
-    
-    except Exception as e:
-        print(f"[LoRA] {type_name} 처리 중 오류: {e}")
+    - 저장소에 없는 파일: 신규 (reason='new')
+    - size/mtime_ns 가 바뀐 파일: 재계산 (reason='changed')
+    - 예전 형식(해시만 있는) 레코드: 현재 stat 만 기록하고 재계산하지 않음
+    - 내장 해시로 만든 임시 레코드: keep_provisional 이 아니면 전체 해시 (reason='provisional')
+    - 바뀌지 않은 파일은 target['unchanged'] 에 모아 두고 검증 샘플 후보로 사용
+    """
+    label = target['label']
+    type_name = target['type_name']
+    folder_dir = target['folder_dir']
+    output_path = target['output_path']
 
+    print(f"\n[{label}] {type_name} 준비")
+    print(f"  원본 경로: {folder_dir}")
+    print(f"  저장 경로: {output_path}")
 
-def process_checkpoint(type_name: str, config: ConfigLoader, yaml_handler: YAMLHandler):
-    """Checkpoint 파일을 처리합니다 (별도 스레드)."""
-    try:
-        data_dir = config.get_data_dir()
-        
-        checkpoint_dir = config.get_checkpoint_models_dir(type_name)
-        checkpoint_output_yaml = os.path.join(data_dir, type_name, 'sha256_checkpoints.yml')
-        
-        print(f"\n[Checkpoint] {type_name} 처리 시작")
-        print(f"  원본 경로: {checkpoint_dir}")
-        print(f"  저장 경로: {checkpoint_output_yaml}")
-        
-        # 기존 데이터 로드
-        existing_checkpoints = load_existing_sha256(checkpoint_output_yaml, yaml_handler)
-        if existing_checkpoints:
-            print(f"  기존 데이터 로드: {len(existing_checkpoints)}개")
-        
-        # SHA256 계산
-        print("  SHA256 계산 중...")
-        checkpoint_sha256_dict = get_safetensors_sha256(
-            checkpoint_dir, existing_checkpoints, yaml_handler, checkpoint_output_yaml, save_cnt=1
+    store = HashStore(output_path, YAMLHandler())
+    loaded = store.load()
+    if loaded:
+        print(f"  기존 데이터 로드: {loaded}개")
+
+    target['store'] = store
+    target['lock'] = threading.Lock()
+    target['unchanged'] = []
+    target['entries'] = []
+
+    if not os.path.exists(folder_dir):
+        print(f"  경고: 디렉토리가 존재하지 않습니다: {folder_dir}")
+        return []
+
+    entries = SafeTensorsReader.scan_folder(folder_dir)
+    target['entries'] = entries
+    jobs: List[HashJob] = []
+    adopted = provisional = 0
+    for name, file_path, stat in entries:
+        if name not in store:
+            jobs.append(HashJob(file_path, name, target=target, stat=stat, reason='new'))
+        elif not store.has_stat(name):
+            store.adopt_stat(name, stat)
+            adopted += 1
+        elif not store.is_current(name, stat):
+            jobs.append(HashJob(file_path, name, target=target, stat=stat, reason='changed'))
+        elif store.is_provisional(name):
+            provisional += 1
+            if not keep_provisional:
+                jobs.append(HashJob(file_path, name, target=target, stat=stat, reason='provisional'))
+        else:
+            target['unchanged'].append(HashJob(file_path, name, target=target, stat=stat, reason='verify'))
+
+    changed = sum(1 for job in jobs if job.reason == 'changed')
+    upgraded = sum(1 for job in jobs if job.reason == 'provisional')
+    print(f"  발견된 파일: {len(entries)}개 (신규 {len(jobs) - changed - upgraded}개, 변경 {changed}개)")
+    if provisional:
+        action = "유지" if keep_provisional else "전체 해시로 교체"
+        print(f"  내장 해시 임시 레코드: {provisional}개 ({action})")
+    if adopted:
+        print(f"  예전 형식 레코드에 size/mtime 기록: {adopted}개")
+    return jobs
+
+
+def select_content_jobs(targets: List[Dict[str, Any]]) -> List[HashJob]:
+    """--content: 최신 레코드 중 tensor_sha256 이 없는(예전 형식 등) safetensors 를 다시 해시할 작업으로 반환합니다."""
+    jobs: List[HashJob] = []
+    for target in targets:
+        store: HashStore = target['store']
+        for name, file_path, stat in target['entries']:
+            record = store.get(name)
+            if not record or not store.is_current(name, stat) or store.is_provisional(name):
+                continue
+            if record.get('tensor_sha256') and record.get('tensor_index_sha256'):
+                continue
+            # 헤더가 깨진 파일은 매번 다시 읽지 않도록 제외
+            if SafeTensorsReader.read_header(file_path) is None:
+                continue
+            jobs.append(HashJob(file_path, name, target=target, stat=stat, reason='content'))
+    return jobs
+
+
+def apply_embedded_hashes(jobs: List[HashJob], sample_count: int) -> List[HashJob]:
+    """
+    --embedded: 헤더에 내장 해시(modelspec.hash_sha256 / sshs_model_hash)가 있는 신규/변경 파일은
+    파일 전체를 읽지 않고 그 값을 tensor_sha256 임시 레코드(unverified: true)로 기록합니다.
+    그중 sample_count 개는 무작위로 골라 전체 해시로 내장 값이 맞는지 확인합니다 (reason='embedded').
+
+    Returns:
+        실제로 해시할 작업 목록 (내장 해시가 없는 파일 + 확인 샘플)
+    """
+    remaining: List[HashJob] = []
+    provisional: List[HashJob] = []
+    sources: Dict[str, int] = defaultdict(int)
+    for job in jobs:
+        if job.reason not in ('new', 'changed'):
+            remaining.append(job)
+            continue
+        embedded = SafeTensorsReader.extract_embedded_hash(SafeTensorsReader.read_metadata(job.file_path))
+        if embedded is None:
+            remaining.append(job)
+            continue
+        key, value = embedded
+        job.target['store'].put(
+            job.name, {'tensor_sha256': value, 'unverified': True, 'embedded_from': key}, job.stat
         )
-        existing_checkpoint_names = get_existing_safetensors_names(checkpoint_dir)
-        
-        # 최종 저장
-        if checkpoint_sha256_dict:
-            save_sha256_yaml(checkpoint_sha256_dict, checkpoint_output_yaml, yaml_handler)
-            # 중복 해시 저장
-            checkpoint_dup_output = checkpoint_output_yaml.replace('sha256_checkpoints.yml', 'sha256_checkpoints_duplicates.yml')
-            save_duplicate_hashes_yaml(
-                checkpoint_sha256_dict, checkpoint_dup_output, yaml_handler, existing_checkpoint_names
-            )
-            print(f"[Checkpoint] {type_name} 처리 완료")
+        sources[key] += 1
+        provisional.append(job)
+
+    sample = random.sample(provisional, min(max(0, sample_count), len(provisional)))
+    for job in sample:
+        job.reason = 'embedded'
+    source_text = ", ".join(f"{key} {count}개" for key, count in sources.items()) or "없음"
+    print(f"\n내장 해시 임시 기록: {len(provisional)}개 ({source_text}), 전체 해시 확인 샘플: {len(sample)}개")
+    return remaining + sample
+
+
+def pick_verify_jobs(targets: List[Dict[str, Any]], sample_count: int) -> List[HashJob]:
+    """바뀌지 않은 파일 중 sample_count 개를 무작위로 골라 강제 검증 작업으로 반환합니다."""
+    if sample_count <= 0:
+        return []
+    candidates = [job for target in targets for job in target['unchanged']]
+    return random.sample(candidates, min(sample_count, len(candidates)))
+
+
+def select_duplicate_candidates(
+    targets: List[Dict[str, Any]],
+    hasher: FileHasher,
+    edge_size: int,
+    workers: int,
+    readers_per_device: int,
+) -> List[HashJob]:
+    """
+    빠른 중복 검사 (--fast-duplicates).
+
+    1. 대상 폴더 안에서 크기가 정확히 같은 파일끼리 묶는다 (크기가 유일하면 중복일 수 없음)
+    2. 묶음 안의 파일은 앞/뒤 edge_size 바이트만 읽어서 부분 해시를 비교한다
+    3. 부분 해시까지 같은 파일 중 저장된 해시가 없거나 오래된 파일만 전체 SHA256 작업으로 반환한다
+    """
+    partial_jobs: List[HashJob] = []
+    for target in targets:
+        store: HashStore = target['store']
+        by_size: Dict[int, List[HashJob]] = defaultdict(list)
+        for name, file_path, stat in target['entries']:
+            by_size[stat.st_size].append(HashJob(file_path, name, target=target, stat=stat))
+        for group in by_size.values():
+            # 모두 이미 해시가 있으면 저장된 값만으로 중복 판단 가능
+            if len(group) > 1 and not all(store.is_current(job.name, job.stat) for job in group):
+                partial_jobs.extend(group)
+
+    print(f"\n크기가 같은 파일: {len(partial_jobs)}개 (앞/뒤 {edge_size // (1024 * 1024)}MiB 부분 해시)")
+    partial_results: Dict[int, str] = {}
+    results_lock = threading.Lock()
+
+    def on_partial(job: HashJob, partial_value: Optional[str]) -> None:
+        if partial_value:
+            with results_lock:
+                partial_results[id(job)] = partial_value
+
+    HashScheduler(
+        lambda file_path: hasher.partial_hash(file_path, edge_size),
+        workers=workers,
+        readers_per_device=readers_per_device,
+        cancel_event=shutdown_event,
+    ).run(partial_jobs, on_partial)
+
+    collisions: Dict[Any, List[HashJob]] = defaultdict(list)
+    for job in partial_jobs:
+        partial_value = partial_results.get(id(job))
+        if partial_value:
+            collisions[(id(job.target), job.size, partial_value)].append(job)
+
+    jobs: List[HashJob] = []
+    for group in collisions.values():
+        if len(group) < 2:
+            continue
+        for job in group:
+            store = job.target['store']
+            if store.is_current(job.name, job.stat):
+                continue
+            job.reason = 'changed' if job.name in store else 'new'
+            jobs.append(job)
+    print(f"부분 해시 충돌(전체 해시 필요): {len(jobs)}개")
+    return jobs
+
+
+def merge_tree_digests(store: HashStore, job: HashJob, digests: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    트리 해시만 계산한 결과는, 파일이 그대로인(size/mtime 이 같은) 기존 레코드의 다이제스트
+    (sha256 / autov2 / tensor_sha256 등) 옆에 추가합니다. 파일이 바뀌었으면 결과 그대로.
+    """
+    if digests.get('sha256') or not digests.get('tree_sha256'):
+        return digests
+    previous = store.get(job.name)
+    if not previous or job.stat is None or not store.is_current(job.name, job.stat) or store.is_provisional(job.name):
+        return digests
+    return {**HashStore.digests_of(previous), **digests}
+
+
+def make_result_handler(total_jobs: int):
+    """워커 스레드에서 호출되는 결과 처리 콜백을 만듭니다."""
+    done = [0]
+    done_lock = threading.Lock()
+    reason_labels = {'new': '신규', 'changed': '변경', 'content': '내용 해시 추가', 'provisional': '내장 해시 → 전체 해시'}
+
+    def on_result(job: HashJob, digests: Optional[Dict[str, str]]) -> None:
+        target = job.target
+        store: HashStore = target['store']
+        with done_lock:
+            done[0] += 1
+            idx = done[0]
+
+        with target['lock']:
+            prefix = f"    [{idx}/{total_jobs}] [{target['label']}] {target['type_name']} {job.name}"
+            if not digests:
+                print(f"{prefix} (실패)")
+                return
+
+            if job.reason == 'verify':
+                same = HashStore.same_content(store.get(job.name), digests)
+                if same:
+                    print(f"{prefix} (검증 OK)")
+                    return
+                if same is None:
+                    # 다른 종류의 해시로 덮어쓰면 기존 다이제스트를 잃으므로 기록은 그대로 둔다
+                    print(f"{prefix} (검증 불가: 해시 종류가 달라 건너뜀)")
+                    return
+                print(f"{prefix} (검증 불일치)")
+                print(f"      기존: {store.get_hash(job.name)}")
+                print(f"      현재: {HashStore.identity(digests)}")
+            elif job.reason == 'embedded':
+                record = store.get(job.name) or {}
+                embedded = record.get('tensor_sha256')
+                computed = digests.get('tensor_sha256')
+                if computed is None:
+                    print(f"{prefix} (내장 해시 확인 불가: 텐서 해시 없음, 전체 해시로 교체)")
+                elif computed == embedded:
+                    print(f"{prefix} (내장 해시 확인 OK: {record.get('embedded_from')})")
+                else:
+                    print(f"{prefix} (내장 해시 불일치: {record.get('embedded_from')})")
+                    print(f"      내장: {embedded}")
+                    print(f"      계산: {computed}")
+            else:
+                print(f"{prefix} ({reason_labels.get(job.reason, '신규')})")
+
+            # 저널에 한 줄 추가 (YAML 은 finalize_target 에서 한 번만 저장)
+            store.put(job.name, merge_tree_digests(store, job, digests), job.stat)
+
+        # 같은 inode 의 다른 경로에도 같은 결과 기록
+        for alias in job.aliases:
+            alias_target = alias.target
+            with alias_target['lock']:
+                alias_store = alias_target['store']
+                alias_store.put(alias.name, merge_tree_digests(alias_store, alias, digests), alias.stat)
+                print(f"      └ [{alias_target['label']}] {alias_target['type_name']} {alias.name} (하드링크 공유)")
+
+    return on_result
+
+
+def share_inode_hashes(targets: List[Dict[str, Any]], jobs: List[HashJob]) -> List[HashJob]:
+    """
+    (st_dev, st_ino, size, mtime_ns) 가 같은 파일(하드링크)은 한 번만 해시합니다.
+
+    - 다른 경로(다른 타입/폴더 포함)에 이미 최신 레코드가 있으면 해시하지 않고 복사
+    - 해시가 필요한 작업끼리 같은 inode 면 하나만 남기고 나머지는 aliases 로 결과를 공유
+
+    Returns:
+        실제로 해시할 작업 목록
+    """
+    known: Dict[Any, Dict[str, Any]] = {}
+    for target in targets:
+        store: HashStore = target['store']
+        for name, _, stat in target['entries']:
+            key = HashStore.inode_key(stat)
+            if key is not None and store.is_current(name, stat):
+                known.setdefault(key, store.get(name))
+
+    remaining: List[HashJob] = []
+    primary: Dict[Any, HashJob] = {}
+    copied = shared = 0
+    for job in jobs:
+        key = HashStore.inode_key(job.stat) if job.reason in ('new', 'changed') else None
+        if key is None:
+            remaining.append(job)
+        elif key in known:
+            job.target['store'].put(job.name, HashStore.digests_of(known[key]), job.stat)
+            copied += 1
+        elif key in primary:
+            primary[key].aliases.append(job)
+            shared += 1
         else:
-            print(f"[Checkpoint] {type_name}: 처리할 파일이 없습니다.")
-    
-    except Exception as e:
-        print(f"[Checkpoint] {type_name} 처리 중 오류: {e}")
+            primary[key] = job
+            remaining.append(job)
+
+    if copied or shared:
+        print(f"하드링크 재사용: 기존 해시 복사 {copied}개, 이번 실행에서 공유 {shared}개")
+    return remaining
+
+
+def make_hash_func(
+    hasher: FileHasher,
+    digests: List[str],
+    tree_hasher: Optional[BlockTreeHasher] = None,
+    tree_min_size: int = 0,
+    plain_paths: Optional[Set[str]] = None,
+):
+    """
+    스케줄러에 넘길 해시 함수를 만듭니다.
+    tree_hasher 가 있으면 tree_min_size 이상인 파일은 블록 트리 해시로 계산합니다.
+    plain_paths 의 파일(기존 sha256 레코드를 검증/보완하는 작업)은 크기와 상관없이 일반 다이제스트로 계산해서
+    저장된 레코드와 같은 종류로 비교/기록합니다.
+    """
+    plain_paths = plain_paths or set()
+
+    def hash_func(file_path: str) -> Optional[Dict[str, Any]]:
+        if tree_hasher is not None and file_path not in plain_paths:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                stat = None
+            if stat is not None and stat.st_size >= tree_min_size:
+                return tree_hasher.hash_file(file_path, stat)
+        return hasher.hash_digests(file_path, digests)
+
+    return hash_func
+
+
+def make_tree_job_slots(tree_hasher: BlockTreeHasher, tree_min_size: int, plain_paths: Optional[Set[str]] = None):
+    """
+    트리 해시로 계산할 작업은 블록 스레드 수만큼(최대 readers_per_device) 디스크 읽기 슬롯을 차지하게 합니다
+    (HashScheduler.job_slots). 큰 파일을 병렬로 읽는 동안 같은 디스크에서 다른 파일을 더 열지 않기 위해.
+    """
+    plain_paths = plain_paths or set()
+
+    def job_slots(job: HashJob) -> int:
+        if job.file_path in plain_paths or job.size < tree_min_size:
+            return 1
+        return tree_hasher.workers
+
+    return job_slots
+
+
+def catalog_records(target: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """카탈로그에 넣을 레코드: 디스크에 있는 파일 중 해시 레코드가 있는 것."""
+    store: HashStore = target['store']
+    return [
+        dict(store.get(name), path=file_path, name=name)
+        for name, file_path, _ in target['entries']
+        if name in store
+    ]
 
-def process_diffusion_model(type_name: str, config: ConfigLoader, yaml_handler: YAMLHandler):
-    """Diffusion Model (UNet 등) 파일을 처리합니다 (별도 스레드)."""
+
+def finalize_target(target: Dict[str, Any], catalog: Optional[HashCatalog] = None) -> None:
+    """저널을 최종 SHA256 YAML 로 합치고 중복 해시 YAML 저장, 해시 카탈로그를 갱신합니다."""
+    label = target['label']
+    type_name = target['type_name']
     try:
-        comfui_dir = config.get_comfui_dir()
-        data_dir = config.get_data_dir()
-        
-        # diffusion_models 폴더 경로 확인 (타입별 서브폴더 우선, 없으면 루트 확인)
-        diff_dir = os.path.join(comfui_dir, 'models', 'diffusion_models', type_name)
-        if not os.path.exists(diff_dir):
-            diff_dir = os.path.join(comfui_dir, 'models', 'diffusion_models')
-            
-        if not os.path.exists(diff_dir):
+        store: HashStore = target['store']
+        if catalog is not None:
+            # 파일이 모두 사라진 폴더도 카탈로그에서 지워지도록 먼저 동기화
+            cataloged = catalog.sync(type_name, target['category'], catalog_records(target))
+            if cataloged:
+                print(f"  카탈로그 갱신: {cataloged}개")
+        if not len(store):
+            print(f"[{label}] {type_name}: 처리할 파일이 없습니다.")
             return
-            
-        output_yaml = os.path.join(data_dir, type_name, 'sha256_diffusion_models.yml')
-        
-        print(f"\n[Diffusion] {type_name} 처리 시작")
-        print(f"  원본 경로: {diff_dir}")
-        print(f"  저장 경로: {output_yaml}")
-        
-        existing_data = load_existing_sha256(output_yaml, yaml_handler)
-        sha256_dict = get_safetensors_sha256(
-            diff_dir, existing_data, yaml_handler, output_yaml, save_cnt=1
+
+        store.compact()
+        # 중복 해시 저장 (디스크에 있고 size/mtime 이 맞는 레코드만 비교)
+        current_names = {
+            name for name, _, stat in target['entries']
+            if store.is_current(name, stat)
+        }
+        # 트리 해시(블록 크기에 따라 값이 다름)는 sha256 과 비교할 수 없으므로 sha256 이 있는 레코드만
+        hashes = store.sha256_hashes()
+        tree_only = sum(1 for name in current_names if name not in hashes and store.get_hash(name))
+        if tree_only:
+            print(f"  트리 해시만 있는 레코드 {tree_only}개는 sha256 중복 비교에서 제외")
+        save_duplicate_hashes_yaml(hashes, target['duplicates_path'], store.yaml_handler, current_names)
+        # 텐서 데이터는 같고 파일(메타데이터)만 다른 중복
+        save_duplicate_hashes_yaml(
+            store.content_hashes(),
+            target['content_duplicates_path'],
+            store.yaml_handler,
+            current_names,
+            distinct_by=hashes,
         )
-        existing_names = get_existing_safetensors_names(diff_dir)
-        
-        if sha256_dict:
-            save_sha256_yaml(sha256_dict, output_yaml, yaml_handler)
-            dup_output = output_yaml.replace('sha256_diffusion_models.yml', 'sha256_diffusion_models_duplicates.yml')
-            save_duplicate_hashes_yaml(sha256_dict, dup_output, yaml_handler, existing_names)
-            print(f"[Diffusion] {type_name} 처리 완료")
-        else:
-            print(f"[Diffusion] {type_name}: 처리할 파일이 없습니다.")
-            
+        print(f"[{label}] {type_name} 처리 완료")
     except Exception as e:
-        print(f"[Diffusion] {type_name} 처리 중 오류: {e}")
+        print(f"[{label}] {type_name} 처리 중 오류: {e}")
+
+
+def select_verify_jobs(targets: List[Dict[str, Any]], max_files: int = 0) -> List[HashJob]:
+    """
+    verify 대상: 디스크에 있고 size/mtime 이 그대로인 레코드를
+    마지막 확인 시각(verified_at, 없으면 hashed_at)이 오래된 것부터 max_files 개 (0 이면 전부).
+    """
+    candidates: List[HashJob] = []
+    for target in targets:
+        store: HashStore = target['store']
+        for name, file_path, stat in target['entries']:
+            # 내장 해시 임시 레코드는 비교할 파일 해시가 없으므로 제외 (일반 실행에서 전체 해시로 교체됨)
+            if store.is_current(name, stat) and not store.is_provisional(name):
+                candidates.append(HashJob(file_path, name, target=target, stat=stat, reason='verify'))
+    candidates.sort(key=lambda job: job.target['store'].verify_order_key(job.name))
+    if max_files > 0:
+        candidates = candidates[:max_files]
+    return candidates
+
+
+def is_tree_only(record: Optional[Dict[str, Any]]) -> bool:
+    """sha256 없이 트리 해시만 있는 레코드 (verify 도 트리 해시로 계산)."""
+    return bool(record) and not record.get('sha256') and bool(record.get('tree_sha256'))
+
+
+def make_verify_hash_func(
+    hasher: FileHasher,
+    jobs: List[HashJob],
+    tree_state_dir: str,
+    tree_workers: int,
+    rate_limiter: Optional[TokenBucket],
+):
+    """저장된 레코드와 같은 종류의 해시(sha256 또는 같은 블록 크기의 tree_sha256)만 계산하는 함수를 만듭니다."""
+    records = {job.file_path: job.target['store'].get(job.name) for job in jobs}
+    tree_hashers: Dict[int, BlockTreeHasher] = {}
+    tree_lock = threading.Lock()
+
+    def hash_func(file_path: str) -> Optional[Dict[str, Any]]:
+        record = records.get(file_path) or {}
+        if not is_tree_only(record):
+            sha256_value = hasher.sha256(file_path)
+            return {'sha256': sha256_value} if sha256_value else None
+
+        block_mb = int(record.get('tree_block_mb') or 0)
+        with tree_lock:
+            tree_hasher = tree_hashers.get(block_mb)
+            if tree_hasher is None:
+                tree_hasher = BlockTreeHasher(
+                    tree_state_dir,
+                    block_size=block_mb * 1024 * 1024,
+                    workers=tree_workers,
+                    read_size=hasher.block_size,
+                    cancel_event=shutdown_event,
+                    rate_limiter=rate_limiter,
+                    on_bytes=hasher.on_bytes,
+                )
+                tree_hashers[block_mb] = tree_hasher
+        # 이전 실행의 블록 상태를 믿으면 그 블록의 손상을 못 찾으므로 항상 전부 다시 읽음
+        return tree_hasher.hash_file(file_path, resume=False)
+
+    return hash_func
+
+
+def make_verify_handler(total_jobs: int, mismatches: List[Dict[str, Any]]):
+    """verify 결과 처리 콜백. 불일치면 저장된 해시는 그대로 두고 mismatches 에 기록합니다."""
+    done = [0]
+    done_lock = threading.Lock()
+
+    def on_result(job: HashJob, digests: Optional[Dict[str, Any]]) -> None:
+        target = job.target
+        store: HashStore = target['store']
+        with done_lock:
+            done[0] += 1
+            idx = done[0]
+
+        with target['lock']:
+            prefix = f"    [{idx}/{total_jobs}] [{target['label']}] {target['type_name']} {job.name}"
+            if not digests:
+                if not shutdown_event.is_set():
+                    print(f"{prefix} (실패)")
+                return
+
+            # 해시하는 동안 파일이 바뀌었으면 다음 일반 실행에서 다시 계산
+            try:
+                changed = not store.is_current(job.name, os.stat(job.file_path))
+            except OSError:
+                changed = True
+            if changed:
+                print(f"{prefix} (변경됨, 건너뜀)")
+                return
+
+            if HashStore.same_content(store.get(job.name), digests) is False:
+                print(f"{prefix} (검증 불일치)")
+                print(f"      기존: {store.get_hash(job.name)}")
+                print(f"      현재: {HashStore.identity(digests)}")
+                store.mark_verified(job.name, ok=False)
+                mismatches.append({
+                    'type': target['type_name'],
+                    'label': target['label'],
+                    'name': job.name,
+                    'path': job.file_path,
+                    'stored': store.get_hash(job.name),
+                    'current': HashStore.identity(digests),
+                })
+                return
+
+            store.mark_verified(job.name)
+            print(f"{prefix} (검증 OK)")
+
+    return on_result
+
+
+def run_verify(
+    targets: List[Dict[str, Any]],
+    args: argparse.Namespace,
+    config: ConfigLoader,
+    hash_config: Dict[str, Any],
+    block_size: int,
+    workers: int,
+    readers_per_device: int,
+) -> None:
+    """
+    저장된 해시를 오래 확인하지 않은 파일부터 다시 계산해서 비트 손상 등을 찾습니다.
+    읽기 속도는 모든 워커가 공유하는 토큰 버킷으로 제한합니다.
+    """
+    limit_mbps = args.limit_mbps if args.limit_mbps is not None else hash_config['verify_mbps']
+    rate_limiter = TokenBucket.from_mbps(limit_mbps)
+    hasher = FileHasher(block_size, cancel_event=shutdown_event, rate_limiter=rate_limiter)
+    report_path = os.path.join(config.get_data_dir(), VERIFY_REPORT_FILENAME)
+    print(f"\n검증 모드: 읽기 제한 {f'{limit_mbps}MB/s' if rate_limiter else '없음'}, "
+          f"회당 최대 {args.max_files or '전체'}개{', 반복' if args.loop else ''}")
+
+    while not shutdown_event.is_set():
+        jobs = select_verify_jobs(targets, args.max_files)
+        print(f"\n검증 대상: {len(jobs)}개 (마지막 확인이 오래된 순)")
+        if not jobs:
+            break
+
+        mismatches: List[Dict[str, Any]] = []
+        # 트리 레코드는 파일 하나를 tree_workers 스레드로 읽고, 그동안 디스크 슬롯을 최대 readers_per_device 까지 차지
+        tree_workers = hash_config['tree_workers']
+        scheduler = HashScheduler(
+            make_verify_hash_func(
+                hasher,
+                jobs,
+                os.path.join(config.get_data_dir(), TREE_STATE_DIRNAME),
+                tree_workers,
+                rate_limiter,
+            ),
+            workers=workers,
+            readers_per_device=readers_per_device,
+            cancel_event=shutdown_event,
+            job_slots=lambda job: tree_workers if is_tree_only(job.target['store'].get(job.name)) else 1,
+        )
+        run_with_progress(
+            scheduler,
+            jobs,
+            make_verify_handler(len(jobs), mismatches),
+            args.progress_interval if args.progress_interval is not None else hash_config['progress_interval'],
+            os.path.join(config.get_data_dir(), VERIFY_METRICS_FILENAME),
+            {
+                'workers': workers,
+                'readers_per_device': readers_per_device,
+                'block_size_mb': block_size // (1024 * 1024),
+                'limit_mbps': limit_mbps,
+            },
+            [hasher],
+        )
+
+        for target in targets:
+            target['store'].compact()
+        report = {
+            'checked_at': datetime.now().isoformat(timespec='seconds'),
+            'checked': len(jobs),
+            'mismatched': mismatches,
+        }
+        if YAMLHandler().save(report_path, report):
+            print(f"\n검증 보고서 저장: {report_path} (불일치 {len(mismatches)}개)")
+
+        if not args.loop:
+            break
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="LoRA / Checkpoint SHA256 해시 계산 및 저장")
+    parser.add_argument("--type", dest="type_names", action="append")
+    parser.add_argument("--workers", type=int, help="전체 해시 워커 수 (기본: config.yml hash.workers)")
+    parser.add_argument(
+        "--readers-per-device",
+        type=int,
+        help="디스크당 동시에 읽는 워커 수 (기본: config.yml hash.readers_per_device)",
+    )
+    parser.add_argument("--block-size-mb", type=int, help="읽기 블록 크기 MiB (기본: config.yml hash.block_size_mb)")
+    parser.add_argument(
+        "--verify-sample",
+        type=int,
+        help="바뀌지 않은 파일 중 무작위로 다시 해시해서 검증할 개수 (기본: config.yml hash.verify_sample)",
+    )
+    parser.add_argument(
+        "--fast-duplicates",
+        action="store_true",
+        help="크기가 같고 앞/뒤 부분 해시가 같은 파일만 전체 해시해서 *_duplicates.yml 을 빠르게 생성",
+    )
+    parser.add_argument("--edge-size-mb", type=int, help="--fast-duplicates 부분 해시 크기 MiB (기본: config.yml hash.edge_size_mb)")
+    parser.add_argument(
+        "--tree",
+        action="store_true",
+        help="큰 신규/변경 파일을 블록 트리(Merkle) 해시로 병렬 계산 (tree_sha256 저장, 중단 시 블록 단위로 이어서 계산)",
+    )
+
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        help="진행 상태 줄 출력 간격(초), 0 = 끄기 (기본: config.yml hash.progress_interval)",
+    )
+    parser.add_argument(
+        "--content",
+        action="store_true",
+        help="텐서 데이터 해시(tensor_sha256 + 텐서 목록 해시)가 없는 기존 레코드도 다시 계산해서 *_content_duplicates.yml 작성",
+    )
+    parser.add_argument(
+        "--embedded",
+        action="store_true",
+        help="헤더의 내장 해시(modelspec.hash_sha256 / sshs_model_hash)를 임시 tensor_sha256 으로 기록하고 일부만 전체 해시로 확인",
+    )
+    parser.add_argument(
+        "--embedded-verify-sample",
+        type=int,
+        help="--embedded 로 기록한 파일 중 전체 해시로 확인할 개수 (기본: config.yml hash.embedded_verify_sample)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    verify_parser = subparsers.add_parser("verify", help="저장된 해시 재검증 (읽기 속도 제한, 오래된 것부터)")
+    verify_parser.add_argument("--limit-mbps", type=float, help="전체 읽기 속도 상한 MB/s, 0 = 제한 없음 (기본: config.yml hash.verify_mbps)")
+    verify_parser.add_argument("--max-files", type=int, default=0, help="이번 실행에서 검증할 최대 파일 수 (0 = 전체)")
+    verify_parser.add_argument("--loop", action="store_true", help="한 바퀴 끝나면 다시 처음(가장 오래된 것)부터 계속 검증")
+    return parser.parse_args()
 
 
 def main():
     """메인 함수"""
-    print("LoRA 및 Checkpoint SHA256 해시 계산 및 저장 (병렬 처리)")
+    args = parse_args()
+    print("LoRA 및 Checkpoint SHA256 해시 계산 및 저장 (디스크별 병렬 처리)")
     print("(Ctrl+C로 중단 가능, 진행 중인 작업은 완료 후 저장됨)\n")
     
     # Ctrl+C 신호 처리 등록
@@ -380,61 +758,152 @@ def main():
     
     # 설정 로드
     config = ConfigLoader()
-    types = config.get_types()
+    types = args.type_names or config.get_types()
+    hash_config = config.get_hash_config()
+    workers = args.workers or hash_config['workers']
+    readers_per_device = args.readers_per_device or hash_config['readers_per_device']
+    block_size_mb = args.block_size_mb or hash_config['block_size_mb']
+    verify_sample = args.verify_sample if args.verify_sample is not None else hash_config['verify_sample']
+    edge_size_mb = args.edge_size_mb or hash_config['edge_size_mb']
+    digests = [name for name in hash_config['digests'] if name in SUPPORTED_DIGESTS]
+    if args.content:
+        digests += [name for name in ('tensor_sha256', 'tensor_index_sha256') if name not in digests]
+    if args.embedded and 'tensor_sha256' not in digests:
+        digests.append('tensor_sha256')
     
     if not types:
         print("오류: config.yml에서 types을 찾을 수 없습니다.")
         return
     
-    # 스레드 목록
-    threads = []
-    
     print(f"{'='*60}")
     print(f"처리할 타입: {', '.join(types)}")
-    print(f"{'='*60}\n")
+    print(f"워커: {workers}개, 디스크당 동시 읽기: {readers_per_device}개, 블록: {block_size_mb}MiB")
+    print(f"다이제스트: {', '.join(digests)}")
+    print(f"{'='*60}")
     
-    # 각 타입별로 LoRA와 Checkpoint를 병렬로 처리
+    # 모든 타입/대상의 작업을 하나의 큐로 모은다
+    targets: List[Dict[str, Any]] = []
+    jobs: List[HashJob] = []
     for type_name in types:
-        # LoRA 스레드
-        char_thread = threading.Thread(
-            target=process_char,
-            args=(type_name, config, YAMLHandler()),
-            name=f"Char-{type_name}"
+        for target in HashTargets.build(type_name, config):
+            try:
+                jobs.extend(prepare_target(target, keep_provisional=args.embedded))
+                targets.append(target)
+            except Exception as e:
+                print(f"[{target['label']}] {type_name} 준비 중 오류: {e}")
+    
+    if args.command == "verify":
+        run_verify(
+            targets, args, config, hash_config, block_size_mb * 1024 * 1024, workers, readers_per_device
         )
-        threads.append(char_thread)
-        char_thread.start()
-
-        # LoRA 스레드
-        lora_thread = threading.Thread(
-            target=process_lora,
-            args=(type_name, config, YAMLHandler()),
-            name=f"LoRA-{type_name}"
+        finish_run(targets, config)
+        return
+
+    hasher = FileHasher(block_size_mb * 1024 * 1024, cancel_event=shutdown_event)
+    if args.fast_duplicates:
+        jobs = select_duplicate_candidates(
+            targets, hasher, edge_size_mb * 1024 * 1024, workers, readers_per_device
         )
-        threads.append(lora_thread)
-        lora_thread.start()
-        
-        # Checkpoint 스레드
-        checkpoint_thread = threading.Thread(
-            target=process_checkpoint,
-            args=(type_name, config, YAMLHandler()),
-            name=f"Checkpoint-{type_name}"
+    else:
+        if args.content:
+            content_jobs = select_content_jobs(targets)
+            print(f"\n내용 해시(tensor_sha256)가 없는 기존 레코드: {len(content_jobs)}개")
+            jobs.extend(content_jobs)
+        if args.embedded:
+            embedded_sample = args.embedded_verify_sample
+            if embedded_sample is None:
+                embedded_sample = hash_config['embedded_verify_sample']
+            jobs = apply_embedded_hashes(jobs, embedded_sample)
+        verify_jobs = pick_verify_jobs(targets, verify_sample)
+        print(f"\n총 신규/변경 파일: {len(jobs)}개, 검증 샘플: {len(verify_jobs)}개")
+        jobs.extend(verify_jobs)
+    jobs = share_inode_hashes(targets, jobs)
+    tree_hasher = None
+    tree_min_size = hash_config['tree_min_size_mb'] * 1024 * 1024
+    # 기존 sha256 레코드를 검증/보완하는 작업은 트리 해시 대신 같은 종류로 계산
+    plain_paths = {
+        job.file_path for job in jobs
+        if job.reason in ('verify', 'content') and not is_tree_only(job.target['store'].get(job.name))
+    }
+    job_slots = None
+    if args.tree:
+        tree_hasher = BlockTreeHasher(
+            os.path.join(config.get_data_dir(), TREE_STATE_DIRNAME),
+            block_size=hash_config['tree_block_mb'] * 1024 * 1024,
+            # 블록 스레드 수는 readers_per_device 와 별개 (파일 하나를 병렬로 읽는 것이 목적)
+            workers=hash_config['tree_workers'],
+            read_size=block_size_mb * 1024 * 1024,
+            cancel_event=shutdown_event,
         )
-        threads.append(checkpoint_thread)
-        checkpoint_thread.start()
-
-        # Diffusion Model 스레드
-        diff_thread = threading.Thread(
-            target=process_diffusion_model,
-            args=(type_name, config, YAMLHandler()),
-            name=f"Diffusion-{type_name}"
+        print(
+            f"트리 해시: {hash_config['tree_min_size_mb']}MiB 이상 파일, "
+            f"블록 {tree_hasher.block_mb}MiB, 파일당 {tree_hasher.workers}스레드"
         )
-        threads.append(diff_thread)
-        diff_thread.start()
-    
-    # 모든 스레드가 완료될 때까지 대기
-    for thread in threads:
-        thread.join()
-    
+        job_slots = make_tree_job_slots(tree_hasher, tree_min_size, plain_paths)
+    scheduler = HashScheduler(
+        make_hash_func(hasher, digests, tree_hasher, tree_min_size, plain_paths),
+        workers=workers,
+        readers_per_device=readers_per_device,
+        cancel_event=shutdown_event,
+        job_slots=job_slots,
+    )
+    run_with_progress(
+        scheduler,
+        jobs,
+        make_result_handler(len(jobs)),
+        args.progress_interval if args.progress_interval is not None else hash_config['progress_interval'],
+        os.path.join(config.get_data_dir(), HASH_METRICS_FILENAME),
+        {
+            'workers': workers,
+            'readers_per_device': readers_per_device,
+            'block_size_mb': block_size_mb,
+            'digests': digests,
+            'tree': bool(args.tree),
+            'embedded': bool(args.embedded),
+        },
+        [hasher] + ([tree_hasher.reader] if tree_hasher is not None else []),
+    )
+    finish_run(targets, config)
+
+
+def run_with_progress(
+    scheduler: HashScheduler,
+    jobs: List[HashJob],
+    on_result,
+    interval: float,
+    metrics_path: str,
+    settings: Dict[str, Any],
+    readers: Optional[List[FileHasher]] = None,
+) -> None:
+    """
+    스케줄러를 실행하면서 주기적으로 진행 상태를 출력하고, 끝나면 요약과 JSON 지표를 남깁니다.
+    readers 의 on_bytes 를 진행 상태에 연결해 큰 파일을 읽는 중에도 처리량/ETA 가 갱신되게 합니다.
+    """
+    progress = HashProgress(len(jobs), sum(job.size for job in jobs), interval=interval)
+    readers = readers or []
+    for reader in readers:
+        reader.on_bytes = progress.add_bytes
+    progress.start()
+    try:
+        scheduler.run(jobs, on_result, progress=progress)
+    finally:
+        progress.stop()
+        for reader in readers:
+            reader.on_bytes = None
+    if not jobs:
+        return
+    progress.print_summary()
+    if progress.save_json(metrics_path, settings):
+        print(f"  지표 저장: {metrics_path}")
+
+
+def finish_run(targets: List[Dict[str, Any]], config: ConfigLoader) -> None:
+    """모든 대상을 저장하고 완료/취소 메시지를 출력합니다."""
+    print()
+    with HashCatalog(HashCatalog.get_db_path(config.get_data_dir())) as catalog:
+        for target in targets:
+            finalize_target(target, catalog)
+
     print(f"\n{'='*60}")
     if shutdown_event.is_set():
         print("작업이 사용자에 의해 취소되었습니다.")
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+loras/<type>/char, loras/<type>/etc 의 safetensors 가 올바른 타입 폴더에 있는지 검사하는 스크립트.
+
+- 헤더(텐서 키 이름/shape, __metadata__)만 읽어서 SD1.5 / SDXL(Illustrious, Pony 등) / Flux 등을 판별
+- config.yml 의 typeArchitectures 와 맞지 않는 파일을 보고하고 이동할 타입을 제안
+- --move 를 지정하면 제안 타입이 하나뿐인 파일을 해당 타입 폴더로 이동
+
+예:
+  python scripts/check_arch_lora.py
+  python scripts/check_arch_lora.py --move --dry-run
+"""
+import argparse
+import os
+import shutil
+import sys
+from typing import Any, Dict, List
+
+
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from utils import ArchitectureDetector, ConfigLoader, SafeTensorsReader, YAMLHandler
+
+
+LORA_CATEGORIES = ("char", "etc")
+REPORT_FILENAME = "arch_report.yml"
+
+
+def configure_console_encoding() -> None:
+    for stream_name in ("stdout", "stderr"):
+        stream = getattr(sys, stream_name, None)
+        if stream and hasattr(stream, "reconfigure"):
+            try:
+                stream.reconfigure(encoding="utf-8", errors="replace")
+            except Exception:
+                pass
+
+
+def suggest_types(result: Dict[str, Any], type_architectures: Dict[str, List[str]], current_type: str) -> List[str]:
+    return [
+        type_name
+        for type_name, accepted in type_architectures.items()
+        if type_name != current_type and ArchitectureDetector.matches(result, accepted)
+    ]
+
+
+def check_type(
+    type_name: str,
+    comfui_dir: str,
+    type_architectures: Dict[str, List[str]],
+    verbose: bool = False,
+) -> Dict[str, List[Dict[str, Any]]]:
+    report: Dict[str, List[Dict[str, Any]]] = {"mismatched": [], "unknown": []}
+    accepted = type_architectures.get(type_name)
+
+    for category in LORA_CATEGORIES:
+        folder_path = os.path.join(comfui_dir, "models", "loras", type_name, category)
+        for key, file_path, _ in SafeTensorsReader.scan_folder(folder_path):
+            result = ArchitectureDetector.detect_file(file_path)
+            label = ArchitectureDetector.format_label(result)
+            if verbose:
+                print(f"    {category}/{key}\t{label}\t({result['source']})")
+
+            if result["family"] == "unknown":
+                report["unknown"].append({"type": type_name, "category": category, "name": key, "path": file_path})
+                continue
+            if not accepted or ArchitectureDetector.matches(result, accepted):
+                continue
+
+            suggested = suggest_types(result, type_architectures, type_name)
+            report["mismatched"].append(
+                {
+                    "type": type_name,
+                    "category": category,
+                    "name": key,
+                    "path": file_path,
+                    "detected": label,
+                    "source": result["source"],
+                    "suggested": suggested,
+                }
+            )
+            hint = f" -> {', '.join(suggested)}" if suggested else ""
+            print(f"  [MISMATCH] {type_name}/{category}/{key}: {label}{hint}")
+
+    return report
+
+
+def move_mismatched(items: List[Dict[str, Any]], comfui_dir: str, dry_run: bool = False) -> int:
+    moved = 0
+    for item in items:
+        if len(item["suggested"]) != 1:
+            continue
+        target_dir = os.path.join(comfui_dir, "models", "loras", item["suggested"][0], item["category"])
+        target_path = os.path.join(target_dir, os.path.basename(item["path"]))
+        if os.path.exists(target_path):
+            print(f"  [SKIP] 대상에 같은 파일이 이미 있습니다: {target_path}")
+            continue
+        print(f"  [MOVE] {item['path']} -> {target_path}")
+        if not dry_run:
+            os.makedirs(target_dir, exist_ok=True)
+            shutil.move(item["path"], target_path)
+        moved += 1
+    return moved
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="헤더 기반 LoRA 아키텍처 판별 및 타입 폴더 불일치 보고"
+    )
+    parser.add_argument("--type", dest="type_names", action="append")
+    parser.add_argument("--verbose", action="store_true", help="모든 파일의 판별 결과 출력")
+    parser.add_argument("--move", action="store_true", help="제안 타입이 하나뿐인 파일을 이동")
+    parser.add_argument("--dry-run", action="store_true", help="--move 시 이동 예정만 출력")
+    return parser.parse_args()
+
+
+def main() -> int:
+    configure_console_encoding()
+    args = parse_args()
+    config = ConfigLoader()
+    comfui_dir = config.get_comfui_dir()
+    type_names = args.type_names or config.get_types()
+    type_architectures = config.get_type_architectures()
+
+    print("=" * 80)
+    print("LoRA 아키텍처 판별 / 타입 폴더 검사")
+    print("=" * 80)
+    print(f"처리 타입: {', '.join(type_names)}")
+    for type_name in type_names:
+        accepted = type_architectures.get(type_name)
+        print(f"  {type_name}: {', '.join(accepted) if accepted else '(typeArchitectures 미설정, 판별만 수행)'}")
+
+    report: Dict[str, List[Dict[str, Any]]] = {"mismatched": [], "unknown": []}
+    for type_name in type_names:
+        print(f"\n[{type_name}]")
+        type_report = check_type(type_name, comfui_dir, type_architectures, verbose=args.verbose)
+        report["mismatched"].extend(type_report["mismatched"])
+        report["unknown"].extend(type_report["unknown"])
+
+    report_path = os.path.join(config.get_data_dir(), REPORT_FILENAME)
+    if YAMLHandler().save(report_path, report):
+        print(f"\n보고서 저장: {report_path}")
+
+    if args.move and report["mismatched"]:
+        print()
+        moved = move_mismatched(report["mismatched"], comfui_dir, dry_run=args.dry_run)
+        print(f"이동 {'예정' if args.dry_run else '완료'}: {moved}개")
+
+    print(f"\n{'=' * 80}")
+    print(f"타입 불일치: {len(report['mismatched'])}개")
+    print(f"판별 불가: {len(report['unknown'])}개")
+    print(f"{'=' * 80}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
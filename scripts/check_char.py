@@ -10,10 +10,11 @@ script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from utils import ConfigLoader, TagProcessor, SafeTensorsReader
+from utils import ConfigLoader, TagProcessor, SafeTensorsReader, YAMLHandler
 
 # 설정 로드
 config = ConfigLoader()
+YAMLHandler.enable_cache_from_config(config)
 comfui_dir = config.get_comfui_dir()
 data_dir = config.get_data_dir()
 types = config.get_types()
@@ -50,11 +51,9 @@ def process_type(type_name: str):
     
     # YML 파일에서 키 읽기
     print(f"  YML 파일 읽는 중: {yml_path}")
-    import yaml
     try:
-        with open(yml_path, 'r', encoding='utf-8') as f:
-            yml_data = yaml.safe_load(f)
-            yml_keys = set(yml_data.keys()) if yml_data else set()
+        yml_data = YAMLHandler.load_readonly(yml_path)
+        yml_keys = set(yml_data.keys()) if yml_data else set()
     except Exception as e:
         print(f"  [오류] YML 파일 읽기 실패: {e}")
         print(f"  작업을 중단합니다.")
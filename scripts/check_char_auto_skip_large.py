@@ -4,14 +4,12 @@ import os
 import sys
 from typing import Any
 
-import yaml
-
 
 script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from utils import ConfigLoader
+from utils import ConfigLoader, YAMLHandler
 
 
 MIN_SIZE_BYTES = 200 * 1024 * 1024
@@ -33,8 +31,7 @@ def is_auto_skip(value: Any) -> bool:
 
 
 def load_yml(yml_path: str) -> dict:
-    with open(yml_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return YAMLHandler.load_readonly(yml_path) or {}
 
 
 def process_type(type_name: str, comfui_dir: str, data_dir: str) -> list:
@@ -73,6 +70,7 @@ def main() -> int:
     configure_console_encoding()
 
     config = ConfigLoader()
+    YAMLHandler.enable_cache_from_config(config)
     comfui_dir = config.get_comfui_dir()
     data_dir = config.get_data_dir()
 
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+models 폴더 아래 safetensors 파일의 잘림/헤더 손상 여부를 빠르게 검사하는 스크립트.
+
+SHA256 전체 해시 대신 헤더만 읽어서
+  - 헤더 길이/JSON 형식
+  - 텐서별 data_offsets 와 shape/dtype 크기
+  - 가장 큰 data_offsets 끝 + 헤더 크기 == 파일 크기
+를 확인합니다. 파일당 작은 read 한 번이면 되므로 전체 모델 트리를 주기적으로 검사할 수 있습니다.
+"""
+import argparse
+import os
+import sys
+from typing import List, Tuple
+
+
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from utils import ConfigLoader, SafeTensorsReader
+
+
+def configure_console_encoding() -> None:
+    for stream_name in ("stdout", "stderr"):
+        stream = getattr(sys, stream_name, None)
+        if stream and hasattr(stream, "reconfigure"):
+            try:
+                stream.reconfigure(encoding="utf-8", errors="replace")
+            except Exception:
+                pass
+
+
+def iter_safetensors_files(root: str):
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if filename.endswith(".safetensors"):
+                yield os.path.join(dirpath, filename)
+
+
+def check_tree(root: str, verbose: bool = False) -> Tuple[int, List[Tuple[str, str]]]:
+    checked = 0
+    bad_files: List[Tuple[str, str]] = []
+
+    for file_path in iter_safetensors_files(root):
+        checked += 1
+        ok, reason = SafeTensorsReader.check_integrity(file_path)
+        if ok:
+            if verbose:
+                print(f"  [OK] {file_path}")
+            continue
+        bad_files.append((file_path, reason))
+        print(f"  [BAD] {file_path}\t{reason}")
+
+    return checked, bad_files
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="safetensors 헤더 기반 잘림/무결성 검사 (해시 계산 없음)"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="검사할 폴더. 미지정 시 <comfui_dir>/models 전체",
+    )
+    parser.add_argument("--verbose", action="store_true", help="정상 파일도 출력")
+    return parser.parse_args()
+
+
+def main() -> int:
+    configure_console_encoding()
+    args = parse_args()
+    config = ConfigLoader()
+    roots = args.paths or [os.path.join(config.get_comfui_dir(), "models")]
+
+    print("=" * 80)
+    print("safetensors 무결성 검사 (헤더 기반)")
+    print("=" * 80)
+
+    total_checked = 0
+    all_bad: List[Tuple[str, str]] = []
+    for root in roots:
+        if not os.path.isdir(root):
+            print(f"경고: 폴더가 없습니다: {root}")
+            continue
+        print(f"\n[{root}]")
+        checked, bad_files = check_tree(root, verbose=args.verbose)
+        total_checked += checked
+        all_bad.extend(bad_files)
+
+    print(f"\n{'=' * 80}")
+    print(f"검사 파일: {total_checked}개")
+    print(f"문제 파일: {len(all_bad)}개")
+    print(f"{'=' * 80}")
+    return 1 if all_bad else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
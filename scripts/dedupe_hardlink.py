@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+해시 카탈로그의 중복 파일(sha256 동일)을 하드링크로 바꿔 디스크 공간을 되찾는 스크립트.
+
+- 중복 묶음은 data_dir/hash_catalog.db 에서 읽음 (char / etc / 타입 폴더 구분 없이)
+- 카탈로그 이후 바뀐 파일(size/mtime 불일치)은 건너뜀
+- 바꾸기 전에 바이트 단위로 다시 비교하고, 파일마다 임시 링크 + os.replace 로 원자적으로 교체
+- 교체 기록은 data_dir/dedupe_journal.jsonl 에 남고 --rollback 으로 되돌릴 수 있음
+
+예:
+  python scripts/dedupe_hardlink.py --dry-run
+  python scripts/dedupe_hardlink.py
+  python scripts/dedupe_hardlink.py --rollback
+"""
+import argparse
+import os
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List
+
+
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from utils import ConfigLoader, HardlinkDeduper, HashCatalog
+
+
+JOURNAL_FILENAME = "dedupe_journal.jsonl"
+
+
+def configure_console_encoding() -> None:
+    for stream_name in ("stdout", "stderr"):
+        stream = getattr(sys, stream_name, None)
+        if stream and hasattr(stream, "reconfigure"):
+            try:
+                stream.reconfigure(encoding="utf-8", errors="replace")
+            except Exception:
+                pass
+
+
+def format_size(size: int) -> str:
+    return f"{size / (1024 * 1024 * 1024):.2f}GiB" if size >= 1024 ** 3 else f"{size / (1024 * 1024):.1f}MiB"
+
+
+def current_members(rows: List[Any]) -> List[Dict[str, Any]]:
+    """카탈로그 레코드 중 지금도 같은 size/mtime 인 파일만 (path, stat) 으로 반환합니다."""
+    members = []
+    for row in rows:
+        try:
+            stat = os.stat(row["path"])
+        except OSError:
+            continue
+        if stat.st_size == row["size"] and stat.st_mtime_ns == row["mtime_ns"]:
+            members.append({"path": row["path"], "stat": stat})
+        else:
+            print(f"  [SKIP] 카탈로그 이후 변경됨: {row['path']}")
+    return members
+
+
+def dedupe_group(deduper: HardlinkDeduper, sha256_value: str, rows: List[Any]) -> int:
+    """중복 묶음 하나를 처리하고 되찾은(예정) 바이트 수를 반환합니다."""
+    by_device: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for member in current_members(rows):
+        by_device[member["stat"].st_dev].append(member)
+
+    reclaimed = 0
+    for members in by_device.values():
+        if len(members) < 2:
+            continue
+        # 링크가 가장 많은 파일(이미 공유 중인 inode)을 남기고, 같으면 경로 순
+        members.sort(key=lambda member: (-member["stat"].st_nlink, member["path"]))
+        keep = members[0]
+        for member in members[1:]:
+            if keep["stat"].st_ino and member["stat"].st_ino == keep["stat"].st_ino:
+                continue
+            ok, reason = deduper.link(keep["path"], member["path"])
+            tag = "LINK" if ok else "SKIP"
+            print(f"  [{tag}] {member['path']} -> {keep['path']} ({reason})")
+            if ok:
+                reclaimed += member["stat"].st_size
+    return reclaimed
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="중복 모델 파일을 하드링크로 교체")
+    parser.add_argument("--type", dest="type_names", action="append", help="해당 타입의 파일만 대상")
+    parser.add_argument("--min-size-mb", type=float, default=1, help="이 크기(MiB) 미만 파일은 제외 (기본 1)")
+    parser.add_argument("--dry-run", action="store_true", help="바이트 비교까지만 하고 파일은 바꾸지 않음")
+    parser.add_argument("--rollback", action="store_true", help="저널에 기록된 하드링크를 독립 파일로 되돌림")
+    return parser.parse_args()
+
+
+def main() -> int:
+    configure_console_encoding()
+    args = parse_args()
+    config = ConfigLoader()
+    data_dir = config.get_data_dir()
+    journal_path = os.path.join(data_dir, JOURNAL_FILENAME)
+    block_size = config.get_hash_config()["block_size_mb"] * 1024 * 1024
+
+    print("=" * 80)
+    print("중복 파일 하드링크 " + ("되돌리기" if args.rollback else "교체") + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 80)
+
+    with HardlinkDeduper(journal_path, block_size=block_size, dry_run=args.dry_run) as deduper:
+        if args.rollback:
+            restored, independent, remaining = deduper.rollback()
+            print(
+                f"\n되돌림 {'예정' if args.dry_run else '완료'}: {restored}개, "
+                f"이미 독립 파일: {independent}개, 실패: {remaining}개"
+            )
+            if remaining:
+                if not args.dry_run:
+                    print(f"되돌리지 못한 항목은 저널에 남겨 두었습니다. 원인을 해결한 뒤 다시 --rollback 하세요: {journal_path}")
+                return 1
+            return 0
+
+        db_path = HashCatalog.get_db_path(data_dir)
+        if not os.path.exists(db_path):
+            print(f"오류: 카탈로그가 없습니다. 먼저 calculate_sha256_lora.py 를 실행해 주세요: {db_path}", file=sys.stderr)
+            return 1
+        with HashCatalog(db_path) as catalog:
+            groups = catalog.duplicate_groups(args.type_names, int(args.min_size_mb * 1024 * 1024))
+
+        print(f"중복 묶음: {len(groups)}개")
+        reclaimed = 0
+        for sha256_value, rows in groups.items():
+            print(f"\n{sha256_value} ({len(rows)}개, {format_size(rows[0]['size'])})")
+            reclaimed += dedupe_group(deduper, sha256_value, rows)
+
+    print(f"\n{'=' * 80}")
+    print(f"되찾은 공간{' (예정)' if args.dry_run else ''}: {format_size(reclaimed)}")
+    if not args.dry_run and reclaimed:
+        print(f"되돌리기 저널: {journal_path}")
+        print("calculate_sha256_lora.py 를 다시 실행하면 해시 저장소/카탈로그가 갱신됩니다 (하드링크는 다시 읽지 않음).")
+    print(f"{'=' * 80}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
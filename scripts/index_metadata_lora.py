@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+LoRA safetensors 학습 메타데이터(ss_*, modelspec.*)를 SQLite 인덱스로 관리하는 스크립트.
+
+- update: loras/<type>/char, loras/<type>/etc 를 훑어 변경된 파일의 헤더만 다시 읽어 인덱스 갱신
+- query : 인덱스만 조회 (safetensors 파일은 열지 않음)
+
+예:
+  python scripts/index_metadata_lora.py update
+  python scripts/index_metadata_lora.py query --category char --base-model illustrious --min-dim 64
+"""
+import argparse
+import os
+import sys
+from typing import Any, Dict, List
+
+
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from utils import ConfigLoader, MetadataIndex, SafeTensorsReader
+
+
+LORA_CATEGORIES = ("char", "etc")
+DB_FILENAME = "lora_metadata.db"
+QUERY_COLUMNS = [
+    "type_name",
+    "category",
+    "name",
+    "base_model",
+    "network_dim",
+    "network_alpha",
+    "resolution",
+    "epochs",
+    "output_name",
+]
+
+
+def configure_console_encoding() -> None:
+    for stream_name in ("stdout", "stderr"):
+        stream = getattr(sys, stream_name, None)
+        if stream and hasattr(stream, "reconfigure"):
+            try:
+                stream.reconfigure(encoding="utf-8", errors="replace")
+            except Exception:
+                pass
+
+
+def get_db_path(config: ConfigLoader) -> str:
+    return os.path.join(config.get_data_dir(), DB_FILENAME)
+
+
+def build_record(type_name: str, category: str, key: str, file_path: str, stat: os.stat_result) -> Dict[str, Any]:
+    record: Dict[str, Any] = {
+        "path": file_path,
+        "type_name": type_name,
+        "category": category,
+        "name": key,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    record.update(SafeTensorsReader.extract_training_metadata(SafeTensorsReader.read_metadata(file_path)))
+    return record
+
+
+def update_index(index: MetadataIndex, config: ConfigLoader, type_names: List[str], force: bool = False) -> int:
+    comfui_dir = config.get_comfui_dir()
+    total_updated = 0
+
+    for type_name in type_names:
+        for category in LORA_CATEGORIES:
+            folder_path = os.path.join(comfui_dir, "models", "loras", type_name, category)
+            entries = SafeTensorsReader.scan_folder(folder_path)
+            known = {} if force else index.get_stat_map(type_name, category)
+
+            records = [
+                build_record(type_name, category, key, file_path, stat)
+                for key, file_path, stat in entries
+                if known.get(file_path) != (stat.st_size, stat.st_mtime_ns)
+            ]
+            updated = index.upsert(records)
+            removed = index.remove_missing(type_name, category, [file_path for _, file_path, _ in entries])
+            total_updated += updated
+
+            print(f"  [{type_name}/{category}] 파일 {len(entries)}개, 갱신 {updated}개, 삭제 {removed}개")
+
+    return total_updated
+
+
+def print_rows(rows: List[Any]) -> None:
+    for row in rows:
+        print("\t".join("" if row[column] is None else str(row[column]) for column in QUERY_COLUMNS))
+    print(f"total\t{len(rows)}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="LoRA 학습 메타데이터 인덱스 갱신/조회")
+    subparsers = parser.add_subparsers(dest="command")
+
+    update_parser = subparsers.add_parser("update", help="인덱스 갱신 (기본값)")
+    update_parser.add_argument("--type", dest="type_names", action="append")
+    update_parser.add_argument("--force", action="store_true", help="변경 여부와 관계없이 모든 헤더를 다시 읽음")
+
+    query_parser = subparsers.add_parser("query", help="인덱스 조회")
+    query_parser.add_argument("--type", dest="type_names", action="append")
+    query_parser.add_argument("--category", choices=LORA_CATEGORIES)
+    query_parser.add_argument("--name", help="파일명 부분 일치")
+    query_parser.add_argument("--base-model", help="base model 부분 일치")
+    query_parser.add_argument("--min-dim", type=int)
+    query_parser.add_argument("--max-dim", type=int)
+    query_parser.add_argument("--min-alpha", type=float)
+    query_parser.add_argument("--max-alpha", type=float)
+    query_parser.add_argument("--resolution", help="예: 1024x1024")
+    query_parser.add_argument("--min-epochs", type=int)
+    query_parser.add_argument("--output-name", help="output name 부분 일치")
+    query_parser.add_argument("--limit", type=int)
+    return parser.parse_args()
+
+
+def main() -> int:
+    configure_console_encoding()
+    args = parse_args()
+    config = ConfigLoader()
+    db_path = get_db_path(config)
+
+    if args.command == "query":
+        if not os.path.exists(db_path):
+            print(f"오류: 인덱스가 없습니다. 먼저 update 를 실행해 주세요: {db_path}", file=sys.stderr)
+            return 1
+        with MetadataIndex(db_path) as index:
+            rows = index.query(
+                type_names=args.type_names,
+                category=args.category,
+                base_model=args.base_model,
+                name=args.name,
+                min_dim=args.min_dim,
+                max_dim=args.max_dim,
+                min_alpha=args.min_alpha,
+                max_alpha=args.max_alpha,
+                resolution=args.resolution,
+                min_epochs=args.min_epochs,
+                output_name=args.output_name,
+                limit=args.limit,
+            )
+        print_rows(rows)
+        return 0
+
+    type_names = getattr(args, "type_names", None) or config.get_types()
+    force = getattr(args, "force", False)
+
+    print("=" * 80)
+    print("LoRA 학습 메타데이터 인덱스 갱신")
+    print("=" * 80)
+    print(f"처리 타입: {', '.join(type_names)}")
+    print(f"인덱스 경로: {db_path}")
+
+    with MetadataIndex(db_path) as index:
+        total_updated = update_index(index, config, type_names, force=force)
+
+    print(f"\n총 갱신: {total_updated}개")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+해시 카탈로그(data_dir/hash_catalog.db) 조회 스크립트.
+
+카탈로그는 calculate_sha256_lora.py 실행 시 sha256_*.yml 과 함께 갱신됩니다.
+
+- hash : 해시(sha256 / AutoV2 / AutoV1 / tensor_sha256 / tree_sha256)로 파일 찾기
+- name : 파일명으로 찾기 (--partial 이면 부분 일치)
+- where: 파일명과 같은 내용(해시)을 가진 파일이 어느 타입/폴더에 있는지
+
+예:
+  python scripts/query_hash_catalog.py hash 8db4256c6a
+  python scripts/query_hash_catalog.py name my_lora
+  python scripts/query_hash_catalog.py where my_lora
+"""
+import argparse
+import os
+import sys
+from typing import Any, List
+
+
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from utils import ConfigLoader, HashCatalog
+
+
+QUERY_COLUMNS = ["type_name", "category", "name", "sha256", "autov2", "size", "path"]
+
+
+def configure_console_encoding() -> None:
+    for stream_name in ("stdout", "stderr"):
+        stream = getattr(sys, stream_name, None)
+        if stream and hasattr(stream, "reconfigure"):
+            try:
+                stream.reconfigure(encoding="utf-8", errors="replace")
+            except Exception:
+                pass
+
+
+def print_rows(rows: List[Any]) -> None:
+    for row in rows:
+        values = dict(row)
+        if not values.get("sha256") and values.get("tree_sha256"):
+            values["sha256"] = f"tree{values.get('tree_block_mb')}:{values['tree_sha256']}"
+        print("\t".join("" if values.get(column) is None else str(values[column]) for column in QUERY_COLUMNS))
+    print(f"total\t{len(rows)}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="해시 카탈로그 조회 (이름 / 해시 역방향)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    hash_parser = subparsers.add_parser("hash", help="해시로 파일 찾기")
+    hash_parser.add_argument("value", help="sha256 / AutoV2(10자리) / AutoV1(8자리) / tensor_sha256 / tree_sha256")
+
+    name_parser = subparsers.add_parser("name", help="파일명으로 찾기")
+    name_parser.add_argument("name", help="확장자를 뺀 파일명")
+    name_parser.add_argument("--partial", action="store_true", help="부분 일치 (인덱스를 쓰지 않아 느림)")
+
+    where_parser = subparsers.add_parser("where", help="같은 내용의 파일이 있는 타입/폴더 찾기")
+    where_parser.add_argument("name", help="확장자를 뺀 파일명")
+    return parser.parse_args()
+
+
+def main() -> int:
+    configure_console_encoding()
+    args = parse_args()
+    config = ConfigLoader()
+    db_path = HashCatalog.get_db_path(config.get_data_dir())
+    if not os.path.exists(db_path):
+        print(f"오류: 카탈로그가 없습니다. 먼저 calculate_sha256_lora.py 를 실행해 주세요: {db_path}", file=sys.stderr)
+        return 1
+
+    with HashCatalog(db_path) as catalog:
+        if args.command == "hash":
+            rows = catalog.find_by_hash(args.value)
+        elif args.command == "name":
+            rows = catalog.find_by_name(args.name, partial=args.partial)
+        else:
+            rows = catalog.find_same_content(args.name)
+
+    print_rows(rows)
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
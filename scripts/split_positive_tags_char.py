@@ -318,19 +318,14 @@ def process_entry(
     }
 
 
-def process_char_yml(
-    yml_path: str,
+def process_char_data(
+    yml_data: Dict[str, Any],
     excluded_tags: List[str],
     dress_tags: List[str],
     char_feature_tags: List[str],
     mark_auto_skip: bool = False,
-    dry_run: bool = False,
 ) -> Tuple[int, int, List[str]]:
-    yaml_handler = YAMLHandler(allow_duplicate_keys=True)
-    yml_data = yaml_handler.load(yml_path)
-    if yml_data is None:
-        return 0, 0, []
-
+    """이미 로드한 char.yml 트리를 제자리에서 고칩니다 (저장은 호출한 쪽에서)."""
     changed_entries = 0
     changed_keys: List[str] = []
     removed_summary: List[str] = []
@@ -361,13 +356,33 @@ def process_char_yml(
         if result["removed_tags"]:
             print(f"      제외 제거: {', '.join(result['removed_tags'])}")
 
+    return changed_entries, len(dedupe_preserve_order(removed_summary)), changed_keys
+
+
+def process_char_yml(
+    yml_path: str,
+    excluded_tags: List[str],
+    dress_tags: List[str],
+    char_feature_tags: List[str],
+    mark_auto_skip: bool = False,
+    dry_run: bool = False,
+) -> Tuple[int, int, List[str]]:
+    yaml_handler = YAMLHandler(allow_duplicate_keys=True)
+    yml_data = yaml_handler.load(yml_path)
+    if yml_data is None:
+        return 0, 0, []
+
+    changed_entries, removed_count, changed_keys = process_char_data(
+        yml_data, excluded_tags, dress_tags, char_feature_tags, mark_auto_skip
+    )
+
     if changed_entries > 0 and not dry_run:
         if yaml_handler.save(yml_path, yml_data):
             print(f"  [OK] 저장 완료: {yml_path}")
         else:
             print(f"  [ERROR] 저장 실패: {yml_path}")
 
-    return changed_entries, len(dedupe_preserve_order(removed_summary)), changed_keys
+    return changed_entries, removed_count, changed_keys
 
 
 def process_type(
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+해시 저장소(sha256_*.yml)의 텐서 데이터 해시를 각 safetensors 파일의 __metadata__ 에 기록하는 스크립트.
+
+- 기록하는 키: modelspec.hash_sha256 = "0x" + tensor_sha256 (sd-scripts / modelspec 과 같은 의미)
+  다음 실행부터는 calculate_sha256_lora.py --embedded 나 다른 도구가 헤더만 읽고 해시를 얻을 수 있음
+- 헤더가 기존 길이 안에 들어가면 제자리 수정, 아니면 파일 전체를 스트리밍 복사 (느린 경로, 목록으로 보고)
+- 하드링크 파일(st_nlink > 1): 느린 경로는 링크를 끊으므로 건너뛰고 목록으로 보고 (--break-links 로 강제),
+  제자리 수정은 같은 inode 를 공유하는 모든 대상 경로의 레코드를 같이 갱신
+- 헤더가 바뀌면 파일 전체 sha256 도 바뀌므로, 기록한 파일의 레코드는 tensor 해시만 남긴 임시 레코드가 됨
+  (calculate_sha256_lora.py 를 다시 실행하면 전체 해시로 교체)
+
+예:
+  python scripts/stamp_metadata_lora.py --dry-run
+  python scripts/stamp_metadata_lora.py --type IL
+"""
+import argparse
+import os
+import sys
+from typing import Any, Dict, List, Set, Tuple
+
+
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from utils import ConfigLoader, HashStore, HashTargets, SafeTensorsReader, SafeTensorsWriter, YAMLHandler
+from utils.safetensors_writer import DEFAULT_HEADER_RESERVE, MODE_COPY, MODE_INPLACE, MODE_LINKED, MODE_UNCHANGED
+
+
+STAMP_KEY = "modelspec.hash_sha256"
+# 헤더가 바뀌어도 그대로 유효한 다이제스트 (텐서 데이터 / 텐서 목록 기준)
+HEADER_INDEPENDENT_DIGESTS = ("tensor_sha256", "tensor_index_sha256")
+
+
+def configure_console_encoding() -> None:
+    for stream_name in ("stdout", "stderr"):
+        stream = getattr(sys, stream_name, None)
+        if stream and hasattr(stream, "reconfigure"):
+            try:
+                stream.reconfigure(encoding="utf-8", errors="replace")
+            except Exception:
+                pass
+
+
+def stamped_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """헤더를 바꾼 뒤에도 유효한 값만 남긴 임시 레코드 (unverified)."""
+    digests = {key: record[key] for key in HEADER_INDEPENDENT_DIGESTS if record.get(key)}
+    digests["unverified"] = True
+    digests["embedded_from"] = STAMP_KEY
+    return digests
+
+
+def load_targets(types: List[str], config: ConfigLoader) -> List[Dict[str, Any]]:
+    """모든 타입의 대상 폴더와 해시 저장소를 미리 읽습니다 (하드링크로 연결된 다른 대상의 레코드도 갱신하기 위해)."""
+    targets: List[Dict[str, Any]] = []
+    for type_name in types:
+        for target in HashTargets.build(type_name, config):
+            if not os.path.isdir(target["folder_dir"]):
+                continue
+            store = HashStore(target["output_path"], YAMLHandler())
+            if not store.load():
+                continue
+            target["store"] = store
+            target["entries"] = SafeTensorsReader.scan_folder(target["folder_dir"])
+            targets.append(target)
+    return targets
+
+
+def index_links(targets: List[Dict[str, Any]]) -> Dict[Any, List[Tuple[Dict[str, Any], str]]]:
+    """링크가 여러 개인 파일의 inode 키 -> 그 inode 를 가리키는 (대상, 파일명) 목록."""
+    links: Dict[Any, List[Tuple[Dict[str, Any], str]]] = {}
+    for target in targets:
+        for name, _, stat in target["entries"]:
+            key = HashStore.inode_key(stat) if stat.st_nlink > 1 else None
+            if key is not None:
+                links.setdefault(key, []).append((target, name))
+    return links
+
+
+def stamp_target(
+    target: Dict[str, Any],
+    args: argparse.Namespace,
+    counts: Dict[str, int],
+    slow_paths: List[str],
+    linked_paths: List[str],
+    links: Dict[Any, List[Tuple[Dict[str, Any], str]]],
+    done_inodes: Set[Any],
+) -> None:
+    store: HashStore = target["store"]
+    print(f"\n[{target['label']}] {target['type_name']}: {target['folder_dir']}")
+
+    for name, file_path, stat in target["entries"]:
+        key = HashStore.inode_key(stat) if stat.st_nlink > 1 else None
+        if key is not None and key in done_inodes:
+            # 같은 inode 의 다른 경로에서 이미 처리 (레코드도 그때 같이 갱신)
+            continue
+        record = store.get(name)
+        if not record or not record.get("tensor_sha256"):
+            counts["no_hash"] += 1
+            continue
+        if not store.is_current(name, stat) or store.is_provisional(name):
+            counts["stale"] += 1
+            continue
+
+        ok, mode = SafeTensorsWriter.update_metadata(
+            file_path,
+            {STAMP_KEY: "0x" + record["tensor_sha256"]},
+            reserve=args.reserve_kb * 1024,
+            block_size=args.block_size,
+            dry_run=args.dry_run,
+            break_links=args.break_links,
+        )
+        if not ok:
+            print(f"  [FAIL] {name}: {mode}")
+            counts["failed"] += 1
+            continue
+        counts[mode] += 1
+        if key is not None and mode in (MODE_INPLACE, MODE_LINKED):
+            done_inodes.add(key)
+        if mode == MODE_LINKED:
+            linked_paths.append(file_path)
+            print(f"  [SKIP] {name}: 하드링크 {stat.st_nlink}개 (다시 쓰면 링크가 끊어짐)")
+            continue
+        if mode == MODE_COPY:
+            slow_paths.append(file_path)
+            print(f"  [COPY] {name} ({stat.st_size / (1024 * 1024):.1f}MiB 다시 쓰기)")
+        elif mode == MODE_INPLACE:
+            print(f"  [PATCH] {name}")
+        if args.dry_run:
+            continue
+
+        new_stat = os.stat(file_path)
+        if mode != MODE_UNCHANGED or not store.is_current(name, new_stat):
+            store.put(name, stamped_record(record), new_stat)
+        if key is None or mode != MODE_INPLACE:
+            continue
+        # 제자리 수정은 같은 inode 의 다른 경로도 바꾸므로 그 레코드도 같이 갱신
+        for alias_target, alias_name in links.get(key, []):
+            alias_store: HashStore = alias_target["store"]
+            if (alias_target is target and alias_name == name) or alias_store.get(alias_name) is None:
+                continue
+            alias_store.put(alias_name, stamped_record(record), new_stat)
+            counts["shared"] += 1
+            print(f"      └ [{alias_target['label']}] {alias_target['type_name']} {alias_name} (하드링크 공유)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="safetensors __metadata__ 에 텐서 해시 기록")
+    parser.add_argument("--type", dest="type_names", action="append", help="해당 타입만 대상")
+    parser.add_argument("--dry-run", action="store_true", help="제자리 수정 / 다시 쓰기 여부만 확인")
+    parser.add_argument(
+        "--reserve-kb",
+        type=int,
+        default=DEFAULT_HEADER_RESERVE // 1024,
+        help=f"다시 쓸 때 헤더 뒤에 남길 여유 공간 KiB (기본 {DEFAULT_HEADER_RESERVE // 1024})",
+    )
+    parser.add_argument(
+        "--break-links",
+        action="store_true",
+        help="다시 쓰기가 필요한 하드링크 파일도 다시 쓰기 (그 경로만 독립 파일이 됨)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    configure_console_encoding()
+    args = parse_args()
+    config = ConfigLoader()
+    args.block_size = config.get_hash_config()["block_size_mb"] * 1024 * 1024
+    types = args.type_names or config.get_types()
+
+    print("=" * 80)
+    print(f"safetensors 메타데이터에 {STAMP_KEY} 기록" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 80)
+
+    counts: Dict[str, int] = {
+        MODE_INPLACE: 0, MODE_COPY: 0, MODE_UNCHANGED: 0, MODE_LINKED: 0,
+        "failed": 0, "stale": 0, "no_hash": 0, "shared": 0,
+    }
+    slow_paths: List[str] = []
+    linked_paths: List[str] = []
+    targets = load_targets(types, config)
+    links = index_links(targets)
+    done_inodes: Set[Any] = set()
+    for target in targets:
+        stamp_target(target, args, counts, slow_paths, linked_paths, links, done_inodes)
+    if not args.dry_run:
+        for target in targets:
+            target["store"].compact()
+
+    print(f"\n{'=' * 80}")
+    print(
+        f"제자리 수정: {counts[MODE_INPLACE]}개, 다시 쓰기: {counts[MODE_COPY]}개, "
+        f"이미 기록됨: {counts[MODE_UNCHANGED]}개, 실패: {counts['failed']}개"
+    )
+    if counts["shared"]:
+        print(f"하드링크로 같이 갱신한 레코드: {counts['shared']}개")
+    print(
+        f"건너뜀: 해시 없음 {counts['no_hash']}개, 변경/임시 레코드 {counts['stale']}개, "
+        f"하드링크 {counts[MODE_LINKED]}개"
+    )
+    if slow_paths:
+        print("\n다시 쓰기(느린 경로)가 필요한 파일:")
+        for path in slow_paths:
+            print(f"  {path}")
+    if linked_paths:
+        print("\n다시 쓰기가 필요하지만 하드링크라 건너뛴 파일 (링크를 끊어도 되면 --break-links):")
+        for path in linked_paths:
+            print(f"  {path}")
+    if not args.dry_run and (counts[MODE_INPLACE] or counts[MODE_COPY]):
+        print("\n헤더가 바뀐 파일은 sha256 을 다시 계산해야 합니다: calculate_sha256_lora.py 실행")
+    print(f"{'=' * 80}")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
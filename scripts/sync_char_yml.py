@@ -3,7 +3,7 @@
 import argparse
 import os
 import sys
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Tuple
 
 from ruamel.yaml.comments import CommentedMap
 
@@ -12,8 +12,8 @@ script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from scripts.split_positive_tags_char import process_char_yml
-from utils import ConfigLoader, SafeTensorsReader, TagProcessor, YAMLHandler
+from scripts.split_positive_tags_char import process_char_data
+from utils import ConfigLoader, SafeTensorsReader, TagProcessor, YAMLDocument
 
 
 AUTO_SKIP = "auto"
@@ -51,14 +51,6 @@ def configure_console_encoding() -> None:
                 pass
 
 
-def load_existing_keys(yml_path: str) -> Set[str]:
-    import yaml
-
-    with open(yml_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
-    return {key for key in data.keys() if key}
-
-
 def should_mark_auto_skip(value: Any) -> bool:
     if value is None:
         return True
@@ -112,8 +104,23 @@ def build_initial_values(
     return char_value, dress_value
 
 
+def render_new_entry_text(key: str, char_value: str, dress_value: str) -> str:
+    char_value_escaped = char_value.replace("'", "''")
+    dress_value_escaped = dress_value.replace("'", "''")
+    return (
+        f'"{key}": # auto\n'
+        f'  weight: {TEMPLATE["weight"]}\n'
+        "  #favorites: 1\n"
+        "  skip: false\n"
+        "  positive:\n"
+        f"    char: '{char_value_escaped}'\n"
+        f"    dress: '{dress_value_escaped}'\n"
+        "\n"
+    )
+
+
 def append_missing_entries(
-    yml_path: str,
+    document: YAMLDocument,
     missing_keys: List[str],
     key_to_file: Dict[str, str],
     excluded_tags: List[str],
@@ -129,24 +136,16 @@ def append_missing_entries(
             print(f"    + 추가 예정: {key}")
         return len(missing_keys)
 
-    with open(yml_path, "a", encoding="utf-8") as f:
-        for key in missing_keys:
-            char_value, dress_value = build_initial_values(
-                key_to_file[key],
-                excluded_tags,
-                dress_tags,
-                max_tags,
-            )
-            char_value_escaped = char_value.replace("'", "''")
-            dress_value_escaped = dress_value.replace("'", "''")
-            f.write(f'"{key}": # auto\n')
-            f.write(f'  weight: {TEMPLATE["weight"]}\n')
-            f.write("  #favorites: 1\n")
-            f.write("  skip: false\n")
-            f.write("  positive:\n")
-            f.write(f"    char: '{char_value_escaped}'\n")
-            f.write(f"    dress: '{dress_value_escaped}'\n")
-            f.write("\n")
+    entries_text = []
+    for key in missing_keys:
+        char_value, dress_value = build_initial_values(
+            key_to_file[key],
+            excluded_tags,
+            dress_tags,
+            max_tags,
+        )
+        entries_text.append(render_new_entry_text(key, char_value, dress_value))
+    document.append_text("".join(entries_text))
 
     return len(missing_keys)
 
@@ -168,12 +167,8 @@ def reorder_entry_keys(entry: Dict[str, Any]) -> CommentedMap:
     return reordered
 
 
-def reorder_main_entries(yml_path: str, dry_run: bool = False) -> int:
-    yaml_handler = YAMLHandler(allow_duplicate_keys=True)
-    yml_data = yaml_handler.load(yml_path)
-    if yml_data is None:
-        return 0
-
+def reorder_main_entries(document: YAMLDocument) -> int:
+    yml_data = document.data
     reordered_count = 0
     for key, value in list(yml_data.items()):
         if not isinstance(value, dict):
@@ -181,25 +176,27 @@ def reorder_main_entries(yml_path: str, dry_run: bool = False) -> int:
         yml_data[key] = reorder_entry_keys(value)
         reordered_count += 1
 
-    if reordered_count > 0 and not dry_run:
-        yaml_handler.save(yml_path, yml_data)
+    if reordered_count > 0:
+        document.mark_dirty()
 
     return reordered_count
 
 
 def ensure_leading_empty_entries(
-    yml_path: str,
+    content: str,
     count: int = LEADING_EMPTY_ENTRY_COUNT,
-    dry_run: bool = False,
-) -> int:
+) -> Tuple[str, int]:
+    """
+    문서 맨 앞에 빈 키('') 항목이 정확히 count 개 오도록 텍스트를 고칩니다.
+    ('' 키가 여러 개인 것은 YAML 트리로 표현할 수 없어서 저장 직전 텍스트 단계에서 처리)
+
+    Returns:
+        (고친 텍스트, 바뀌었으면 넣은 항목 수 / 아니면 0)
+    """
     if count <= 0:
-        return 0
+        return content, 0
 
-    try:
-        with open(yml_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-    except Exception:
-        return 0
+    lines = content.splitlines(keepends=True)
 
     idx = 0
     while idx < len(lines) and not lines[idx].strip():
@@ -220,49 +217,18 @@ def ensure_leading_empty_entries(
     desired_prefix = LEADING_EMPTY_ENTRY * count
     remainder = "".join(lines[current:]).lstrip("\r\n")
     new_content = desired_prefix + remainder
-    original_content = "".join(lines)
 
-    if original_content == new_content:
-        return 0
+    if content == new_content:
+        return content, 0
 
-    if dry_run:
-        return max(count, existing_count)
-
-    import tempfile
-    import os
-    import shutil
-    
-    # 임시 파일을 같은 디렉토리에 생성
-    with tempfile.NamedTemporaryFile(
-        mode='w',
-        encoding='utf-8',
-        dir=os.path.dirname(yml_path),
-        delete=False,
-        suffix='.tmp'
-    ) as temp_file:
-        temp_file.write(new_content)
-        temp_path = temp_file.name
-    
-    # 임시 파일을 원본 파일로 atomic하게 교체
-    try:
-        os.replace(temp_path, yml_path)
-    except PermissionError:
-        # Windows에서 파일이 열려있을 경우, 수동으로 복사 후 삭제
-        shutil.copy2(temp_path, yml_path)
-        os.remove(temp_path)
-
-    return max(count, existing_count)
-
-
-def mark_auto_skip_entries(yml_path: str, target_keys: List[str], dry_run: bool = False) -> int:
-    if not target_keys:
-        return 0
+    return new_content, max(count, existing_count)
 
-    yaml_handler = YAMLHandler(allow_duplicate_keys=True)
-    yml_data = yaml_handler.load(yml_path)
-    if yml_data is None:
+
+def mark_auto_skip_entries(document: YAMLDocument, target_keys: List[str]) -> int:
+    if not target_keys:
         return 0
 
+    yml_data = document.data
     marked = 0
     for key in target_keys:
         value = yml_data.get(key)
@@ -272,8 +238,8 @@ def mark_auto_skip_entries(yml_path: str, target_keys: List[str], dry_run: bool
             value["skip"] = AUTO_SKIP
             marked += 1
 
-    if marked > 0 and not dry_run:
-        yaml_handler.save(yml_path, yml_data)
+    if marked > 0:
+        document.mark_dirty()
 
     return marked
 
@@ -302,12 +268,12 @@ def sync_type(
         print(f"  경고: char.yml 이 없습니다: {yml_path}")
         return 0, 0
 
-    try:
-        existing_keys = load_existing_keys(yml_path)
-    except Exception as e:
-        print(f"  오류: char.yml 읽기 실패: {e}")
+    # char.yml 은 여기서 한 번만 읽고, 아래 단계는 모두 같은 트리를 고친 뒤 마지막에 한 번 저장
+    document = YAMLDocument(yml_path)
+    if not document.load():
         print("  힌트: 먼저 _fix_yaml_quotes.cmd 를 실행해 주세요")
         return 0, 0
+    existing_keys = set(document.keys())
 
     safetensors_keys, key_to_file = SafeTensorsReader.get_keys_from_folder(folder_path)
     missing_keys = sorted(safetensors_keys - existing_keys)
@@ -317,7 +283,7 @@ def sync_type(
     print(f"  누락 키: {len(missing_keys)}개")
 
     added_count = append_missing_entries(
-        yml_path=yml_path,
+        document=document,
         missing_keys=missing_keys,
         key_to_file=key_to_file,
         excluded_tags=excluded_tags,
@@ -328,26 +294,31 @@ def sync_type(
     if added_count > 0:
         print(f"  추가 {'예정' if dry_run else '완료'}: {added_count}개")
 
-    changed_entries, _, changed_keys = process_char_yml(
-        yml_path=yml_path,
+    changed_entries, _, changed_keys = process_char_data(
+        document.data,
         excluded_tags=excluded_tags,
         dress_tags=dress_tags,
         char_feature_tags=char_feature_tags,
         mark_auto_skip=True,
-        dry_run=dry_run,
     )
+    if changed_entries > 0:
+        document.mark_dirty()
 
     target_keys = missing_keys + [key for key in changed_keys if key not in missing_keys]
     auto_skip_count = mark_auto_skip_entries(
-        yml_path=yml_path,
+        document=document,
         target_keys=target_keys,
-        dry_run=dry_run,
-    )
-    reordered_count = reorder_main_entries(yml_path=yml_path, dry_run=dry_run)
-    leading_empty_count = ensure_leading_empty_entries(
-        yml_path=yml_path,
-        dry_run=dry_run,
     )
+    reordered_count = reorder_main_entries(document)
+    content, _ = ensure_leading_empty_entries(document.render())
+    # 저장하면서 트리에서 합쳐지는 '' 키는 매번 다시 채우므로, 보고는 원본 파일 기준
+    _, leading_empty_count = ensure_leading_empty_entries(document.text)
+
+    if not dry_run and content != document.text:
+        if document.save(content):
+            print(f"  [OK] 저장 완료: {yml_path}")
+        else:
+            print(f"  [ERROR] 저장 실패: {yml_path}")
 
     if changed_entries == 0:
         print("  [OK] 후처리 변경 없음")
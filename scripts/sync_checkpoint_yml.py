@@ -14,7 +14,7 @@ script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from utils import ConfigLoader, TagProcessor, YAMLHandler
+from utils import ConfigLoader, TagProcessor, YAMLDocument, YAMLHandler
 
 
 DEFAULT_SKIP = False
@@ -400,7 +400,7 @@ def render_new_entry_text(key: str, metadata: Dict[str, Any]) -> str:
 
 
 def append_missing_entries(
-    yml_path: str,
+    document: YAMLDocument,
     missing_keys: List[str],
     metadata_cache: Dict[str, Dict[str, Any]],
     dry_run: bool = False,
@@ -413,9 +413,9 @@ def append_missing_entries(
             print(f"    + 추가 예정: {key} ({state})")
         return len(missing_keys)
 
-    with open(yml_path, "a", encoding="utf-8") as f:
-        for key in missing_keys:
-            f.write(render_new_entry_text(key, metadata_cache.get(key, {})))
+    document.append_text(
+        "".join(render_new_entry_text(key, metadata_cache.get(key, {})) for key in missing_keys)
+    )
     return len(missing_keys)
 
 
@@ -438,10 +438,12 @@ def sync_type(
         print(f"  경고: checkpoint.yml 이 없습니다: {yml_path}")
         return 0, 0
 
-    yml_data = yaml_handler.load(yml_path)
-    if yml_data is None:
+    # checkpoint.yml 은 한 번만 읽고, 누락 키 추가 / 보정 / 순서 정리를 메모리에서 한 뒤 한 번 저장
+    document = YAMLDocument(yml_path, yaml_handler)
+    if not document.load():
         print("  오류: checkpoint.yml 로드 실패")
         return 0, 0
+    yml_data = document.data
 
     # 탐색 폴더 취합 (기본 Checkpoint 및 Diffusion Models 경로 추가)
     search_paths = [os.path.join(checkpoint_dir, type_name)]
@@ -455,7 +457,7 @@ def sync_type(
             file_map.update(get_checkpoint_file_map(path))
     file_map = dict(sorted(file_map.items()))
 
-    existing_keys = {key for key in yml_data.keys() if key}
+    existing_keys = set(document.keys())
     missing_keys = [key for key in file_map.keys() if key not in existing_keys]
     metadata_cache = {key: extract_metadata_from_file(path) for key, path in file_map.items()}
 
@@ -464,18 +466,12 @@ def sync_type(
     print(f"  누락 키: {len(missing_keys)}개")
 
     added_count = append_missing_entries(
-        yml_path=yml_path,
+        document=document,
         missing_keys=missing_keys,
         metadata_cache=metadata_cache,
         dry_run=dry_run,
     )
 
-    if added_count > 0 and not dry_run:
-        yml_data = yaml_handler.load(yml_path)
-        if yml_data is None:
-            print("  오류: 추가 후 checkpoint.yml 재로드 실패")
-            return added_count, 0
-
     normalized_count = 0
     for key, value in list(yml_data.items()):
         if not isinstance(value, dict):
@@ -492,9 +488,11 @@ def sync_type(
             print(f"    * 구조/메타 보정: {key}")
 
         yml_data[key] = reorder_entry_keys(value)
+        document.mark_dirty()
 
-    if not dry_run and (added_count > 0 or normalized_count > 0 or len(yml_data) > 0):
-        if yaml_handler.save(yml_path, yml_data):
+    content = document.render()
+    if not dry_run and content != document.text:
+        if document.save(content):
             print(f"  [OK] 저장 완료: {yml_path}")
         else:
             print(f"  [ERROR] 저장 실패: {yml_path}")
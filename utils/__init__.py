@@ -5,7 +5,44 @@
 from .config_loader import ConfigLoader
 from .tag_processor import TagProcessor
 from .yaml_handler import YAMLHandler
+from .yaml_cache import YAMLCache
+from .yaml_document import YAMLDocument
+from .yaml_key_scanner import YAMLKeyScanner
 from .safetensors_reader import SafeTensorsReader
+from .metadata_index import MetadataIndex
+from .arch_detector import ArchitectureDetector
+from .async_reader import AsyncReader
+from .hash_scheduler import HashJob, HashScheduler
+from .file_hasher import FileHasher
+from .hash_store import HashStore
+from .hash_targets import HashTargets
+from .block_hasher import BlockTreeHasher
+from .rate_limiter import TokenBucket
+from .hash_catalog import HashCatalog
+from .hardlink_dedupe import HardlinkDeduper
+from .hash_progress import HashProgress
+from .safetensors_writer import SafeTensorsWriter
 
-__all__ = ['ConfigLoader', 'TagProcessor', 'YAMLHandler', 'SafeTensorsReader']
-
+__all__ = [
+    'ConfigLoader',
+    'TagProcessor',
+    'YAMLHandler',
+    'YAMLCache',
+    'YAMLDocument',
+    'YAMLKeyScanner',
+    'SafeTensorsReader',
+    'MetadataIndex',
+    'ArchitectureDetector',
+    'AsyncReader',
+    'HashJob',
+    'HashScheduler',
+    'FileHasher',
+    'HashStore',
+    'HashTargets',
+    'BlockTreeHasher',
+    'TokenBucket',
+    'HashCatalog',
+    'HardlinkDeduper',
+    'HashProgress',
+    'SafeTensorsWriter',
+]
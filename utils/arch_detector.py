@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+safetensors 헤더 기반 모델 아키텍처 판별 유틸리티
+"""
+from typing import Any, Dict, List, Optional
+
+from .safetensors_reader import SafeTensorsReader
+
+
+UNKNOWN = "unknown"
+
+# cross-attention(attn2.to_k) 입력 차원 -> 계열
+CONTEXT_DIM_FAMILIES = {
+    768: "sd15",
+    1024: "sd2",
+    2048: "sdxl",
+}
+
+# 텐서 키에 포함되면 해당 계열로 판단하는 문자열 (앞쪽 우선)
+KEY_FAMILY_HINTS = [
+    ("flux", ("double_blocks", "single_blocks", "single_transformer_blocks")),
+    ("sd3", ("joint_blocks", "context_block")),
+    ("sdxl", ("lora_te1_", "lora_te2_", "conditioner.embedders.1", "lora_unet_input_blocks", "lora_unet_output_blocks")),
+    ("sd15", ("lora_te_", "cond_stage_model.transformer")),
+]
+
+# ss_base_model_version / modelspec.architecture 값 -> 계열
+METADATA_FAMILY_HINTS = [
+    ("flux", ("flux",)),
+    ("sd3", ("sd3", "stable-diffusion-3")),
+    ("sdxl", ("sdxl", "stable-diffusion-xl")),
+    ("sd2", ("sd_v2", "stable-diffusion-v2")),
+    ("sd15", ("sd_v1", "stable-diffusion-v1")),
+]
+
+# SDXL 계열 세부 분류 (학습 베이스 모델 이름 힌트)
+VARIANT_HINTS = [
+    ("pony", ("pony",)),
+    ("illustrious", ("illustrious", "noob", "ilxl")),
+    ("animagine", ("animagine",)),
+]
+VARIANT_METADATA_KEYS = ("ss_sd_model_name", "modelspec.base_model", "ss_base_model_version", "modelspec.title")
+
+
+class ArchitectureDetector:
+    """텐서 키 이름/shape 과 메타데이터로 베이스 아키텍처를 판별하는 클래스"""
+
+    @staticmethod
+    def _family_from_context_dim(header: Dict[str, Any]) -> Optional[str]:
+        for name, info in header.items():
+            if name == "__metadata__" or "attn2" not in name or "to_k" not in name:
+                continue
+            if not name.endswith("weight") or any(part in name for part in ("lora_up", "lora_B", "lora.up")):
+                continue
+            shape = info.get("shape") if isinstance(info, dict) else None
+            if isinstance(shape, list) and len(shape) == 2:
+                family = CONTEXT_DIM_FAMILIES.get(shape[-1])
+                if family:
+                    return family
+        return None
+
+    @staticmethod
+    def _family_from_keys(header: Dict[str, Any]) -> Optional[str]:
+        names = [name for name in header.keys() if name != "__metadata__"]
+        for family, hints in KEY_FAMILY_HINTS:
+            if any(hint in name for name in names for hint in hints):
+                return family
+        return None
+
+    @staticmethod
+    def _family_from_metadata(metadata: Dict[str, Any]) -> Optional[str]:
+        values = " ".join(
+            str(metadata.get(key, "")).lower()
+            for key in ("ss_base_model_version", "modelspec.architecture")
+        )
+        for family, hints in METADATA_FAMILY_HINTS:
+            if any(hint in values for hint in hints):
+                return family
+        return None
+
+    @staticmethod
+    def _variant_from_metadata(metadata: Dict[str, Any]) -> Optional[str]:
+        values = " ".join(str(metadata.get(key, "")).lower() for key in VARIANT_METADATA_KEYS)
+        for variant, hints in VARIANT_HINTS:
+            if any(hint in values for hint in hints):
+                return variant
+        return None
+
+    @staticmethod
+    def detect(header: Optional[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        """
+        헤더에서 아키텍처를 판별합니다.
+
+        Args:
+            header: SafeTensorsReader.read_header() 결과
+
+        Returns:
+            {'family': 'sd15'|'sd2'|'sdxl'|'sd3'|'flux'|'unknown',
+             'variant': 'pony'|'illustrious'|... 또는 None,
+             'source': 판별 근거('shape'|'keys'|'metadata'|None)}
+        """
+        if not header:
+            return {"family": UNKNOWN, "variant": None, "source": None}
+
+        metadata = header.get("__metadata__") or {}
+        family = ArchitectureDetector._family_from_context_dim(header)
+        source = "shape" if family else None
+        if not family:
+            family = ArchitectureDetector._family_from_keys(header)
+            source = "keys" if family else None
+        if not family:
+            family = ArchitectureDetector._family_from_metadata(metadata)
+            source = "metadata" if family else None
+
+        variant = ArchitectureDetector._variant_from_metadata(metadata) if family == "sdxl" else None
+        return {"family": family or UNKNOWN, "variant": variant, "source": source}
+
+    @staticmethod
+    def detect_file(file_path: str) -> Dict[str, Optional[str]]:
+        """파일 헤더만 읽어서 아키텍처를 판별합니다 (텐서 데이터는 읽지 않음)."""
+        return ArchitectureDetector.detect(SafeTensorsReader.read_header(file_path))
+
+    @staticmethod
+    def format_label(result: Dict[str, Optional[str]]) -> str:
+        if result.get("variant"):
+            return f"{result['family']}/{result['variant']}"
+        return str(result.get("family") or UNKNOWN)
+
+    @staticmethod
+    def matches(result: Dict[str, Optional[str]], accepted: List[str]) -> bool:
+        """
+        판별 결과가 허용 목록('sdxl', 'sdxl/pony' 형태)에 맞는지 확인합니다.
+        세부 분류(variant)를 알 수 없으면 계열만 비교합니다.
+        """
+        family = result.get("family")
+        variant = result.get("variant")
+        for label in accepted:
+            accepted_family, _, accepted_variant = str(label).lower().partition("/")
+            if accepted_family != family:
+                continue
+            if not accepted_variant or not variant or accepted_variant == variant:
+                return True
+        return False
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio 용 메타데이터/인벤토리 읽기 유틸리티
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .safetensors_reader import SafeTensorsReader
+from .yaml_handler import YAMLHandler
+
+
+class AsyncReader:
+    """
+    블로킹 I/O(SafeTensorsReader, 폴더 스캔, YAMLHandler.load)를 제한된 스레드 풀로
+    넘겨서 하나의 이벤트 루프에서 여러 폴더/타입을 동시에 읽을 수 있게 하는 클래스
+
+    사용 예:
+        async with AsyncReader(max_workers=8) as reader:
+            metadata = await reader.read_metadata(path)
+            async for folder, key, path, stat in reader.iter_inventory(folders):
+                ...
+    """
+
+    def __init__(self, max_workers: int = 8, allow_duplicate_keys: bool = True):
+        """
+        Args:
+            max_workers: 동시에 실행할 블로킹 작업 수 (스레드 풀 크기)
+            allow_duplicate_keys: load_yaml 에서 사용할 YAMLHandler 옵션
+        """
+        self.max_workers = max(1, max_workers)
+        self.allow_duplicate_keys = allow_duplicate_keys
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="AsyncReader")
+        # ruamel YAML 인스턴스는 스레드 간 공유가 안전하지 않으므로 스레드별로 만든다.
+        self._local = threading.local()
+
+    async def __aenter__(self) -> "AsyncReader":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        # 남은 작업이 끝날 때까지 기다리는 shutdown 은 블로킹이므로 이벤트 루프 밖에서 실행
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def _get_yaml_handler(self) -> YAMLHandler:
+        handler = getattr(self._local, "yaml_handler", None)
+        if handler is None:
+            handler = YAMLHandler(allow_duplicate_keys=self.allow_duplicate_keys)
+            self._local.yaml_handler = handler
+        return handler
+
+    def _load_yaml_blocking(self, yml_path: str) -> Optional[Dict[str, Any]]:
+        return self._get_yaml_handler().load(yml_path)
+
+    async def read_header(self, file_path: str) -> Optional[Dict[str, Any]]:
+        return await self._run(SafeTensorsReader.read_header, file_path)
+
+    async def read_metadata(self, file_path: str) -> Optional[Dict[str, str]]:
+        return await self._run(SafeTensorsReader.read_metadata, file_path)
+
+    async def extract_ss_tag_frequency(self, file_path: str) -> Optional[Dict]:
+        return await self._run(SafeTensorsReader.extract_ss_tag_frequency, file_path)
+
+    async def check_integrity(self, file_path: str) -> Tuple[bool, str]:
+        return await self._run(SafeTensorsReader.check_integrity, file_path)
+
+    async def scan_folder(self, folder_path: str) -> List[Tuple[str, str, os.stat_result]]:
+        return await self._run(SafeTensorsReader.scan_folder, folder_path)
+
+    async def get_keys_from_folder(self, folder_path: str):
+        return await self._run(SafeTensorsReader.get_keys_from_folder, folder_path)
+
+    async def load_yaml(self, yml_path: str) -> Optional[Dict[str, Any]]:
+        """YAMLHandler.load (주석 보존) 의 비동기 버전"""
+        return await self._run(self._load_yaml_blocking, yml_path)
+
+    async def load_yaml_simple(self, yml_path: str) -> Optional[Dict[str, Any]]:
+        """YAMLHandler.load_simple (읽기 전용) 의 비동기 버전"""
+        return await self._run(YAMLHandler.load_simple, yml_path)
+
+    async def iter_inventory(
+        self, folder_paths: Iterable[str]
+    ) -> AsyncIterator[Tuple[str, str, str, os.stat_result]]:
+        """
+        여러 폴더를 동시에 스캔하고, 스캔이 끝난 폴더부터 (폴더, 키, 파일경로, stat) 를 내보냅니다.
+        """
+        async def scan(folder_path: str) -> Tuple[str, List[Tuple[str, str, os.stat_result]]]:
+            return folder_path, await self.scan_folder(folder_path)
+
+        tasks = [asyncio.ensure_future(scan(folder_path)) for folder_path in folder_paths]
+        try:
+            for future in asyncio.as_completed(tasks):
+                folder_path, entries = await future
+                for key, file_path, stat in entries:
+                    yield folder_path, key, file_path, stat
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def iter_map(
+        self, func: Callable[[str], Any], file_paths: Iterable[str]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        파일마다 func(file_path) 를 스레드 풀에서 실행하고 끝난 순서대로 (파일경로, 결과) 를 내보냅니다.
+        실행 중인 작업 수는 max_workers 의 2배로 제한해서 파일이 많아도 메모리가 늘지 않습니다.
+        """
+        window = self.max_workers * 2
+        pending: Dict[asyncio.Future, str] = {}
+        paths = iter(file_paths)
+
+        def fill() -> None:
+            while len(pending) < window:
+                file_path = next(paths, None)
+                if file_path is None:
+                    return
+                pending[asyncio.ensure_future(self._run(func, file_path))] = file_path
+
+        fill()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(list(pending), return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    file_path = pending.pop(future)
+                    yield file_path, future.result()
+                fill()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def iter_metadata(self, file_paths: Iterable[str]) -> AsyncIterator[Tuple[str, Optional[Dict[str, str]]]]:
+        """여러 파일의 __metadata__ 를 동시에 읽어서 끝난 순서대로 내보냅니다."""
+        async for file_path, metadata in self.iter_map(SafeTensorsReader.read_metadata, file_paths):
+            yield file_path, metadata
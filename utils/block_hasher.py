@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+블록 트리(Merkle) 해시 유틸리티
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Optional
+
+from .file_hasher import DEFAULT_BLOCK_SIZE, FileHasher
+from .rate_limiter import TokenBucket
+
+
+# 트리 해시 블록 크기 (config.yml 의 hash.tree_block_mb 로 변경 가능)
+DEFAULT_TREE_BLOCK_SIZE = 64 * 1024 * 1024
+
+
+class BlockTreeHasher:
+    """
+    큰 파일 하나를 고정 크기 블록으로 나눠 여러 스레드로 동시에 해시하는 클래스.
+
+    - 블록 해시: SHA256(블록 바이트)
+    - 루트 해시(tree_sha256): SHA256(블록0 해시 || 블록1 해시 || ...) (각 해시는 32바이트 raw)
+    - 완료된 블록 해시는 state_dir 에 파일별 JSON 으로 저장되어, 중단된 파일은 남은 블록만 다시 읽음
+      (size / mtime_ns / 블록 크기가 바뀌면 저장된 상태는 버림)
+
+    루트 해시는 블록 크기에 따라 달라지므로 일반 SHA256 과 호환되지 않습니다.
+    일반 SHA256 이 필요한 곳에서는 FileHasher 를 사용하세요.
+    """
+
+    def __init__(
+        self,
+        state_dir: str,
+        block_size: int = DEFAULT_TREE_BLOCK_SIZE,
+        workers: int = 4,
+        read_size: int = DEFAULT_BLOCK_SIZE,
+        cancel_event: Optional[threading.Event] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        on_bytes: Optional[Callable[[str, int], None]] = None,
+    ):
+        """
+        Args:
+            state_dir: 블록 진행 상태 JSON 을 저장할 디렉토리
+            block_size: 트리 블록 크기 (bytes)
+            workers: 파일 하나를 동시에 해시할 스레드 수
+            read_size: 블록 안에서 한 번에 읽을 크기 (bytes)
+            cancel_event: set 되면 남은 블록을 건너뛰고 None 반환
+            rate_limiter: 읽기 대역폭 제한 (모든 블록 스레드가 공유)
+            on_bytes: 블록 스레드가 읽을 때마다 (파일 경로, 읽은 바이트 수) 로 호출
+        """
+        self.state_dir = state_dir
+        self.block_size = max(1024 * 1024, int(block_size))
+        self.workers = max(1, int(workers))
+        self.reader = FileHasher(
+            min(read_size, self.block_size), cancel_event=cancel_event, rate_limiter=rate_limiter, on_bytes=on_bytes
+        )
+
+    @property
+    def block_mb(self) -> int:
+        return self.block_size // (1024 * 1024)
+
+    def _state_path(self, file_path: str) -> str:
+        key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.state_dir, f"{key}.json")
+
+    def _load_state(self, file_path: str, stat: os.stat_result) -> Dict[int, str]:
+        state_path = self._state_path(file_path)
+        if not os.path.exists(state_path):
+            return {}
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (
+            state.get("size") != stat.st_size
+            or state.get("mtime_ns") != stat.st_mtime_ns
+            or state.get("block_size") != self.block_size
+        ):
+            return {}
+        return {int(index): value for index, value in state.get("blocks", {}).items()}
+
+    def _save_state(self, file_path: str, stat: os.stat_result, blocks: Dict[int, str]) -> None:
+        os.makedirs(self.state_dir, exist_ok=True)
+        state_path = self._state_path(file_path)
+        state = {
+            "path": file_path,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "block_size": self.block_size,
+            "blocks": {str(index): value for index, value in sorted(blocks.items())},
+        }
+        temp_path = state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+
+    def _remove_state(self, file_path: str) -> None:
+        try:
+            os.remove(self._state_path(file_path))
+        except OSError:
+            pass
+
+    def hash_file(
+        self, file_path: str, stat: Optional[os.stat_result] = None, resume: bool = True
+    ) -> Optional[Dict[str, object]]:
+        """
+        트리 해시를 계산합니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 이미 구한 os.stat 결과
+            resume: False 면 저장된 블록 상태를 무시하고 쓰지도 않음 (verify 처럼 모든 블록을 다시 읽어야 할 때)
+
+        Returns:
+            {'tree_sha256': <hex>, 'tree_block_mb': <int>}, 취소/실패 시 None
+            (이미 끝난 블록은 상태 파일에 남아 다음 실행에서 이어서 계산)
+        """
+        try:
+            stat = stat or os.stat(file_path)
+        except OSError as e:
+            print(f"  오류: 트리 해시 계산 실패 - {file_path}: {e}")
+            return None
+
+        block_count = (stat.st_size + self.block_size - 1) // self.block_size
+        blocks = self._load_state(file_path, stat) if resume else {}
+        pending = [index for index in range(block_count) if index not in blocks]
+        if blocks and pending:
+            print(f"  트리 해시 이어서 계산: {os.path.basename(file_path)} ({len(blocks)}/{block_count} 블록 완료)")
+
+        state_lock = threading.Lock()
+        failed = False
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(pending)), thread_name_prefix="TreeBlock") as executor:
+                futures = {
+                    executor.submit(
+                        self.reader.hash_range,
+                        file_path,
+                        index * self.block_size,
+                        min(self.block_size, stat.st_size - index * self.block_size),
+                    ): index
+                    for index in pending
+                }
+                for future in as_completed(futures):
+                    value = future.result()
+                    if value is None:
+                        failed = True
+                        continue
+                    with state_lock:
+                        blocks[futures[future]] = value
+                        if resume:
+                            self._save_state(file_path, stat, blocks)
+
+        if failed or self.reader.is_cancelled():
+            return None
+
+        root = hashlib.sha256()
+        for index in range(block_count):
+            root.update(bytes.fromhex(blocks[index]))
+        if resume:
+            self._remove_state(file_path)
+        return {"tree_sha256": root.hexdigest(), "tree_block_mb": self.block_mb}
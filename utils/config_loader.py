@@ -6,6 +6,47 @@ from typing import Any, Dict, List, Optional
 import yaml
 
 
+# calculate_sha256_lora.py 등 해시 관련 기본 설정 (config.yml 의 hash: 섹션으로 덮어씀)
+DEFAULT_HASH_CONFIG: Dict[str, Any] = {
+    "workers": 4,
+    "readers_per_device": 1,
+    "block_size_mb": 8,
+    "verify_sample": 0,
+    "edge_size_mb": 4,
+    "digests": ["sha256", "autov2", "autov1", "tensor_sha256", "tensor_index_sha256"],
+    "tree_block_mb": 64,
+    "tree_workers": 4,
+    "tree_min_size_mb": 1024,
+    "verify_mbps": 50,
+    "progress_interval": 5,
+    "embedded_verify_sample": 10,
+}
+
+# 읽기 전용 YAML 파싱 결과 캐시 (config.yml 의 yaml_cache: 섹션으로 덮어씀, dir 이 비어 있으면 사용자별 캐시 폴더)
+DEFAULT_YAML_CACHE_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "dir": "",
+    "max_mb": 256,
+}
+
+# 사용자별 캐시 폴더 아래에 만들 폴더 이름
+CACHE_APP_DIRNAME = "ComfyU-auto-script"
+
+
+def default_cache_dir(name: str) -> str:
+    """
+    사용자별 캐시 폴더 경로를 반환합니다 (data_dir 은 백업/동기화 대상일 수 있으므로 그 밖에 둠).
+
+    - Windows: %LOCALAPPDATA%\\ComfyU-auto-script\\<name>
+    - 그 외: $XDG_CACHE_HOME/ComfyU-auto-script/<name> (없으면 ~/.cache/...)
+    """
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, CACHE_APP_DIRNAME, name)
+
+
 class ConfigLoader:
     """Load and expose values from config.yml."""
 
@@ -109,3 +150,32 @@ class ConfigLoader:
 
         # Default fallback: models/checkpoints/<type_name>
         return os.path.join(self.get_comfui_dir(), "models", "checkpoints", type_name)
+
+    def get_type_architectures(self) -> Dict[str, List[str]]:
+        """Get accepted architecture labels per type (e.g. {'IL': ['sdxl/illustrious']})."""
+        type_architectures = self.get("typeArchitectures", {})
+        if not isinstance(type_architectures, dict):
+            return {}
+        return {
+            str(type_name): [str(label) for label in (labels if isinstance(labels, list) else [labels])]
+            for type_name, labels in type_architectures.items()
+            if labels
+        }
+
+    def get_hash_config(self) -> Dict[str, Any]:
+        """Get hashing settings (hash: section) merged over DEFAULT_HASH_CONFIG."""
+        hash_config = dict(DEFAULT_HASH_CONFIG)
+        section = self.get("hash", {})
+        if isinstance(section, dict):
+            hash_config.update({key: value for key, value in section.items() if value is not None})
+        return hash_config
+
+    def get_yaml_cache_config(self) -> Dict[str, Any]:
+        """Get YAML parse-cache settings (yaml_cache: section) merged over DEFAULT_YAML_CACHE_CONFIG."""
+        cache_config = dict(DEFAULT_YAML_CACHE_CONFIG)
+        section = self.get("yaml_cache", {})
+        if isinstance(section, dict):
+            cache_config.update({key: value for key, value in section.items() if value is not None})
+        if not cache_config["dir"]:
+            cache_config["dir"] = default_cache_dir("yaml_cache")
+        return cache_config
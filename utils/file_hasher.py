@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+대용량 파일 해시 계산 유틸리티
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from .rate_limiter import TokenBucket
+from .safetensors_reader import MAX_HEADER_SIZE, SafeTensorsReader
+
+
+# 기본 읽기 블록 크기 (config.yml 의 hash.block_size_mb 로 변경 가능)
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+
+# 부분 해시에서 앞/뒤로 읽는 크기 (config.yml 의 hash.edge_size_mb 로 변경 가능)
+DEFAULT_EDGE_SIZE = 4 * 1024 * 1024
+
+# hash_digests 가 지원하는 다이제스트
+#   sha256        : 파일 전체 SHA256
+#   autov2        : sha256 앞 10자리 (Civitai / A1111 AutoV2)
+#   autov1        : 0x100000 위치의 0x10000 바이트 SHA256 앞 8자리 (A1111 예전 model hash)
+#   tensor_sha256 : safetensors 헤더를 뺀 텐서 데이터 영역의 SHA256 (sd-scripts sshs_model_hash)
+#   tensor_index_sha256 : __metadata__ 를 뺀 텐서 목록(이름/dtype/shape/offset)의 정규화 SHA256
+SUPPORTED_DIGESTS = ("sha256", "autov2", "autov1", "tensor_sha256", "tensor_index_sha256")
+AUTOV1_OFFSET = 0x100000
+AUTOV1_LENGTH = 0x10000
+
+
+class FileHasher:
+    """
+    재사용 버퍼 + readinto 로 파일을 읽어 해시를 계산하는 클래스.
+
+    - 블록마다 새 bytes 객체를 만들지 않고 스레드별 bytearray 하나를 계속 재사용
+    - buffering=0 (FileIO) 으로 열어서 파이썬 레벨 버퍼 복사를 한 번 더 하지 않음
+    - 블록 경계마다 cancel_event 를 확인해서 큰 파일도 바로 취소 가능
+    - on_bytes(file_path, 읽은 바이트) 가 있으면 블록마다 호출 (큰 파일도 진행률/처리량이 실시간으로 보이도록)
+    """
+
+    # 스레드별 재사용 버퍼 (인스턴스가 여러 개여도 스레드당 하나만 유지)
+    _local = threading.local()
+
+    def __init__(
+        self,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cancel_event: Optional[threading.Event] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        on_bytes: Optional[Callable[[str, int], None]] = None,
+    ):
+        """
+        Args:
+            block_size: 한 번에 읽을 크기 (bytes)
+            cancel_event: set 되면 해시 계산을 중단하고 None 반환
+            rate_limiter: 읽기 대역폭 제한 (여러 FileHasher/스레드가 공유 가능)
+            on_bytes: 블록을 읽을 때마다 (파일 경로, 읽은 바이트 수) 로 호출 (HashProgress.add_bytes 등)
+        """
+        self.block_size = max(64 * 1024, int(block_size))
+        self.cancel_event = cancel_event
+        self.rate_limiter = rate_limiter
+        self.on_bytes = on_bytes
+
+    def _get_buffer(self) -> memoryview:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None or len(buffer) != self.block_size:
+            buffer = bytearray(self.block_size)
+            self._local.buffer = buffer
+        return memoryview(buffer)
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def _throttle(self, file_path: str, read_size: int) -> bool:
+        """
+        읽은 만큼 on_bytes 로 알리고, rate_limiter 가 있으면 읽은 만큼 기다립니다.
+        기다리는 중 취소되면 False.
+        """
+        if self.on_bytes is not None:
+            self.on_bytes(file_path, read_size)
+        if self.rate_limiter is None:
+            return True
+        return self.rate_limiter.consume(read_size, self.cancel_event)
+
+    def hash_file(self, file_path: str, algorithm: str = "sha256") -> Optional[str]:
+        """
+        파일 전체의 해시(hex)를 계산합니다.
+
+        Args:
+            file_path: 파일 경로
+            algorithm: hashlib 알고리즘 이름
+
+        Returns:
+            hex 문자열, 취소/실패 시 None
+        """
+        digest = hashlib.new(algorithm)
+        view = self._get_buffer()
+
+        try:
+            with open(file_path, "rb", buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    try:
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    except OSError:
+                        pass
+                while True:
+                    if self.is_cancelled():
+                        return None
+                    read_size = f.readinto(view)
+                    if not read_size:
+                        break
+                    digest.update(view[:read_size])
+                    if not self._throttle(file_path, read_size):
+                        return None
+            return digest.hexdigest()
+        except Exception as e:
+            print(f"  오류: {algorithm.upper()} 계산 실패 - {file_path}: {e}")
+            return None
+        finally:
+            view.release()
+
+    def sha256(self, file_path: str) -> Optional[str]:
+        return self.hash_file(file_path, "sha256")
+
+    def hash_digests(self, file_path: str, digests: Iterable[str] = ("sha256",)) -> Optional[Dict[str, str]]:
+        """
+        파일을 한 번만 읽으면서 여러 다이제스트를 같이 계산합니다.
+
+        Args:
+            file_path: 파일 경로
+            digests: SUPPORTED_DIGESTS 중 계산할 이름 (sha256 은 항상 포함)
+
+        Returns:
+            {다이제스트 이름: hex}, 취소/실패 시 None
+            (tensor_sha256 / tensor_index_sha256 은 safetensors 헤더를 읽을 수 없으면 빠짐)
+        """
+        names = set(digests) | {"sha256"}
+        full = hashlib.sha256()
+        autov1 = hashlib.sha256() if "autov1" in names else None
+        tensor = hashlib.sha256() if "tensor_sha256" in names else None
+        header_bytes = bytearray() if "tensor_index_sha256" in names else None
+        data_start = None
+        view = self._get_buffer()
+
+        try:
+            with open(file_path, "rb", buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    try:
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    except OSError:
+                        pass
+                if tensor is not None or header_bytes is not None:
+                    size = os.fstat(f.fileno()).st_size
+                    prefix = f.read(8)
+                    f.seek(0)
+                    if len(prefix) == 8:
+                        header_size = int.from_bytes(prefix, "little")
+                        if header_size <= MAX_HEADER_SIZE and 8 + header_size <= size:
+                            data_start = 8 + header_size
+
+                position = 0
+                while True:
+                    if self.is_cancelled():
+                        return None
+                    read_size = f.readinto(view)
+                    if not read_size:
+                        break
+                    block = view[:read_size]
+                    end = position + read_size
+                    full.update(block)
+                    if autov1 is not None and position < AUTOV1_OFFSET + AUTOV1_LENGTH and end > AUTOV1_OFFSET:
+                        start = max(AUTOV1_OFFSET, position) - position
+                        stop = min(AUTOV1_OFFSET + AUTOV1_LENGTH, end) - position
+                        autov1.update(block[start:stop])
+                    if data_start is not None:
+                        if header_bytes is not None and position < data_start:
+                            header_bytes += block[max(0, 8 - position):data_start - position]
+                        if tensor is not None and end > data_start:
+                            tensor.update(block[max(0, data_start - position):])
+                    position = end
+                    if not self._throttle(file_path, read_size):
+                        return None
+
+            sha256_value = full.hexdigest()
+            result = {"sha256": sha256_value}
+            if "autov2" in names:
+                result["autov2"] = sha256_value[:10]
+            if autov1 is not None:
+                result["autov1"] = autov1.hexdigest()[:8]
+            if data_start is not None and tensor is not None:
+                result["tensor_sha256"] = tensor.hexdigest()
+            if data_start is not None and header_bytes is not None:
+                try:
+                    header = json.loads(bytes(header_bytes).decode("utf-8"))
+                    if isinstance(header, dict):
+                        result["tensor_index_sha256"] = SafeTensorsReader.tensor_index_digest(header)
+                except ValueError:
+                    pass
+            return result
+        except Exception as e:
+            print(f"  오류: 해시 계산 실패 - {file_path}: {e}")
+            return None
+        finally:
+            view.release()
+
+    def hash_range(self, file_path: str, offset: int, length: int, algorithm: str = "sha256") -> Optional[str]:
+        """
+        파일의 [offset, offset + length) 구간만 읽어서 해시(hex)를 계산합니다.
+
+        Returns:
+            hex 문자열, 취소/실패 시 None
+        """
+        digest = hashlib.new(algorithm)
+        view = self._get_buffer()
+
+        try:
+            with open(file_path, "rb", buffering=0) as f:
+                f.seek(offset)
+                if not self._update_range(f, file_path, digest, view, length):
+                    return None
+            return digest.hexdigest()
+        except Exception as e:
+            print(f"  오류: {algorithm.upper()} 계산 실패 - {file_path} (offset {offset}): {e}")
+            return None
+        finally:
+            view.release()
+
+    def _update_range(self, f, file_path: str, digest, view: memoryview, length: int) -> bool:
+        """현재 위치에서 length 바이트를 읽어 digest 에 넣습니다. 취소되면 False."""
+        while length > 0:
+            if self.is_cancelled():
+                return False
+            chunk = view[:min(length, len(view))]
+            read_size = f.readinto(chunk)
+            if not read_size:
+                break
+            digest.update(chunk[:read_size])
+            length -= read_size
+            if not self._throttle(file_path, read_size):
+                return False
+        return True
+
+    def partial_hash(self, file_path: str, edge_size: int = DEFAULT_EDGE_SIZE) -> Optional[str]:
+        """
+        파일 크기 + 앞/뒤 edge_size 바이트만으로 SHA256 을 계산합니다 (중복 후보 선별용).
+        파일이 edge_size * 2 이하이면 전체를 읽습니다.
+
+        Returns:
+            hex 문자열, 취소/실패 시 None
+        """
+        digest = hashlib.sha256()
+        view = self._get_buffer()
+
+        try:
+            with open(file_path, "rb", buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+                digest.update(size.to_bytes(8, "little"))
+                head = min(size, edge_size)
+                if not self._update_range(f, file_path, digest, view, head):
+                    return None
+                tail_start = max(head, size - edge_size)
+                if tail_start < size:
+                    f.seek(tail_start)
+                    if not self._update_range(f, file_path, digest, view, size - tail_start):
+                        return None
+            return digest.hexdigest()
+        except Exception as e:
+            print(f"  오류: 부분 해시 계산 실패 - {file_path}: {e}")
+            return None
+        finally:
+            view.release()
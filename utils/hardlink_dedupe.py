@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+중복 파일 하드링크 치환 유틸리티
+"""
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+from .file_hasher import DEFAULT_BLOCK_SIZE
+
+
+class HardlinkDeduper:
+    """
+    내용이 같은 파일을 하드링크로 바꿔 디스크 공간을 되찾는 클래스.
+
+    - 바꾸기 전에 두 파일을 처음부터 끝까지 바이트 단위로 비교 (해시만 믿지 않음)
+    - 같은 폴더에 임시 하드링크를 만든 뒤 os.replace 로 바꿔치기 (파일마다 원자적)
+    - 바꾼 파일은 저널(JSONL)에 기록하고, rollback() 으로 다시 독립 파일로 되돌릴 수 있음
+    """
+
+    def __init__(self, journal_path: str, block_size: int = DEFAULT_BLOCK_SIZE, dry_run: bool = False):
+        """
+        Args:
+            journal_path: 되돌리기용 저널 경로 (보통 data_dir/dedupe_journal.jsonl)
+            block_size: 비교할 때 한 번에 읽을 크기 (bytes)
+            dry_run: True 면 비교만 하고 파일은 바꾸지 않음
+        """
+        self.journal_path = journal_path
+        self.block_size = max(64 * 1024, int(block_size))
+        self.dry_run = dry_run
+        self._journal: Optional[IO[str]] = None
+
+    def close(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def __enter__(self) -> "HardlinkDeduper":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def files_equal(self, path_a: str, path_b: str) -> bool:
+        """두 파일을 스트리밍으로 바이트 비교합니다."""
+        buffer_a = bytearray(self.block_size)
+        buffer_b = bytearray(self.block_size)
+        view_a = memoryview(buffer_a)
+        view_b = memoryview(buffer_b)
+        try:
+            with open(path_a, "rb", buffering=0) as file_a, open(path_b, "rb", buffering=0) as file_b:
+                if os.fstat(file_a.fileno()).st_size != os.fstat(file_b.fileno()).st_size:
+                    return False
+                while True:
+                    read_a = file_a.readinto(view_a)
+                    read_b = file_b.readinto(view_b)
+                    if read_a != read_b:
+                        return False
+                    if not read_a:
+                        return True
+                    if view_a[:read_a] != view_b[:read_b]:
+                        return False
+        finally:
+            view_a.release()
+            view_b.release()
+
+    def _append_journal(self, entry: Dict[str, Any]) -> None:
+        if self._journal is None:
+            journal_dir = os.path.dirname(self.journal_path)
+            if journal_dir:
+                os.makedirs(journal_dir, exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._journal.flush()
+
+    def link(self, keep_path: str, duplicate_path: str) -> Tuple[bool, str]:
+        """
+        duplicate_path 를 keep_path 의 하드링크로 바꿉니다.
+
+        Returns:
+            (성공 여부, 사유)
+        """
+        try:
+            keep_stat = os.stat(keep_path)
+            duplicate_stat = os.stat(duplicate_path)
+        except OSError as e:
+            return False, f"stat 실패: {e}"
+
+        if keep_stat.st_dev != duplicate_stat.st_dev:
+            return False, "다른 디스크(볼륨)"
+        if keep_stat.st_ino and keep_stat.st_ino == duplicate_stat.st_ino:
+            return False, "이미 하드링크"
+        if not self.files_equal(keep_path, duplicate_path):
+            return False, "내용 불일치"
+        if self.dry_run:
+            return True, "dry-run"
+
+        temp_path = os.path.join(
+            os.path.dirname(duplicate_path),
+            f".{os.path.basename(duplicate_path)}.dedupe-{os.getpid()}",
+        )
+        try:
+            os.link(keep_path, temp_path)
+            os.replace(temp_path, duplicate_path)
+        except OSError as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False, f"하드링크 실패: {e}"
+
+        self._append_journal({
+            "path": duplicate_path,
+            "kept": keep_path,
+            "size": duplicate_stat.st_size,
+            "mtime_ns": duplicate_stat.st_mtime_ns,
+            "linked_at": datetime.now().isoformat(timespec="seconds"),
+        })
+        return True, "하드링크"
+
+    def read_journal(self) -> List[Dict[str, Any]]:
+        entries: List[Dict[str, Any]] = []
+        if not os.path.exists(self.journal_path):
+            return entries
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    def rollback(self) -> Tuple[int, int, int]:
+        """
+        저널에 기록된 파일을 다시 독립된 복사본으로 되돌립니다 (원래 mtime 복원).
+        모든 항목이 되돌려졌거나 이미 독립 파일이면 저널은 <저널>.rolledback_<시각> 으로 이름을 바꾸고,
+        되돌리지 못한 항목(stat 실패 / 복사 실패)이 있으면 저널을 그 항목만 남기고 다시 써서 다음에 재시도할 수 있게 합니다.
+
+        Returns:
+            (되돌린 수, 이미 독립 파일이라 건너뛴 수, 되돌리지 못해 저널에 남긴 수)
+        """
+        restored = independent = 0
+        remaining: List[Dict[str, Any]] = []
+        for entry in reversed(self.read_journal()):
+            path, kept = entry["path"], entry["kept"]
+            try:
+                path_stat = os.stat(path)
+                kept_stat = os.stat(kept)
+            except OSError as e:
+                print(f"  [SKIP] {path}: {e}")
+                remaining.append(entry)
+                continue
+            if path_stat.st_ino != kept_stat.st_ino or path_stat.st_dev != kept_stat.st_dev:
+                print(f"  [SKIP] 이미 독립 파일: {path}")
+                independent += 1
+                continue
+
+            print(f"  [RESTORE] {path}")
+            if self.dry_run:
+                restored += 1
+                continue
+            temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.restore-{os.getpid()}")
+            try:
+                shutil.copyfile(kept, temp_path)
+                os.utime(temp_path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+                os.replace(temp_path, path)
+                restored += 1
+            except OSError as e:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                print(f"  [FAIL] {path}: {e}")
+                remaining.append(entry)
+
+        if not self.dry_run and os.path.exists(self.journal_path):
+            self.close()
+            if remaining:
+                self._rewrite_journal(list(reversed(remaining)))
+            else:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                os.replace(self.journal_path, f"{self.journal_path}.rolledback_{timestamp}")
+        return restored, independent, len(remaining)
+
+    def _rewrite_journal(self, entries: List[Dict[str, Any]]) -> None:
+        """저널을 entries 만 남기도록 임시 파일에 쓴 뒤 교체합니다."""
+        temp_path = f"{self.journal_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_path)
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+모델 해시 SQLite 카탈로그 (이름 / 해시 역방향 조회)
+"""
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+
+TABLE_NAME = "hash_catalog"
+DB_FILENAME = "hash_catalog.db"
+SCHEMA_COLUMNS = [
+    ("path", "TEXT NOT NULL"),
+    ("type_name", "TEXT"),
+    ("category", "TEXT"),
+    ("name", "TEXT"),
+    ("size", "INTEGER"),
+    ("mtime_ns", "INTEGER"),
+    ("dev", "INTEGER"),
+    ("ino", "INTEGER"),
+    ("sha256", "TEXT"),
+    ("autov2", "TEXT"),
+    ("autov1", "TEXT"),
+    ("tensor_sha256", "TEXT"),
+    ("tensor_index_sha256", "TEXT"),
+    ("tree_sha256", "TEXT"),
+    ("tree_block_mb", "INTEGER"),
+    ("hashed_at", "TEXT"),
+    ("verified_at", "TEXT"),
+    ("cataloged_at", "TEXT"),
+]
+# 같은 파일이 여러 (타입, 폴더) 대상에 들어갈 수 있으므로 (예: 타입 공용 diffusion_models 루트) 키는 셋의 조합
+PRIMARY_KEY = ("path", "type_name", "category")
+HASH_COLUMNS = ["sha256", "autov2", "autov1", "tensor_sha256", "tree_sha256"]
+INDEX_COLUMNS = ["path", "name", "type_name, category"] + HASH_COLUMNS
+DATA_COLUMNS = [name for name, _ in SCHEMA_COLUMNS]
+
+
+class HashCatalog:
+    """
+    모든 타입/폴더의 해시 레코드를 하나의 SQLite 테이블로 관리하는 클래스.
+
+    sha256_*.yml 은 calculate_sha256_lora.py 가 만드는 내보내기 파일로 그대로 두고,
+    조회(이 해시를 가진 파일은? 이 모델은 어느 타입에 있나?)는 인덱스로 바로 답합니다.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (보통 data_dir/hash_catalog.db)
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.ensure_database()
+
+    @staticmethod
+    def get_db_path(data_dir: str) -> str:
+        return os.path.join(data_dir, DB_FILENAME)
+
+    def __enter__(self) -> "HashCatalog":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
+
+    def _create_table(self, table_name: str) -> None:
+        self.connection.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                {", ".join(f"{name} {column_type}" for name, column_type in SCHEMA_COLUMNS)},
+                PRIMARY KEY ({", ".join(PRIMARY_KEY)})
+            )
+            """
+        )
+
+    def _migrate_primary_key(self) -> None:
+        """path 만 키였던 예전 테이블을 (path, type_name, category) 키 테이블로 옮깁니다."""
+        table_info = list(self.connection.execute(f"PRAGMA table_info({TABLE_NAME})"))
+        if not table_info:
+            return
+        key_columns = tuple(row[1] for row in sorted(table_info, key=lambda row: row[5]) if row[5])
+        if key_columns == PRIMARY_KEY:
+            return
+        old_columns = [row[1] for row in table_info]
+        columns = ", ".join(column for column in DATA_COLUMNS if column in old_columns)
+        legacy_table = f"{TABLE_NAME}_legacy"
+        with self.connection:
+            self.connection.execute(f"DROP TABLE IF EXISTS {legacy_table}")
+            self.connection.execute(f"ALTER TABLE {TABLE_NAME} RENAME TO {legacy_table}")
+            # 예전 인덱스는 이름이 같으므로 옮긴 테이블과 함께 지움
+            for row in list(self.connection.execute(f"PRAGMA index_list({legacy_table})")):
+                if not row[1].startswith("sqlite_autoindex"):
+                    self.connection.execute(f"DROP INDEX IF EXISTS {row[1]}")
+            self._create_table(TABLE_NAME)
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO {TABLE_NAME} ({columns}) SELECT {columns} FROM {legacy_table}"
+            )
+            self.connection.execute(f"DROP TABLE {legacy_table}")
+        print(f"  카탈로그 키 변경: path -> ({', '.join(PRIMARY_KEY)}) ({self.db_path})")
+
+    def ensure_database(self) -> None:
+        self._migrate_primary_key()
+        self._create_table(TABLE_NAME)
+        table_columns = [row[1] for row in self.connection.execute(f"PRAGMA table_info({TABLE_NAME})")]
+        for column_name, column_type in SCHEMA_COLUMNS:
+            if column_name not in table_columns:
+                self.connection.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN {column_name} {column_type}")
+        for columns in INDEX_COLUMNS:
+            index_name = f"idx_{TABLE_NAME}_{columns.replace(', ', '_')}"
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {TABLE_NAME} ({columns})")
+        self.connection.commit()
+
+    def sync(self, type_name: str, category: str, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        타입/폴더 하나의 레코드를 통째로 맞춥니다 (추가/갱신 + 목록에 없는 경로 삭제).
+
+        Args:
+            records: path, name 과 HashStore 레코드 필드(sha256, size, ...)를 가진 딕셔너리들
+
+        Returns:
+            기록한 레코드 수
+        """
+        cataloged_at = datetime.now().isoformat(timespec="seconds")
+        rows = []
+        for record in records:
+            row = {column: record.get(column) for column in DATA_COLUMNS}
+            row["type_name"] = type_name
+            row["category"] = category
+            row["cataloged_at"] = cataloged_at
+            rows.append(row)
+
+        with self.connection:
+            self.connection.execute(
+                f"DELETE FROM {TABLE_NAME} WHERE type_name = ? AND category = ?",
+                (type_name, category),
+            )
+            self.connection.executemany(
+                f"""
+                INSERT OR REPLACE INTO {TABLE_NAME} ({", ".join(DATA_COLUMNS)})
+                VALUES ({", ".join(f":{column}" for column in DATA_COLUMNS)})
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def find_by_hash(self, value: str) -> List[sqlite3.Row]:
+        """sha256 / autov2 / autov1 / tensor_sha256 / tree_sha256 중 하나라도 일치하는 레코드 (대소문자 무시)."""
+        value = value.strip().lower()
+        conditions = " OR ".join(f"{column} = ?" for column in HASH_COLUMNS)
+        return self.connection.execute(
+            f"SELECT * FROM {TABLE_NAME} WHERE {conditions} ORDER BY type_name, category, name",
+            [value] * len(HASH_COLUMNS),
+        ).fetchall()
+
+    def find_by_name(self, name: str, partial: bool = False) -> List[sqlite3.Row]:
+        """
+        이름으로 조회합니다. 기본은 정확히 일치(인덱스 사용), partial=True 면 부분 일치.
+        """
+        if partial:
+            sql = f"SELECT * FROM {TABLE_NAME} WHERE name LIKE ? ORDER BY type_name, category, name"
+            params = [f"%{name}%"]
+        else:
+            sql = f"SELECT * FROM {TABLE_NAME} WHERE name = ? ORDER BY type_name, category"
+            params = [name]
+        return self.connection.execute(sql, params).fetchall()
+
+    def find_same_content(self, name: str) -> List[sqlite3.Row]:
+        """name 과 같은 sha256(없으면 tree_sha256) 을 가진 모든 레코드 (어느 타입/폴더에 있는지 확인용)."""
+        rows = self.find_by_name(name)
+        values = {row["sha256"] or row["tree_sha256"] for row in rows} - {None}
+        result: Dict[Any, sqlite3.Row] = {}
+        for value in values:
+            for row in self.find_by_hash(value):
+                result[tuple(row[column] for column in PRIMARY_KEY)] = row
+        return sorted(result.values(), key=lambda row: (row["type_name"], row["category"], row["name"]))
+
+    def duplicate_groups(
+        self, type_names: Optional[List[str]] = None, min_size: int = 0
+    ) -> Dict[str, List[sqlite3.Row]]:
+        """
+        sha256 이 같은 레코드 묶음 {sha256: [레코드...]} (서로 다른 경로가 2개 이상인 것만, 타입/폴더 구분 없음).
+        같은 경로가 여러 (타입, 폴더) 에 있으면 한 번만 넣습니다.
+
+        Args:
+            type_names: 지정하면 해당 타입의 레코드만 대상
+            min_size: 이 크기(bytes) 미만인 파일은 제외
+        """
+        conditions = ["sha256 IS NOT NULL", "size >= ?"]
+        params: List[Any] = [min_size]
+        if type_names:
+            conditions.append(f"type_name IN ({', '.join('?' for _ in type_names)})")
+            params.extend(type_names)
+        where = " AND ".join(conditions)
+        rows = self.connection.execute(
+            f"""
+            SELECT * FROM {TABLE_NAME}
+            WHERE {where} AND sha256 IN (
+                SELECT sha256 FROM {TABLE_NAME} WHERE {where} GROUP BY sha256 HAVING COUNT(DISTINCT path) > 1
+            )
+            ORDER BY sha256, path, type_name, category
+            """,
+            params + params,
+        ).fetchall()
+        groups: Dict[str, List[sqlite3.Row]] = {}
+        seen_paths = set()
+        for row in rows:
+            if (row["sha256"], row["path"]) in seen_paths:
+                continue
+            seen_paths.add((row["sha256"], row["path"]))
+            groups.setdefault(row["sha256"], []).append(row)
+        return groups
+
+    def count(self, type_name: Optional[str] = None) -> int:
+        if type_name:
+            row = self.connection.execute(
+                f"SELECT COUNT(*) FROM {TABLE_NAME} WHERE type_name = ?", (type_name,)
+            ).fetchone()
+        else:
+            row = self.connection.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}").fetchone()
+        return row[0]
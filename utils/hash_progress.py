@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+해시 진행률 / 처리량 측정 유틸리티
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+MIB = 1024 * 1024
+
+
+def format_bytes(size: float) -> str:
+    if size >= 1024 * MIB:
+        return f"{size / (1024 * MIB):.1f}GiB"
+    return f"{size / MIB:.1f}MiB"
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(max(0, seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+class HashProgress:
+    """
+    HashScheduler 가 처리한 작업의 바이트 수 / 시간을 모아
+    주기적인 상태 줄, 최종 요약, JSON 지표 파일을 만드는 클래스.
+
+    - 워커별 MB/s: 워커가 실제로 해시한 시간 기준
+    - 디스크(st_dev)별 MB/s: 해당 디스크의 첫 작업 시작부터 마지막 작업 끝까지의 시간 기준
+    - 진행 바이트 / MB/s / ETA 에는 처리 중인 파일에서 지금까지 읽은 바이트(add_bytes)도 포함
+      (FileHasher 의 on_bytes 로 연결하면 몇 GB 짜리 파일 하나를 읽는 동안에도 값이 움직임)
+    - ETA: 지금까지의 전체 처리 속도로 남은 바이트를 나눈 값
+    """
+
+    def __init__(self, total_files: int, total_bytes: int, interval: float = 5.0):
+        """
+        Args:
+            total_files: 처리할 파일 수
+            total_bytes: 처리할 전체 바이트 수
+            interval: 상태 줄 출력 간격 (초, 0 이하면 출력 안 함)
+        """
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = time.monotonic()
+        self._finished_at: Optional[float] = None
+
+        self.done_files = 0
+        self.failed_files = 0
+        self.done_bytes = 0
+        self.active = 0
+        # 처리 중인 파일 경로 -> [지금까지 읽은 바이트, 파일 크기]
+        self._inflight: Dict[str, List[int]] = {}
+        self._workers: Dict[str, Dict[str, float]] = defaultdict(lambda: {"files": 0, "bytes": 0, "busy": 0.0})
+        self._devices: Dict[Any, Dict[str, float]] = {}
+
+    def start(self) -> None:
+        self._started_at = time.monotonic()
+        if self.interval > 0 and self.total_files:
+            self._thread = threading.Thread(target=self._report_loop, name="HashProgress", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._finished_at = time.monotonic()
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _report_loop(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            print(self.status_line())
+
+    def job_started(self, job) -> None:
+        with self._lock:
+            self.active += 1
+            self._inflight[job.file_path] = [0, job.size]
+            self._devices.setdefault(job.device, {"files": 0, "bytes": 0, "first": time.monotonic(), "last": 0.0})
+
+    def job_finished(self, job, elapsed: float, ok: bool) -> None:
+        now = time.monotonic()
+        worker_name = threading.current_thread().name
+        with self._lock:
+            self.active -= 1
+            self._inflight.pop(job.file_path, None)
+            self.done_files += 1
+            if not ok:
+                self.failed_files += 1
+                return
+            self.done_bytes += job.size
+            worker = self._workers[worker_name]
+            worker["files"] += 1
+            worker["bytes"] += job.size
+            worker["busy"] += elapsed
+            device = self._devices[job.device]
+            device["files"] += 1
+            device["bytes"] += job.size
+            device["last"] = now
+
+    def add_bytes(self, file_path: str, count: int) -> None:
+        """처리 중인 파일에서 읽은 바이트를 더합니다 (FileHasher.on_bytes, 블록 스레드에서도 호출 가능)."""
+        with self._lock:
+            inflight = self._inflight.get(file_path)
+            if inflight is not None:
+                inflight[0] += count
+
+    def _live_bytes(self) -> int:
+        """끝난 파일 바이트 + 처리 중인 파일에서 지금까지 읽은 바이트 (파일 크기까지만). lock 안에서 호출."""
+        return self.done_bytes + sum(min(read, size) for read, size in self._inflight.values())
+
+    def elapsed(self) -> float:
+        return (self._finished_at or time.monotonic()) - self._started_at
+
+    def status_line(self) -> str:
+        with self._lock:
+            elapsed = self.elapsed()
+            live_bytes = self._live_bytes()
+            rate = live_bytes / elapsed if elapsed > 0 else 0.0
+            remaining = max(0, self.total_bytes - live_bytes)
+            eta = remaining / rate if rate > 0 else 0.0
+            percent = live_bytes * 100 / self.total_bytes if self.total_bytes else 100.0
+            queued = max(0, self.total_files - self.done_files - self.active)
+            return (
+                f"  [진행] {self.done_files}/{self.total_files} 파일, "
+                f"{format_bytes(live_bytes)}/{format_bytes(self.total_bytes)} ({percent:.1f}%), "
+                f"{rate / MIB:.1f}MB/s, 처리중 {self.active} / 대기 {queued}, "
+                f"경과 {format_duration(elapsed)}, 남은 시간 {format_duration(eta) if rate > 0 else '-'}"
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = self.elapsed()
+            workers = {
+                name: {
+                    "files": int(stats["files"]),
+                    "bytes": int(stats["bytes"]),
+                    "busy_seconds": round(stats["busy"], 3),
+                    "mb_per_sec": round(stats["bytes"] / stats["busy"] / MIB, 2) if stats["busy"] > 0 else 0.0,
+                }
+                for name, stats in sorted(self._workers.items())
+            }
+            devices = {}
+            for device, stats in self._devices.items():
+                span = (stats["last"] or stats["first"]) - stats["first"]
+                devices[str(device)] = {
+                    "files": int(stats["files"]),
+                    "bytes": int(stats["bytes"]),
+                    "seconds": round(span, 3),
+                    "mb_per_sec": round(stats["bytes"] / span / MIB, 2) if span > 0 else 0.0,
+                }
+            return {
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+                "elapsed_seconds": round(elapsed, 3),
+                "total_files": self.total_files,
+                "total_bytes": self.total_bytes,
+                "done_files": self.done_files,
+                "failed_files": self.failed_files,
+                "done_bytes": self.done_bytes,
+                "mb_per_sec": round(self.done_bytes / elapsed / MIB, 2) if elapsed > 0 else 0.0,
+                "workers": workers,
+                "devices": devices,
+            }
+
+    def print_summary(self) -> None:
+        metrics = self.to_dict()
+        print(
+            f"\n처리량 요약: {metrics['done_files']}/{metrics['total_files']} 파일 "
+            f"(실패 {metrics['failed_files']}), {format_bytes(metrics['done_bytes'])}, "
+            f"{format_duration(metrics['elapsed_seconds'])}, 평균 {metrics['mb_per_sec']}MB/s"
+        )
+        for name, stats in metrics["workers"].items():
+            print(f"  워커 {name}: {stats['files']}개, {format_bytes(stats['bytes'])}, {stats['mb_per_sec']}MB/s")
+        for device, stats in metrics["devices"].items():
+            print(f"  디스크 {device}: {stats['files']}개, {format_bytes(stats['bytes'])}, {stats['mb_per_sec']}MB/s")
+
+    def save_json(self, output_path: str, extra: Optional[Dict[str, Any]] = None) -> bool:
+        """지표를 JSON 으로 저장합니다. extra 는 설정값(워커 수, 블록 크기 등) 기록용."""
+        metrics = self.to_dict()
+        if extra:
+            metrics["settings"] = extra
+        try:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(metrics, f, ensure_ascii=False, indent=2)
+            return True
+        except OSError as e:
+            print(f"  경고: 지표 저장 실패 - {e}")
+            return False
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+디스크(st_dev)별 해시 작업 스케줄러
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class HashJob:
+    """해시 계산 작업 하나 (파일 경로 + 결과를 받을 대상 정보)"""
+
+    def __init__(
+        self,
+        file_path: str,
+        name: str,
+        target: Any = None,
+        stat: Optional[os.stat_result] = None,
+        reason: str = "new",
+    ):
+        """
+        Args:
+            file_path: 해시할 파일 경로
+            name: 결과 저장에 사용할 키 (보통 확장자 제외 파일명)
+            target: 결과를 모을 대상 (스케줄러는 그대로 콜백에 넘겨줌)
+            stat: 이미 구한 os.stat 결과 (없으면 스케줄러가 stat)
+            reason: 작업 이유 ('new' 신규 / 'changed' size·mtime 변경 / 'verify' 강제 검증)
+        """
+        self.file_path = file_path
+        self.name = name
+        self.target = target
+        self.stat = stat
+        self.reason = reason
+        # 같은 inode(하드링크)라서 이 작업의 결과를 같이 받을 다른 작업들
+        self.aliases: List["HashJob"] = []
+        self.size = stat.st_size if stat else 0
+        self.device = stat.st_dev if stat else None
+
+
+class HashScheduler:
+    """
+    모든 해시 작업을 하나의 큐로 모아 제한된 워커로 처리하는 클래스.
+
+    - 작업은 st_dev(물리 디스크/볼륨) 별로 나누고, 디스크마다 동시에 읽는 워커 수를
+      readers_per_device 로 제한해서 같은 디스크에서 탐색(seek) 경합이 생기지 않게 합니다.
+    - 디스크 안에서는 큰 파일부터 처리해서 마지막에 큰 파일 하나만 남는 꼬리 지연을 줄입니다.
+    - 전체 워커 수는 workers 로 제한합니다.
+    - 파일 하나를 여러 스레드로 읽는 작업(블록 트리 해시)은 job_slots 로 그 스레드 수만큼(최대 readers_per_device)
+      디스크 읽기 슬롯을 차지하게 해서, 그 파일을 읽는 동안 같은 디스크에서 다른 파일을 덜(또는 안) 읽게 합니다.
+      파일 하나 안의 스레드 수 자체는 제한하지 않음 (readers_per_device 는 동시에 읽는 파일 수 기준)
+    """
+
+    def __init__(
+        self,
+        hash_func: Callable[[str], Any],
+        workers: int = 4,
+        readers_per_device: int = 1,
+        cancel_event: Optional[threading.Event] = None,
+        job_slots: Optional[Callable[[HashJob], int]] = None,
+    ):
+        """
+        Args:
+            hash_func: 파일 경로를 받아 해시 결과(실패 시 None)를 반환하는 함수
+            workers: 전체 워커 스레드 수 상한
+            readers_per_device: 디스크(st_dev)당 동시에 읽는 워커 수 상한
+            cancel_event: set 되면 새 작업을 더 꺼내지 않음
+            job_slots: 작업 하나가 동시에 읽는 스레드 수 (없으면 1, readers_per_device 로 잘림)
+        """
+        self.hash_func = hash_func
+        self.workers = max(1, int(workers))
+        self.readers_per_device = max(1, int(readers_per_device))
+        self.cancel_event = cancel_event or threading.Event()
+        self.job_slots = job_slots
+
+        self._condition = threading.Condition()
+        self._queues: Dict[Any, List[HashJob]] = defaultdict(list)
+        self._active: Dict[Any, int] = defaultdict(int)
+        self._remaining: Dict[Any, int] = defaultdict(int)
+        self._slots: Dict[int, int] = {}
+
+    def _slots_of(self, job: HashJob) -> int:
+        if self.job_slots is None:
+            return 1
+        return min(self.readers_per_device, max(1, int(self.job_slots(job))))
+
+    def _prepare(self, jobs: Iterable[HashJob]) -> int:
+        count = 0
+        for job in jobs:
+            if job.stat is None:
+                try:
+                    job.stat = os.stat(job.file_path)
+                except OSError:
+                    job.stat = None
+                job.size = job.stat.st_size if job.stat else 0
+                job.device = job.stat.st_dev if job.stat else None
+            self._queues[job.device].append(job)
+            self._remaining[job.device] += job.size
+            count += 1
+
+        # pop() 이 가장 큰 파일을 꺼내도록 크기 오름차순 정렬
+        for queue in self._queues.values():
+            queue.sort(key=lambda job: job.size)
+        return count
+
+    def _next_job(self) -> Optional[HashJob]:
+        """읽기 슬롯이 남은 디스크 중 남은 작업량이 가장 많은 디스크의 가장 큰 파일을 꺼냅니다."""
+        with self._condition:
+            while True:
+                if self.cancel_event.is_set():
+                    return None
+
+                pending_devices = [device for device, queue in self._queues.items() if queue]
+                if not pending_devices:
+                    return None
+
+                # 디스크마다 다음에 꺼낼(가장 큰) 작업이 필요한 슬롯이 남아 있어야 함
+                available = [
+                    device for device in pending_devices
+                    if self._active[device] + self._slots_of(self._queues[device][-1]) <= self.readers_per_device
+                ]
+                if available:
+                    device = max(available, key=lambda d: self._remaining[d])
+                    job = self._queues[device].pop()
+                    slots = self._slots_of(job)
+                    self._slots[id(job)] = slots
+                    self._active[device] += slots
+                    self._remaining[device] -= job.size
+                    return job
+
+                self._condition.wait(timeout=0.5)
+
+    def _finish(self, job: HashJob) -> None:
+        with self._condition:
+            self._active[job.device] -= self._slots.pop(id(job), 1)
+            self._condition.notify_all()
+
+    def run(
+        self,
+        jobs: Iterable[HashJob],
+        on_result: Callable[[HashJob, Any], None],
+        progress: Any = None,
+    ) -> int:
+        """
+        모든 작업을 처리합니다. on_result(job, result) 는 워커 스레드에서 호출되므로
+        대상(target) 별 동기화는 호출하는 쪽에서 책임집니다.
+
+        progress 가 있으면 (HashProgress 등) 작업마다 job_started(job) / job_finished(job, 걸린 시간, 성공 여부) 를 호출합니다.
+        hash_func 가 예외를 내면 오류를 출력하고 실패(None)로 job_finished / on_result 를 호출하며,
+        on_result 의 예외도 출력만 하고 워커는 다음 작업을 계속합니다.
+
+        Returns:
+            처리한 작업 수 (취소 시 남은 작업은 제외)
+        """
+        total = self._prepare(jobs)
+        if total == 0:
+            return 0
+
+        device_count = len([queue for queue in self._queues.values() if queue])
+        worker_count = min(self.workers, device_count * self.readers_per_device, total)
+        processed = [0]
+        processed_lock = threading.Lock()
+
+        def worker() -> None:
+            while True:
+                job = self._next_job()
+                if job is None:
+                    return
+                try:
+                    if progress is not None:
+                        progress.job_started(job)
+                    started = time.monotonic()
+                    result = None
+                    try:
+                        result = self.hash_func(job.file_path)
+                    except Exception as e:
+                        # 한 파일의 오류로 워커가 죽지 않도록 실패(None)로 넘기고 다음 작업을 계속
+                        print(f"  오류: 해시 실패 - {job.file_path}: {e}")
+                    finally:
+                        if progress is not None:
+                            progress.job_finished(job, time.monotonic() - started, result is not None)
+                    try:
+                        on_result(job, result)
+                    except Exception as e:
+                        print(f"  오류: 결과 처리 실패 - {job.file_path}: {e}")
+                finally:
+                    self._finish(job)
+                    with processed_lock:
+                        processed[0] += 1
+
+        threads = [
+            threading.Thread(target=worker, name=f"HashWorker-{idx}", daemon=True)
+            for idx in range(worker_count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            # join(timeout) 반복으로 메인 스레드가 Ctrl+C 를 받을 수 있게 한다.
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+
+        return processed[0]
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""
+sha256_*.yml 해시 저장소 유틸리티
+"""
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, IO, Optional, Tuple
+
+from .yaml_handler import YAMLHandler
+
+
+# 다이제스트가 아닌 레코드 필드 (stat / 시각 정보)
+RECORD_INFO_FIELDS = ("size", "mtime_ns", "dev", "ino", "hashed_at", "verified_at", "verify_failed_at")
+
+
+class HashStore:
+    """
+    sha256_*.yml 한 개를 관리하는 클래스.
+
+    레코드 형식 (키는 확장자를 뺀 파일명):
+        name:
+          sha256: <hex>
+          autov2 / autov1 / tensor_sha256: <hex>   (hash.digests 설정에 따라)
+          tree_sha256 / tree_block_mb               (--tree 로 계산한 큰 파일, 기존 다이제스트가 유효하면 그 옆에 추가)
+          size: <bytes>
+          mtime_ns: <st_mtime_ns>
+          dev / ino: <st_dev> / <st_ino>           (하드링크 판별용)
+          unverified / embedded_from              (--embedded: 헤더 내장 해시로 만든 임시 레코드)
+          hashed_at: '2026-01-01T00:00:00'
+          verified_at: '2026-01-02T00:00:00'      (verify 로 다시 확인한 시각)
+
+    예전 형식(name: <hex>) 도 그대로 읽을 수 있고, 저장할 때 새 형식으로 바뀝니다.
+
+    진행 상황은 <output>.journal.jsonl 에 한 줄씩 추가(append)하고 파일마다 flush 합니다.
+    load() 는 YAML 을 읽은 뒤 저널을 재생하고, compact() 가 YAML 로 한 번에 합친 뒤 저널을 지웁니다.
+    중간에 프로세스가 죽어도 다음 실행에서 저널 내용이 그대로 복구됩니다.
+    """
+
+    def __init__(self, output_path: str, yaml_handler: Optional[YAMLHandler] = None):
+        """
+        Args:
+            output_path: sha256_*.yml 경로
+            yaml_handler: 저장에 사용할 YAMLHandler (없으면 새로 생성)
+        """
+        self.output_path = output_path
+        self.yaml_handler = yaml_handler or YAMLHandler()
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.journal_path = os.path.splitext(output_path)[0] + ".journal.jsonl"
+        self._journal: Optional[IO[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.records
+
+    @staticmethod
+    def normalize_record(value: Any) -> Optional[Dict[str, Any]]:
+        """예전 형식(문자열 해시)과 새 형식(딕셔너리)을 모두 딕셔너리로 변환합니다."""
+        if isinstance(value, str):
+            return {"sha256": value}
+        if isinstance(value, dict) and (
+            value.get("sha256") or value.get("tree_sha256") or value.get("tensor_sha256")
+        ):
+            return dict(value)
+        return None
+
+    @staticmethod
+    def inode_key(stat: Optional[os.stat_result]) -> Optional[Tuple[int, int, int, int]]:
+        """
+        (st_dev, st_ino, size, mtime_ns). 하드링크로 연결된 경로는 같은 키를 가집니다.
+        st_ino 를 제공하지 않는 파일시스템(0)이면 None.
+        """
+        if stat is None or not stat.st_ino:
+            return None
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    def digests_of(record: Dict[str, Any]) -> Dict[str, Any]:
+        """레코드에서 stat / 시각 정보를 뺀 다이제스트만 반환합니다 (다른 경로에 복사할 때 사용)."""
+        return {key: value for key, value in record.items() if key not in RECORD_INFO_FIELDS}
+
+    @staticmethod
+    def _stat_fields(stat: os.stat_result) -> Dict[str, int]:
+        fields = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if stat.st_ino:
+            fields["dev"] = stat.st_dev
+            fields["ino"] = stat.st_ino
+        return fields
+
+    @staticmethod
+    def identity(record: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        중복 비교에 쓰는 내용 식별 문자열.
+        sha256 이 있으면 sha256, 트리 해시만 있으면 'tree<블록MB>:<hex>'.
+        """
+        if not record:
+            return None
+        if record.get("sha256"):
+            return record["sha256"]
+        if record.get("tree_sha256"):
+            return f"tree{record.get('tree_block_mb')}:{record['tree_sha256']}"
+        return None
+
+    @staticmethod
+    def content_identity(record: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        메타데이터를 무시한 내용 식별 문자열: tensor_sha256 (+ ':' + tensor_index_sha256 앞 16자리).
+        __metadata__ 만 다르게 다시 저장한 파일은 같은 값을 가집니다.
+        (YAML 키가 128자를 넘으면 복합 키(?) 형식으로 저장되므로 텐서 목록 해시는 줄여서 사용)
+        """
+        if not record or not record.get("tensor_sha256"):
+            return None
+        if record.get("tensor_index_sha256"):
+            return f"{record['tensor_sha256']}:{record['tensor_index_sha256'][:16]}"
+        return record["tensor_sha256"]
+
+    @staticmethod
+    def same_content(record: Optional[Dict[str, Any]], digests: Dict[str, Any]) -> Optional[bool]:
+        """
+        저장된 레코드와 새로 계산한 다이제스트를 비교합니다.
+
+        Returns:
+            같으면 True, 다르면 False, 같은 종류의 해시가 없어 비교할 수 없으면 None
+        """
+        if not record:
+            return None
+        if record.get("sha256") and digests.get("sha256"):
+            return record["sha256"] == digests["sha256"]
+        if (
+            record.get("tree_sha256")
+            and digests.get("tree_sha256")
+            and record.get("tree_block_mb") == digests.get("tree_block_mb")
+        ):
+            return record["tree_sha256"] == digests["tree_sha256"]
+        return None
+
+    def load(self) -> int:
+        """
+        기존 YAML 파일을 로드합니다. 읽을 수 없으면 백업을 만들고 빈 저장소로 시작합니다.
+
+        Returns:
+            로드한 레코드 수
+        """
+        self.records = {}
+        self._load_yaml()
+        replayed = self._replay_journal()
+        if replayed:
+            print(f"  저널 복구: {replayed}개 ({self.journal_path})")
+        return len(self.records)
+
+    def _load_yaml(self) -> None:
+        output_path = self.output_path
+        if not os.path.exists(output_path):
+            return
+
+        # 파일 크기 확인 (빈 파일은 건너뛰기)
+        if os.path.getsize(output_path) == 0:
+            print(f"  ⚠️  빈 YAML 파일: {output_path}")
+            return
+
+        try:
+            # 먼저 safe_load(libyaml 이 있으면 C 로더)로 안전하게 로드 시도
+            with open(output_path, 'r', encoding='utf-8') as f:
+                data = YAMLHandler.safe_load(f)
+        except Exception as e:
+            # safe_load 실패 시 백업 생성
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_path = f"{output_path}.backup_{timestamp}"
+            try:
+                shutil.copy2(output_path, backup_path)
+                print(f"  ⚠️  YAML 파일 읽기 오류: {type(e).__name__}: {e}")
+                print(f"  💾 손상된 파일 백업 생성: {backup_path}")
+                print(f"  🔄 새로 생성하여 작업을 계속합니다...")
+            except Exception as backup_error:
+                print(f"  ❌ YAML 파일 읽기 실패: {type(e).__name__}: {e}")
+                print(f"  ⚠️  백업 생성 실패: {backup_error}")
+                print(f"  🔄 새로 생성하여 작업을 계속합니다...")
+            return
+
+        if data is None:
+            print(f"  ⚠️  YAML 파일이 비어있음: {output_path}")
+            return
+        if not isinstance(data, dict):
+            return
+
+        for name, value in data.items():
+            record = self.normalize_record(value)
+            if record is not None:
+                self.records[str(name)] = record
+
+    def _replay_journal(self) -> int:
+        """이전 실행이 compact 전에 끝났으면 저널의 레코드를 덮어씁니다 (마지막 줄이 우선)."""
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        replayed = 0
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 비정상 종료로 마지막 줄이 잘린 경우
+                    continue
+                name = entry.pop("name", None) if isinstance(entry, dict) else None
+                record = self.normalize_record(entry)
+                if name is None or record is None:
+                    continue
+                self.records[str(name)] = record
+                replayed += 1
+        return replayed
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.records.get(name)
+
+    def get_hash(self, name: str) -> Optional[str]:
+        return self.identity(self.records.get(name))
+
+    def has_stat(self, name: str) -> bool:
+        record = self.records.get(name)
+        return bool(record) and "size" in record and "mtime_ns" in record
+
+    def is_current(self, name: str, stat: os.stat_result) -> bool:
+        """저장된 size/mtime_ns 가 현재 파일과 같으면 True (다시 해시할 필요 없음)."""
+        record = self.records.get(name)
+        if not record:
+            return False
+        return record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns
+
+    def adopt_stat(self, name: str, stat: os.stat_result) -> None:
+        """예전 형식 레코드에 현재 stat 을 기록합니다 (다음 실행부터 변경 감지 가능)."""
+        record = self.records.get(name)
+        if record is not None:
+            record.update(self._stat_fields(stat))
+
+    def put(
+        self,
+        name: str,
+        digests: Dict[str, Any],
+        stat: Optional[os.stat_result] = None,
+    ) -> Dict[str, Any]:
+        """
+        레코드를 새로 기록합니다 (저널에도 추가).
+
+        Args:
+            name: 파일명 (확장자 제외)
+            digests: 계산한 다이제스트 (sha256, autov2, autov1, tensor_sha256 또는 tree_sha256 등)
+            stat: 해시할 때의 os.stat 결과
+        """
+        record: Dict[str, Any] = dict(digests)
+        if stat is not None:
+            record.update(self._stat_fields(stat))
+        record["hashed_at"] = datetime.now().isoformat(timespec="seconds")
+        self.records[name] = record
+        self.append_journal(name, record)
+        return record
+
+    def append_journal(self, name: str, record: Dict[str, Any]) -> None:
+        """레코드 한 개를 저널에 추가하고 바로 flush 합니다 (YAML 전체를 다시 쓰지 않음)."""
+        if self._journal is None:
+            journal_dir = os.path.dirname(self.journal_path)
+            if journal_dir:
+                os.makedirs(journal_dir, exist_ok=True)
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal.write(json.dumps({"name": name, **record}, ensure_ascii=False) + "\n")
+        self._journal.flush()
+
+    def close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def mark_verified(self, name: str, ok: bool = True) -> None:
+        """
+        verify 결과를 기록합니다 (저널에도 추가).
+        성공하면 verified_at 을 갱신하고, 불일치면 저장된 해시는 그대로 두고 verify_failed_at 을 기록합니다.
+        """
+        record = self.records.get(name)
+        if record is None:
+            return
+        now = datetime.now().isoformat(timespec="seconds")
+        if ok:
+            record["verified_at"] = now
+            record.pop("verify_failed_at", None)
+        else:
+            record["verify_failed_at"] = now
+        self.append_journal(name, record)
+
+    def verify_order_key(self, name: str) -> str:
+        """verify 순서 정렬 키: 마지막 확인(또는 해시) 시각이 오래된 것부터. 기록이 없으면 가장 먼저."""
+        record = self.records.get(name) or {}
+        return record.get("verified_at") or record.get("hashed_at") or ""
+
+    def hashes(self) -> Dict[str, str]:
+        """{파일명: 내용 식별 문자열} 딕셔너리 (중복 검사 등 예전 형식이 필요한 곳에서 사용)."""
+        result = {}
+        for name, record in self.records.items():
+            value = self.identity(record)
+            if value:
+                result[name] = value
+        return result
+
+    def sha256_hashes(self) -> Dict[str, str]:
+        """{파일명: sha256} (일반 sha256 이 있는 레코드만, 트리 해시만 있는 레코드는 제외)."""
+        return {name: record["sha256"] for name, record in self.records.items() if record.get("sha256")}
+
+    def is_provisional(self, name: str) -> bool:
+        """헤더 내장 해시로만 만든(파일 전체를 읽지 않은) 레코드인지."""
+        record = self.records.get(name)
+        return bool(record) and bool(record.get("unverified"))
+
+    def content_hashes(self) -> Dict[str, str]:
+        """{파일명: 텐서 내용 식별 문자열} (tensor_sha256 이 있는 레코드만)."""
+        result = {}
+        for name, record in self.records.items():
+            value = self.content_identity(record)
+            if value:
+                result[name] = value
+        return result
+
+    def save(self) -> bool:
+        """레코드를 YAML 파일로 저장합니다."""
+        try:
+            # 디렉토리 생성
+            output_dir = os.path.dirname(self.output_path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir, exist_ok=True)
+                print(f"  디렉토리 생성: {output_dir}")
+
+            # YAML 저장
+            if self.yaml_handler.save(self.output_path, self.records):
+                print(f"  저장 완료: {self.output_path} ({len(self.records)}개 항목)")
+                return True
+            return False
+        except Exception as e:
+            print(f"  오류: YAML 저장 실패 - {e}")
+            return False
+
+    def compact(self) -> bool:
+        """레코드 전체를 YAML 로 한 번 저장하고, 성공하면 저널을 삭제합니다."""
+        self.close_journal()
+        if not self.save():
+            return False
+        if os.path.exists(self.journal_path):
+            try:
+                os.remove(self.journal_path)
+            except OSError as e:
+                print(f"  경고: 저널 삭제 실패 - {e}")
+        return True
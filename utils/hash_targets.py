@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+해시 대상(모델 폴더 + sha256_*.yml) 목록 유틸리티
+"""
+import os
+from typing import Any, Dict, List
+
+from .config_loader import ConfigLoader
+
+
+class HashTargets:
+    """
+    타입별 해시 대상 폴더와 저장 경로를 만드는 클래스.
+    (calculate_sha256_lora.py / stamp_metadata_lora.py 등 sha256_*.yml 을 다루는 스크립트가 공유)
+
+    대상 딕셔너리 키:
+        label / category / type_name
+        folder_dir: safetensors 가 있는 폴더
+        output_path: sha256_*.yml 경로
+        duplicates_path / content_duplicates_path: 중복 보고서 경로
+    """
+
+    @staticmethod
+    def build(type_name: str, config: ConfigLoader) -> List[Dict[str, Any]]:
+        """타입 하나에 대한 해시 대상(char / LoRA / Checkpoint / Diffusion) 목록을 만듭니다."""
+        comfui_dir = config.get_comfui_dir()
+        data_dir = config.get_data_dir()
+        type_data_dir = os.path.join(data_dir, type_name)
+
+        targets = [
+            {
+                'label': 'char',
+                'category': 'char',
+                'folder_dir': os.path.join(comfui_dir, 'models', 'loras', type_name, 'char'),
+                'output_path': os.path.join(type_data_dir, 'sha256_char.yml'),
+            },
+            {
+                'label': 'LoRA',
+                'category': 'etc',
+                'folder_dir': os.path.join(comfui_dir, 'models', 'loras', type_name, 'etc'),
+                'output_path': os.path.join(type_data_dir, 'sha256_loras.yml'),
+            },
+            {
+                'label': 'Checkpoint',
+                'category': 'checkpoints',
+                'folder_dir': config.get_checkpoint_models_dir(type_name),
+                'output_path': os.path.join(type_data_dir, 'sha256_checkpoints.yml'),
+            },
+        ]
+
+        # diffusion_models 폴더 경로 확인 (타입별 서브폴더 우선, 없으면 루트 확인)
+        diff_dir = os.path.join(comfui_dir, 'models', 'diffusion_models', type_name)
+        if not os.path.exists(diff_dir):
+            diff_dir = os.path.join(comfui_dir, 'models', 'diffusion_models')
+        if os.path.exists(diff_dir):
+            targets.append({
+                'label': 'Diffusion',
+                'category': 'diffusion_models',
+                'folder_dir': diff_dir,
+                'output_path': os.path.join(type_data_dir, 'sha256_diffusion_models.yml'),
+            })
+
+        for target in targets:
+            target['type_name'] = type_name
+            target['duplicates_path'] = os.path.splitext(target['output_path'])[0] + '_duplicates.yml'
+            target['content_duplicates_path'] = (
+                os.path.splitext(target['output_path'])[0] + '_content_duplicates.yml'
+            )
+        return targets
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+LoRA 학습 메타데이터 SQLite 인덱스
+"""
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+
+TABLE_NAME = "lora_metadata"
+SCHEMA_COLUMNS = [
+    ("path", "TEXT PRIMARY KEY"),
+    ("type_name", "TEXT"),
+    ("category", "TEXT"),
+    ("name", "TEXT"),
+    ("size", "INTEGER"),
+    ("mtime_ns", "INTEGER"),
+    ("base_model", "TEXT"),
+    ("base_model_version", "TEXT"),
+    ("architecture", "TEXT"),
+    ("network_module", "TEXT"),
+    ("network_dim", "INTEGER"),
+    ("network_alpha", "REAL"),
+    ("resolution", "TEXT"),
+    ("epochs", "INTEGER"),
+    ("dataset_dirs", "TEXT"),
+    ("output_name", "TEXT"),
+    ("indexed_at", "TEXT"),
+]
+INDEX_COLUMNS = ["name", "type_name, category", "base_model", "network_dim", "network_alpha", "epochs"]
+DATA_COLUMNS = [name for name, _ in SCHEMA_COLUMNS]
+
+
+class MetadataIndex:
+    """safetensors 학습 메타데이터(ss_*, modelspec.*)를 SQLite 테이블로 관리하는 클래스"""
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (보통 data_dir/lora_metadata.db)
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.ensure_database()
+
+    def __enter__(self) -> "MetadataIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
+
+    def ensure_database(self) -> None:
+        self.connection.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+                {", ".join(f"{name} {column_type}" for name, column_type in SCHEMA_COLUMNS)}
+            )
+            """
+        )
+        table_columns = [row[1] for row in self.connection.execute(f"PRAGMA table_info({TABLE_NAME})")]
+        for column_name, column_type in SCHEMA_COLUMNS:
+            if column_name not in table_columns:
+                self.connection.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN {column_name} {column_type}")
+        for columns in INDEX_COLUMNS:
+            index_name = f"idx_{TABLE_NAME}_{columns.replace(', ', '_')}"
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {TABLE_NAME} ({columns})")
+        self.connection.commit()
+
+    def get_stat_map(self, type_name: str, category: str) -> Dict[str, tuple]:
+        """인덱스에 저장된 {path: (size, mtime_ns)} 를 반환합니다 (변경 감지용)."""
+        rows = self.connection.execute(
+            f"SELECT path, size, mtime_ns FROM {TABLE_NAME} WHERE type_name = ? AND category = ?",
+            (type_name, category),
+        )
+        return {row["path"]: (row["size"], row["mtime_ns"]) for row in rows}
+
+    def upsert(self, records: Iterable[Dict[str, Any]]) -> int:
+        """레코드를 추가/갱신합니다. 반환값은 처리한 레코드 수입니다."""
+        indexed_at = datetime.now().isoformat(timespec="seconds")
+        rows = []
+        for record in records:
+            row = {column: record.get(column) for column in DATA_COLUMNS}
+            row["indexed_at"] = row["indexed_at"] or indexed_at
+            rows.append(row)
+        if not rows:
+            return 0
+
+        self.connection.executemany(
+            f"""
+            INSERT OR REPLACE INTO {TABLE_NAME} ({", ".join(DATA_COLUMNS)})
+            VALUES ({", ".join(f":{column}" for column in DATA_COLUMNS)})
+            """,
+            rows,
+        )
+        self.connection.commit()
+        return len(rows)
+
+    def remove_missing(self, type_name: str, category: str, existing_paths: Iterable[str]) -> int:
+        """디스크에서 사라진 파일의 레코드를 삭제합니다."""
+        existing = set(existing_paths)
+        stale = [path for path in self.get_stat_map(type_name, category) if path not in existing]
+        self.connection.executemany(f"DELETE FROM {TABLE_NAME} WHERE path = ?", [(path,) for path in stale])
+        self.connection.commit()
+        return len(stale)
+
+    def query(
+        self,
+        type_names: Optional[List[str]] = None,
+        category: Optional[str] = None,
+        base_model: Optional[str] = None,
+        name: Optional[str] = None,
+        min_dim: Optional[int] = None,
+        max_dim: Optional[int] = None,
+        min_alpha: Optional[float] = None,
+        max_alpha: Optional[float] = None,
+        resolution: Optional[str] = None,
+        min_epochs: Optional[int] = None,
+        output_name: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[sqlite3.Row]:
+        """
+        조건에 맞는 레코드를 조회합니다. 문자열 조건은 부분 일치(대소문자 무시)입니다.
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+
+        if type_names:
+            conditions.append(f"type_name IN ({', '.join('?' for _ in type_names)})")
+            params.extend(type_names)
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        for column, value in (("base_model", base_model), ("name", name), ("output_name", output_name)):
+            if value:
+                conditions.append(f"{column} LIKE ?")
+                params.append(f"%{value}%")
+        for column, operator, value in (
+            ("network_dim", ">=", min_dim),
+            ("network_dim", "<=", max_dim),
+            ("network_alpha", ">=", min_alpha),
+            ("network_alpha", "<=", max_alpha),
+            ("epochs", ">=", min_epochs),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+        if resolution:
+            conditions.append("resolution = ?")
+            params.append(resolution)
+
+        sql = f"SELECT * FROM {TABLE_NAME}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY type_name, category, name"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.connection.execute(sql, params).fetchall()
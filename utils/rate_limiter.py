@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+읽기 대역폭 제한 유틸리티
+"""
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    여러 스레드가 공유하는 토큰 버킷 (1 토큰 = 1 바이트).
+
+    consume() 은 읽은 만큼 토큰을 빼고, 모자라면 평균 속도가 rate 를 넘지 않도록 기다립니다.
+    토큰이 음수(빚)가 될 수 있으므로 한 번에 capacity 보다 큰 블록을 읽어도 동작합니다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: 초당 바이트 수
+            capacity: 한 번에 몰아서 쓸 수 있는 최대 토큰 (기본: 1초 분량)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_mbps(cls, mb_per_sec: float) -> Optional["TokenBucket"]:
+        """MB/s(MiB) 로 생성합니다. 0 이하면 제한 없음(None)."""
+        if not mb_per_sec or mb_per_sec <= 0:
+            return None
+        return cls(mb_per_sec * 1024 * 1024)
+
+    def consume(self, amount: int, cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        amount 바이트만큼 토큰을 사용합니다.
+
+        Returns:
+            False 면 기다리는 중에 cancel_event 가 set 됨
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait <= 0:
+            return True
+        if cancel_event is not None:
+            return not cancel_event.wait(wait)
+        time.sleep(wait)
+        return True
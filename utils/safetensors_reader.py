@@ -3,15 +3,286 @@
 SafeTensors 파일 읽기 유틸리티
 """
 import os
+import re
 import json
 import glob
-from typing import Dict, Optional, Tuple, Set
+import math
+import hashlib
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Set
 from safetensors import safe_open
 
 
+# 헤더 길이(8바이트 little-endian u64) 상한. 이보다 크면 손상된 파일로 간주합니다.
+MAX_HEADER_SIZE = 100 * 1024 * 1024
+# 헤더를 읽을 때 처음 한 번에 읽는 크기
+HEADER_PREFETCH_SIZE = 64 * 1024
+
+# safetensors dtype -> 요소 크기(bytes)
+DTYPE_SIZES = {
+    'BOOL': 1, 'U8': 1, 'I8': 1, 'F8_E4M3': 1, 'F8_E5M2': 1,
+    'I16': 2, 'U16': 2, 'F16': 2, 'BF16': 2,
+    'I32': 4, 'U32': 4, 'F32': 4,
+    'I64': 8, 'U64': 8, 'F64': 8,
+}
+
+# __metadata__ 에 들어 있을 수 있는 내장 해시 키 (앞쪽 우선).
+# 둘 다 헤더를 뺀 텐서 데이터 영역의 SHA256 이므로 파일 전체 sha256 이 아니라 tensor_sha256 에 해당합니다.
+EMBEDDED_HASH_KEYS = ['modelspec.hash_sha256', 'sshs_model_hash']
+
+# 인덱스에 저장할 학습 메타데이터 필드 (컬럼명 -> 후보 메타데이터 키, 앞쪽 우선)
+TRAINING_METADATA_FIELDS = {
+    'base_model': ['ss_sd_model_name', 'modelspec.base_model'],
+    'base_model_version': ['ss_base_model_version'],
+    'architecture': ['modelspec.architecture'],
+    'network_module': ['ss_network_module'],
+    'network_dim': ['ss_network_dim'],
+    'network_alpha': ['ss_network_alpha'],
+    'resolution': ['ss_resolution', 'modelspec.resolution'],
+    'epochs': ['ss_num_epochs', 'ss_epoch'],
+    'dataset_dirs': ['ss_dataset_dirs', 'ss_datasets'],
+    'output_name': ['ss_output_name', 'modelspec.title'],
+}
+
+
 class SafeTensorsReader:
     """SafeTensors 파일을 읽는 클래스"""
     
+    @staticmethod
+    def _load_header(file_path: str) -> Tuple[Optional[Dict[str, Any]], int, str]:
+        """
+        헤더를 읽고 (헤더, 헤더 길이, 오류 메시지) 를 반환합니다.
+        대부분의 헤더는 첫 번째 read 한 번으로 끝나도록 앞부분을 넉넉히 읽습니다.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                head = f.read(HEADER_PREFETCH_SIZE)
+                if len(head) < 8:
+                    return None, 0, '파일이 8바이트보다 작음'
+                header_size = struct.unpack('<Q', head[:8])[0]
+                if header_size <= 0 or header_size > MAX_HEADER_SIZE:
+                    return None, header_size, f'헤더 길이가 비정상적임 ({header_size})'
+                header_bytes = head[8:8 + header_size]
+                if len(header_bytes) < header_size:
+                    header_bytes += f.read(header_size - len(header_bytes))
+                if len(header_bytes) != header_size:
+                    return None, header_size, '헤더가 잘려 있음'
+        except OSError as e:
+            return None, 0, f'파일 읽기 실패: {e}'
+        
+        try:
+            header = json.loads(header_bytes.decode('utf-8'))
+        except (UnicodeDecodeError, ValueError) as e:
+            return None, header_size, f'헤더 JSON 파싱 실패: {e}'
+        if not isinstance(header, dict):
+            return None, header_size, '헤더가 JSON 객체가 아님'
+        return header, header_size, ''
+    
+    @staticmethod
+    def read_header(file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        safetensors 파일의 JSON 헤더만 읽습니다 (텐서 데이터는 읽지 않음).
+        
+        Args:
+            file_path: safetensors 파일 경로
+        
+        Returns:
+            헤더 딕셔너리 (텐서 이름 -> 정보, '__metadata__' 포함) 또는 None
+        """
+        header, _, _ = SafeTensorsReader._load_header(file_path)
+        return header
+    
+    @staticmethod
+    def tensor_index_digest(header: Dict[str, Any]) -> str:
+        """
+        __metadata__ 를 뺀 텐서 목록(이름, dtype, shape, data_offsets)의 정규화된 SHA256.
+        메타데이터만 다시 저장한 파일은 같은 값을 가집니다.
+        """
+        index = {
+            name: [info.get('dtype'), info.get('shape'), info.get('data_offsets')]
+            for name, info in header.items()
+            if name != '__metadata__' and isinstance(info, dict)
+        }
+        canonical = json.dumps(index, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def check_integrity(file_path: str) -> Tuple[bool, str]:
+        """
+        헤더의 data_offsets 와 실제 파일 크기를 비교해 잘림/손상 여부를 확인합니다.
+        텐서 데이터는 읽지 않으므로 파일당 작은 read 한 번으로 끝납니다.
+        
+        Args:
+            file_path: safetensors 파일 경로
+        
+        Returns:
+            (정상 여부, 오류 메시지) 튜플
+        """
+        try:
+            file_size = os.path.getsize(file_path)
+        except OSError as e:
+            return False, f'파일 정보 확인 실패: {e}'
+        
+        header, header_size, error = SafeTensorsReader._load_header(file_path)
+        if header is None:
+            return False, error
+        
+        data_size = file_size - 8 - header_size
+        max_end = 0
+        for name, info in header.items():
+            if name == '__metadata__':
+                if not isinstance(info, dict):
+                    return False, '__metadata__ 가 JSON 객체가 아님'
+                continue
+            if not isinstance(info, dict):
+                return False, f'텐서 정보 형식 오류: {name}'
+            offsets = info.get('data_offsets')
+            shape = info.get('shape')
+            if (
+                not isinstance(offsets, list) or len(offsets) != 2
+                or not all(isinstance(v, int) for v in offsets)
+                or not isinstance(shape, list)
+                or not all(isinstance(dim, int) and not isinstance(dim, bool) and dim >= 0 for dim in shape)
+            ):
+                return False, f'텐서 정보 누락: {name}'
+            begin, end = offsets
+            if begin < 0 or end < begin:
+                return False, f'data_offsets 오류: {name} {offsets}'
+            item_size = DTYPE_SIZES.get(info.get('dtype'))
+            if item_size is not None:
+                element_count = 1
+                for dim in shape:
+                    element_count *= dim
+                if element_count * item_size != end - begin:
+                    return False, f'텐서 크기 불일치: {name} ({info.get("dtype")} {shape})'
+            max_end = max(max_end, end)
+        
+        if max_end > data_size:
+            return False, f'파일이 잘림: 필요 {8 + header_size + max_end} bytes, 실제 {file_size} bytes'
+        if max_end < data_size:
+            return False, f'파일 끝에 여분 데이터: {data_size - max_end} bytes'
+        return True, ''
+    
+    @staticmethod
+    def read_metadata(file_path: str) -> Optional[Dict[str, str]]:
+        """
+        safetensors 헤더의 __metadata__ 를 읽습니다.
+        
+        Args:
+            file_path: safetensors 파일 경로
+        
+        Returns:
+            메타데이터 딕셔너리 (없으면 빈 딕셔너리) 또는 읽기 실패 시 None
+        """
+        header = SafeTensorsReader.read_header(file_path)
+        if header is None:
+            return None
+        metadata = header.get('__metadata__')
+        return metadata if isinstance(metadata, dict) else {}
+    
+    @staticmethod
+    def extract_embedded_hash(metadata: Optional[Dict[str, str]]) -> Optional[Tuple[str, str]]:
+        """
+        __metadata__ 의 내장 해시(modelspec.hash_sha256, sshs_model_hash)를 찾습니다.
+        
+        Returns:
+            (메타데이터 키, 소문자 64자리 hex) 또는 None
+        """
+        if not metadata:
+            return None
+        for key in EMBEDDED_HASH_KEYS:
+            value = str(metadata.get(key) or '').strip().lower()
+            if value.startswith('0x'):
+                value = value[2:]
+            if re.fullmatch(r'[0-9a-f]{64}', value):
+                return key, value
+        return None
+    
+    @staticmethod
+    def _parse_int(value: Any) -> Optional[int]:
+        try:
+            return int(float(str(value).strip()))
+        except (TypeError, ValueError, OverflowError):
+            return None
+    
+    @staticmethod
+    def _parse_float(value: Any) -> Optional[float]:
+        """숫자로 읽을 수 없거나 inf / nan 이면 None (범위 검색이 깨지지 않도록 값 없음으로 취급)."""
+        try:
+            number = float(str(value).strip())
+        except (TypeError, ValueError):
+            return None
+        return number if math.isfinite(number) else None
+    
+    @staticmethod
+    def _parse_resolution(value: Any) -> Optional[str]:
+        """'(1024, 1024)', '1024,1024', '1024x1024' 형태를 'WxH' 로 통일합니다."""
+        numbers = re.findall(r'\d+', str(value or ''))
+        if not numbers:
+            return None
+        if len(numbers) == 1:
+            numbers = numbers * 2
+        return f"{numbers[0]}x{numbers[1]}"
+    
+    @staticmethod
+    def _parse_dataset_dirs(value: Any) -> Optional[str]:
+        """ss_dataset_dirs / ss_datasets 에서 폴더명 목록을 JSON 문자열로 추출합니다."""
+        try:
+            data = json.loads(value) if isinstance(value, str) else value
+        except ValueError:
+            return None
+        
+        dirs: List[str] = []
+        if isinstance(data, dict):
+            dirs.extend(str(key) for key in data.keys())
+        elif isinstance(data, list):
+            # ss_datasets: [{"subsets": [{"image_dir": ...}]}]
+            for dataset in data:
+                if not isinstance(dataset, dict):
+                    continue
+                for subset in dataset.get('subsets', []) or []:
+                    if isinstance(subset, dict) and subset.get('image_dir'):
+                        dirs.append(re.split(r'[\\/]', str(subset['image_dir']).rstrip('/\\'))[-1])
+        return json.dumps(dirs, ensure_ascii=False) if dirs else None
+    
+    @staticmethod
+    def extract_training_metadata(metadata: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        ss_* / modelspec.* 메타데이터에서 인덱스용 학습 정보를 추출합니다.
+        
+        Args:
+            metadata: read_metadata() 로 읽은 __metadata__ 딕셔너리
+        
+        Returns:
+            TRAINING_METADATA_FIELDS 의 컬럼명 -> 값 딕셔너리 (없는 값은 None)
+        """
+        result: Dict[str, Any] = {column: None for column in TRAINING_METADATA_FIELDS}
+        if not metadata:
+            return result
+        
+        for column, candidates in TRAINING_METADATA_FIELDS.items():
+            raw = None
+            for candidate in candidates:
+                value = metadata.get(candidate)
+                if value not in (None, '', 'None', 'null'):
+                    raw = value
+                    break
+            if raw is None:
+                continue
+            
+            if column in ('network_dim', 'epochs'):
+                result[column] = SafeTensorsReader._parse_int(raw)
+            elif column == 'network_alpha':
+                result[column] = SafeTensorsReader._parse_float(raw)
+            elif column == 'resolution':
+                result[column] = SafeTensorsReader._parse_resolution(raw)
+            elif column == 'dataset_dirs':
+                result[column] = SafeTensorsReader._parse_dataset_dirs(raw)
+            else:
+                result[column] = str(raw)
+        
+        return result
+    
     @staticmethod
     def extract_ss_tag_frequency(file_path: str) -> Optional[Dict]:
         """
@@ -61,4 +332,32 @@ class SafeTensorsReader:
             key_to_file[key] = file_path
         
         return keys, key_to_file
-
+    
+    @staticmethod
+    def scan_folder(folder_path: str) -> List[Tuple[str, str, os.stat_result]]:
+        """
+        폴더의 safetensors 파일 목록을 stat 정보와 함께 수집합니다 (인벤토리 패스).
+        
+        Args:
+            folder_path: safetensors 파일이 있는 폴더 경로
+        
+        Returns:
+            (키, 파일경로, stat) 튜플 리스트 (키 기준 정렬)
+        """
+        entries: List[Tuple[str, str, os.stat_result]] = []
+        
+        if not os.path.isdir(folder_path):
+            return entries
+        
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                if not entry.name.endswith('.safetensors') or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.name[:-len('.safetensors')], entry.path, stat))
+        
+        entries.sort(key=lambda item: item[0])
+        return entries
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+SafeTensors 헤더(__metadata__) 쓰기 유틸리티
+"""
+import json
+import os
+import shutil
+import struct
+from typing import Any, Dict, Tuple
+
+from .file_hasher import DEFAULT_BLOCK_SIZE
+from .safetensors_reader import MAX_HEADER_SIZE, SafeTensorsReader
+
+
+# 헤더를 새로 쓸 때(느린 경로) 다음 번에 제자리 수정이 가능하도록 남겨 두는 여유 공간
+DEFAULT_HEADER_RESERVE = 4096
+# 텐서 데이터 시작 위치 정렬 (safetensors 공식 구현과 같은 8바이트)
+HEADER_ALIGNMENT = 8
+
+# update_metadata 결과 종류
+MODE_UNCHANGED = "unchanged"
+MODE_INPLACE = "inplace"
+MODE_COPY = "copy"
+# 다시 쓰기가 필요하지만 하드링크로 연결된 파일이라 건드리지 않음
+MODE_LINKED = "linked"
+
+
+class SafeTensorsWriter:
+    """
+    텐서 데이터는 건드리지 않고 safetensors 헤더의 __metadata__ 만 바꾸는 클래스.
+
+    - 새 헤더 JSON 이 기존 헤더 길이 안에 들어가면 뒤를 공백으로 채워 그 자리에 덮어씀 (빠른 경로)
+    - 들어가지 않으면 새 헤더 + 텐서 데이터를 같은 폴더의 임시 파일로 스트리밍 복사한 뒤 os.replace (느린 경로)
+      이때 DEFAULT_HEADER_RESERVE 만큼 공백을 더 넣어 다음 수정은 제자리에서 끝나도록 함
+    - os.replace 는 하드링크를 끊으므로 링크가 여러 개인 파일(st_nlink > 1)은 느린 경로를 타지 않고 MODE_LINKED 반환
+      (제자리 수정은 같은 inode 를 고치므로 모든 링크에 그대로 반영됨)
+    - 데이터 오프셋은 헤더 뒤를 기준으로 한 상대값이므로 헤더 길이가 바뀌어도 그대로 유효
+    """
+
+    @staticmethod
+    def encode_header(header: Dict[str, Any]) -> bytes:
+        return json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def update_metadata(
+        file_path: str,
+        updates: Dict[str, Any],
+        reserve: int = DEFAULT_HEADER_RESERVE,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        dry_run: bool = False,
+        break_links: bool = False,
+    ) -> Tuple[bool, str]:
+        """
+        __metadata__ 에 updates 를 덮어씁니다 (값은 문자열로 저장).
+
+        Args:
+            file_path: safetensors 파일 경로
+            updates: {메타데이터 키: 값}
+            reserve: 느린 경로에서 헤더 뒤에 남길 여유 공간 (bytes)
+            block_size: 느린 경로에서 텐서 데이터를 복사할 때 한 번에 읽을 크기
+            dry_run: True 면 어느 경로를 탈지만 판단하고 파일은 바꾸지 않음
+            break_links: True 면 하드링크 파일도 다시 쓰기 (이 경로만 독립 파일이 됨)
+
+        Returns:
+            (성공 여부, MODE_UNCHANGED / MODE_INPLACE / MODE_COPY / MODE_LINKED 또는 실패 사유)
+        """
+        header, header_size, error = SafeTensorsReader._load_header(file_path)
+        if header is None:
+            return False, error
+
+        metadata = header.get("__metadata__")
+        metadata = dict(metadata) if isinstance(metadata, dict) else {}
+        changes = {key: str(value) for key, value in updates.items() if metadata.get(key) != str(value)}
+        if not changes:
+            return True, MODE_UNCHANGED
+        metadata.update(changes)
+        new_header = dict(header)
+        new_header["__metadata__"] = metadata
+        header_bytes = SafeTensorsWriter.encode_header(new_header)
+
+        if len(header_bytes) <= header_size:
+            if dry_run:
+                return True, MODE_INPLACE
+            try:
+                with open(file_path, "r+b") as f:
+                    f.seek(8)
+                    f.write(header_bytes + b" " * (header_size - len(header_bytes)))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                return False, f"헤더 쓰기 실패: {e}"
+            return True, MODE_INPLACE
+
+        new_size = len(header_bytes) + max(0, int(reserve))
+        new_size += -(8 + new_size) % HEADER_ALIGNMENT
+        if new_size > MAX_HEADER_SIZE:
+            return False, f"헤더가 너무 큼 ({new_size})"
+        if not break_links:
+            try:
+                if os.stat(file_path).st_nlink > 1:
+                    return True, MODE_LINKED
+            except OSError as e:
+                return False, f"파일 정보 읽기 실패: {e}"
+        if dry_run:
+            return True, MODE_COPY
+        return SafeTensorsWriter._rewrite(file_path, header_size, header_bytes, new_size, block_size)
+
+    @staticmethod
+    def _rewrite(
+        file_path: str, header_size: int, header_bytes: bytes, new_size: int, block_size: int
+    ) -> Tuple[bool, str]:
+        """새 헤더 + 기존 텐서 데이터를 임시 파일로 복사한 뒤 원본과 바꿉니다."""
+        temp_path = os.path.join(
+            os.path.dirname(file_path), f".{os.path.basename(file_path)}.stamp-{os.getpid()}"
+        )
+        try:
+            data_size = os.path.getsize(file_path) - 8 - header_size
+            with open(file_path, "rb") as src, open(temp_path, "wb") as dst:
+                dst.write(struct.pack("<Q", new_size))
+                dst.write(header_bytes + b" " * (new_size - len(header_bytes)))
+                src.seek(8 + header_size)
+                shutil.copyfileobj(src, dst, max(64 * 1024, int(block_size)))
+                dst.flush()
+                os.fsync(dst.fileno())
+            if os.path.getsize(temp_path) != 8 + new_size + data_size:
+                raise OSError("복사한 크기가 맞지 않음")
+            shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+        except OSError as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False, f"다시 쓰기 실패: {e}"
+        return True, MODE_COPY
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+YAML 파싱 결과 캐시 유틸리티
+"""
+import hashlib
+import os
+import pickle
+from typing import Any, Tuple
+
+
+# 캐시 파일 형식이 바뀌면 올려서 예전 캐시를 무시
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".pickle"
+
+
+class YAMLCache:
+    """
+    YAML 파일의 파싱 결과를 pickle 로 저장해 두고, 파일이 그대로면 다시 파싱하지 않는 캐시.
+
+    - 캐시 파일은 (절대 경로, 로더 종류) 마다 하나이며, 안에 (size, mtime_ns) 를 같이 저장
+      -> 키는 (경로, size, mtime_ns, 로더 종류), 파일이 바뀌면 같은 캐시 파일을 덮어씀
+    - 적중할 때마다 캐시 파일의 mtime 을 갱신하고, 전체 크기가 max_bytes 를 넘으면 오래 안 쓴 것부터 삭제
+    - 매번 pickle 에서 새로 만들어 반환하므로 호출한 쪽이 결과를 수정해도 캐시에는 영향 없음
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: 캐시 파일을 저장할 폴더
+            max_bytes: 캐시 폴더 전체 크기 상한 (bytes)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max(0, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, yml_path: str, loader_kind: str) -> str:
+        key = f"{os.path.normcase(os.path.abspath(yml_path))}|{loader_kind}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + CACHE_SUFFIX)
+
+    def get(self, yml_path: str, stat: os.stat_result, loader_kind: str) -> Tuple[bool, Any]:
+        """
+        Returns:
+            (적중 여부, 파싱 결과)
+        """
+        entry_path = self._entry_path(yml_path, loader_kind)
+        try:
+            with open(entry_path, "rb") as f:
+                version, size, mtime_ns, data = pickle.load(f)
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError, AttributeError, ImportError):
+            self.misses += 1
+            return False, None
+        if (version, size, mtime_ns) != (CACHE_VERSION, stat.st_size, stat.st_mtime_ns):
+            self.misses += 1
+            return False, None
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        self.hits += 1
+        return True, data
+
+    def put(self, yml_path: str, stat: os.stat_result, loader_kind: str, data: Any) -> None:
+        """파싱 결과를 저장합니다. 실패해도 예외를 내지 않습니다 (캐시는 없어도 동작)."""
+        entry_path = self._entry_path(yml_path, loader_kind)
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                pickle.dump((CACHE_VERSION, stat.st_size, stat.st_mtime_ns, data), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry_path)
+        except (OSError, pickle.PicklingError, TypeError, RecursionError) as e:
+            print(f"  경고: YAML 캐시 저장 실패 - {e}")
+            if os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """전체 크기가 max_bytes 이하가 될 때까지 오래 안 쓴 캐시 파일을 지웁니다. 지운 개수를 반환."""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(CACHE_SUFFIX):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            return 0
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def clear(self) -> int:
+        """캐시 파일을 모두 지웁니다."""
+        max_bytes, self.max_bytes = self.max_bytes, 0
+        try:
+            return self.evict()
+        finally:
+            self.max_bytes = max_bytes
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+YAML 문서 세션 유틸리티 (한 번 읽고, 메모리에서 여러 단계 수정, 한 번 저장)
+"""
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from ruamel.yaml.comments import CommentedMap
+
+from .yaml_handler import YAMLHandler
+
+
+def _freeze(value: Any) -> Any:
+    """값 비교용 스냅샷 (키 순서와 스칼라 타입(따옴표 종류 등)까지 포함, 주석은 제외)."""
+    if isinstance(value, dict):
+        return ("map", tuple((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return ("seq", tuple(_freeze(item) for item in value))
+    return (type(value).__name__, value)
+
+
+def _count_top_level_keys(text: str) -> int:
+    """들여쓰지 않은 키 줄 수를 셉니다 (빈 줄 / 주석 / 문서 표시 / 빈 키('') 줄 제외)."""
+    count = 0
+    for line in text.lstrip("\ufeff").splitlines():
+        if not line.strip() or line[0] in " \t#" or line.startswith(("---", "...", "''", '""')):
+            continue
+        count += 1
+    return count
+
+
+def _comment_text(value: Any) -> Any:
+    """ruamel 주석 토큰(또는 토큰 목록)의 텍스트만 뽑습니다."""
+    if isinstance(value, list):
+        return tuple(_comment_text(item) for item in value)
+    return getattr(value, "value", None)
+
+
+def _nested_comments(value: Any) -> Any:
+    """값 안쪽(하위 매핑/시퀀스)에 달린 주석 스냅샷. 주석만 바뀐 항목도 다시 출력하기 위해 사용."""
+    if not isinstance(value, (dict, list)):
+        return None
+    ca = getattr(value, "ca", None)
+    own = (
+        (_comment_text(ca.comment), tuple((key, _comment_text(item)) for key, item in ca.items.items()))
+        if ca is not None else None
+    )
+    children = value.values() if isinstance(value, dict) else value
+    return own, tuple(_nested_comments(item) for item in children)
+
+
+class YAMLDocument:
+    """
+    YAML 파일 하나를 주석 보존(ruamel) 방식으로 한 번만 파싱하고,
+    여러 처리 단계가 같은 메모리 트리(data)를 고친 뒤 마지막에 한 번만 저장하는 세션.
+
+    - 단계마다 load / save 를 반복하던 파이프라인(sync_char_yml, sync_checkpoint_yml)용
+    - 텍스트로 만든 새 항목은 append_text 로 파싱해서 트리에 합침 (파일에 덧붙인 뒤 다시 읽는 것과 같은 결과)
+    - 수정한 단계는 mark_dirty() 를 호출하고, save() 는 결과 텍스트가 원본과 다를 때만 씀
+    - 로드할 때 최상위 키마다 원본 텍스트의 줄 범위를 기록해 두고, 저장할 때는
+      바뀌거나 추가된 항목만 다시 출력해서 원본 텍스트에 끼워 넣음 (손대지 않은 항목은 바이트 그대로)
+      최상위 키 순서가 바뀌는 등 끼워 넣을 수 없는 경우에는 전체를 다시 출력
+    """
+
+    def __init__(self, yml_path: str, yaml_handler: Optional[YAMLHandler] = None, patch: bool = True):
+        """
+        Args:
+            yml_path: YAML 파일 경로
+            yaml_handler: 파싱/출력에 사용할 YAMLHandler (없으면 중복 키 허용으로 새로 생성)
+            patch: False 면 저장할 때 항상 전체를 다시 출력
+        """
+        self.yml_path = yml_path
+        self.yaml_handler = yaml_handler or YAMLHandler(allow_duplicate_keys=True)
+        self.patch = patch
+        self.data: Any = None
+        self.text: Optional[str] = None
+        self.dirty = False
+        # 최상위 키 -> 원본 텍스트의 (시작, 끝) 문자 위치 / 로드 시점 값 스냅샷
+        self._spans: Optional[Dict[Any, Tuple[int, int]]] = None
+        self._snapshot: Dict[Any, Any] = {}
+        # 마지막 render() 에서 다시 출력한 키 (전체 출력이면 None)
+        self.rendered_keys: Optional[List[str]] = None
+
+    def load(self) -> bool:
+        """
+        파일을 읽어 data 에 파싱합니다.
+
+        Returns:
+            성공 여부 (파일이 없거나 파싱 실패 시 False, 오류 메시지 출력)
+        """
+        if not os.path.exists(self.yml_path):
+            print(f"  경고: YML 파일이 존재하지 않습니다: {self.yml_path}")
+            return False
+        try:
+            with open(self.yml_path, "r", encoding="utf-8") as f:
+                self.text = f.read()
+            self.data = self.yaml_handler.loads(self.text)
+        except Exception as e:
+            print(f"  오류: YML 파일 읽기 실패: {e}")
+            self.data = None
+            return False
+        if self.data is None:
+            self.data = self.yaml_handler.loads("{}")
+        self.dirty = False
+        self._index()
+        return True
+
+    def _index(self) -> None:
+        """최상위 키별 원본 줄 범위와 값 스냅샷을 기록합니다. 기록할 수 없으면 _spans 는 None."""
+        self._spans = None
+        self._snapshot = {}
+        if not self.patch or not isinstance(self.data, CommentedMap) or not self.text:
+            return
+        try:
+            starts = [self._start_line(key) for key in self.data]
+        except (AttributeError, KeyError, TypeError):
+            return
+        if any(later <= earlier for earlier, later in zip(starts, starts[1:])):
+            return
+
+        line_offsets = [0]
+        for line in self.text.splitlines(keepends=True):
+            line_offsets.append(line_offsets[-1] + len(line))
+        if starts and starts[-1] >= len(line_offsets) - 1:
+            return
+        # 중복 키가 있으면 뒤에 나온 같은 키 줄이 다른 항목의 범위 안에 남으므로 전체 출력으로 처리
+        # ('' 키는 여러 개를 텍스트 단계에서 따로 맞추므로 세지 않음)
+        if _count_top_level_keys(self.text) != sum(1 for key in self.data if key != ""):
+            return
+
+        bounds = [line_offsets[line] for line in starts] + [len(self.text)]
+        self._spans = {key: (bounds[i], bounds[i + 1]) for i, key in enumerate(self.data)}
+        self._snapshot = {key: self._entry_state(key) for key in self.data}
+
+    def _start_line(self, key: Any) -> int:
+        """항목이 시작하는 줄 (키 앞에 붙은 주석이 있으면 그 주석 줄부터, 다시 출력할 때 주석도 같이 나오므로)."""
+        line = self.data.lc.key(key)[0]
+        item = self.data.ca.items.get(key)
+        if item and len(item) > 1 and isinstance(item[1], list):
+            for token in item[1]:
+                mark = getattr(token, "start_mark", None)
+                if mark is not None:
+                    line = min(line, mark.line)
+        return line
+
+    def _entry_state(self, key: Any) -> Any:
+        value = self.data[key]
+        return _freeze(value), _comment_text(self.data.ca.items.get(key)), _nested_comments(value)
+
+    def _render_entry(self, key: Any) -> str:
+        """최상위 항목 하나만 출력합니다 (키에 달린 주석 포함)."""
+        single = CommentedMap()
+        single[key] = self.data[key]
+        if key in self.data.ca.items:
+            single.ca.items[key] = self.data.ca.items[key]
+        return self.yaml_handler.dumps(single)
+
+    def _render_patched(self) -> Optional[str]:
+        """바뀐/추가된 항목만 다시 출력해서 원본 텍스트에 끼워 넣습니다. 불가능하면 None."""
+        spans = self._spans
+        if spans is None or not isinstance(self.data, CommentedMap):
+            return None
+        keys = list(self.data.keys())
+        kept = [key for key in keys if key in spans]
+        # 기존 키는 원래 순서 그대로여야 하고, 새 키는 모두 뒤에 붙어 있어야 함
+        if kept != [key for key in spans if key in self.data] or keys[:len(kept)] != kept:
+            return None
+
+        rendered: List[str] = []
+        first_start = min((start for start, _ in spans.values()), default=len(self.text))
+        parts = [self.text[:first_start]]
+        for key, (start, end) in spans.items():
+            if key not in self.data:
+                continue
+            if self._entry_state(key) == self._snapshot[key]:
+                parts.append(self.text[start:end])
+                continue
+            entry_text = self._render_entry(key)
+            # 주석 토큰 위치만 달라지고 출력은 같은 경우(다시 정렬한 항목 등)는 원본 바이트 그대로
+            if entry_text == self.text[start:end]:
+                parts.append(entry_text)
+                continue
+            parts.append(entry_text)
+            rendered.append(str(key))
+        for key in keys[len(kept):]:
+            if parts and not parts[-1].endswith("\n"):
+                parts.append("\n")
+            parts.append(self._render_entry(key))
+            rendered.append(str(key))
+        self.rendered_keys = rendered
+        return "".join(parts)
+
+    def keys(self) -> List[str]:
+        """최상위 키 목록 (빈 키 제외)."""
+        if not isinstance(self.data, dict):
+            return []
+        return [str(key) for key in self.data.keys() if key]
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+
+    def append_text(self, text: str) -> List[str]:
+        """
+        최상위 항목들을 담은 YAML 텍스트를 파싱해서 트리 끝에 추가합니다 (키에 달린 주석 포함).
+
+        Returns:
+            추가한 키 목록
+        """
+        snippet = self.yaml_handler.loads(text)
+        if not isinstance(snippet, dict):
+            return []
+        snippet_comments = getattr(snippet, "ca", None)
+        added: List[str] = []
+        for key, value in snippet.items():
+            self.data[key] = value
+            if snippet_comments is not None and key in snippet_comments.items:
+                self.data.ca.items[key] = snippet_comments.items[key]
+            added.append(str(key))
+        if added:
+            self.dirty = True
+        return added
+
+    def render(self) -> str:
+        """지금 저장하면 쓰일 텍스트 (수정이 없으면 원본 그대로)."""
+        if not self.dirty and self.text is not None:
+            self.rendered_keys = []
+            return self.text
+        patched = self._render_patched()
+        if patched is not None:
+            return patched
+        self.rendered_keys = None
+        return self.yaml_handler.dumps(self.data)
+
+    def save(self, text: Optional[str] = None) -> bool:
+        """
+        render() 결과(또는 후처리한 text)를 저장합니다. 원본과 같으면 쓰지 않습니다.
+
+        Args:
+            text: render() 결과를 텍스트 단계에서 더 고친 최종 텍스트 (없으면 render())
+
+        Returns:
+            성공 여부 (쓸 필요가 없었던 경우도 True)
+        """
+        if text is None:
+            text = self.render()
+        if text == self.text:
+            self.dirty = False
+            return True
+        if not self.yaml_handler.save_text(self.yml_path, text):
+            return False
+        self.text = text
+        self.dirty = False
+        # 트리의 줄 정보는 예전 텍스트 기준이므로, 같은 세션에서 다시 저장하면 전체 출력
+        self._spans = None
+        return True
@@ -2,14 +2,29 @@
 """
 YAML 파일 처리 유틸리티
 """
+import io
 import os
-from typing import Dict, Any, Optional
+from typing import IO, Dict, Any, Optional, Union
+
+import yaml as yaml_lib
 from ruamel.yaml import YAML
 
+from .yaml_cache import YAMLCache
+
+
+# 읽기 전용 경로에서 사용할 PyYAML 로더 (libyaml 로 빌드된 경우 C 구현, 없으면 순수 파이썬)
+FAST_SAFE_LOADER = getattr(yaml_lib, "CSafeLoader", yaml_lib.SafeLoader)
+HAS_LIBYAML = FAST_SAFE_LOADER is not yaml_lib.SafeLoader
+# 파싱 결과 캐시 키에 들어가는 로더 종류
+READONLY_LOADER_KIND = f"safe:{FAST_SAFE_LOADER.__name__}"
+
 
 class YAMLHandler:
     """YAML 파일을 읽고 쓰는 클래스 (주석 보존)"""
     
+    # 읽기 전용 로드(load_readonly / load_simple)에 쓰는 파싱 결과 캐시 (enable_cache 로 켬)
+    _cache: Optional[YAMLCache] = None
+    
     def __init__(self, allow_duplicate_keys: bool = True):
         """
         Args:
@@ -42,6 +57,16 @@ class YAMLHandler:
             print(f"  오류: YML 파일 읽기 실패: {e}")
             return None
     
+    def loads(self, text: str) -> Any:
+        """YAML 문자열을 주석 보존(ruamel) 방식으로 파싱합니다. 오류는 그대로 전달됩니다."""
+        return self.yaml.load(text)
+    
+    def dumps(self, yml_data: Any) -> str:
+        """save 와 같은 형식의 YAML 문자열을 반환합니다."""
+        stream = io.StringIO()
+        self.yaml.dump(yml_data, stream)
+        return stream.getvalue()
+    
     def save(self, yml_path: str, yml_data: Dict[str, Any]) -> bool:
         """
         YAML 파일을 저장합니다.
@@ -50,11 +75,25 @@ class YAMLHandler:
             yml_path: YAML 파일 경로
             yml_data: 저장할 YAML 데이터
         
+        Returns:
+            성공 여부
+        """
+        try:
+            text = self.dumps(yml_data)
+        except Exception as e:
+            print(f"  오류: YML 파일 저장 실패: {e}")
+            return False
+        return self.save_text(yml_path, text)
+    
+    @staticmethod
+    def save_text(yml_path: str, text: str) -> bool:
+        """
+        이미 만들어 둔 YAML 텍스트를 같은 폴더의 임시 파일에 쓴 뒤 원본과 교체합니다.
+        
         Returns:
             성공 여부
         """
         import tempfile
-        import os
         import shutil
         
         temp_path = None
@@ -68,8 +107,8 @@ class YAMLHandler:
                 delete=False,
                 suffix='.tmp'
             ) as temp_file:
-                self.yaml.dump(yml_data, temp_file)
                 temp_path = temp_file.name
+                temp_file.write(text)
             
             # 임시 파일을 원본 파일로 atomic하게 교체
             try:
@@ -89,10 +128,54 @@ class YAMLHandler:
                     pass
             return False
     
+    @staticmethod
+    def safe_load(stream: Union[str, IO[str]]) -> Any:
+        """
+        yaml.safe_load 와 같은 결과를 반환하되, libyaml 이 있으면 CSafeLoader 로 파싱합니다.
+        다시 저장하지 않는(읽기 전용) 곳에서만 사용하세요. 오류는 호출한 쪽으로 그대로 전달됩니다.
+        
+        Args:
+            stream: YAML 문자열 또는 열린 텍스트 파일
+        """
+        return yaml_lib.load(stream, Loader=FAST_SAFE_LOADER)
+    
+    @classmethod
+    def enable_cache(cls, cache_dir: str, max_mb: float = 256) -> None:
+        """읽기 전용 로드 결과를 cache_dir 에 캐시합니다 (최대 max_mb MiB)."""
+        cls._cache = YAMLCache(cache_dir, int(max_mb * 1024 * 1024))
+    
+    @classmethod
+    def enable_cache_from_config(cls, config) -> None:
+        """config.yml 의 yaml_cache: 설정대로 캐시를 켭니다 (ConfigLoader 를 받음)."""
+        cache_config = config.get_yaml_cache_config()
+        if cache_config['enabled']:
+            cls.enable_cache(cache_config['dir'], cache_config['max_mb'])
+    
+    @classmethod
+    def load_readonly(cls, yml_path: str) -> Any:
+        """
+        읽기 전용 로드: safe_load(libyaml) + 파싱 결과 캐시 (캐시는 enable_cache 로 켠 경우만).
+        파일이 없거나 파싱에 실패하면 예외를 그대로 전달합니다.
+        
+        Args:
+            yml_path: YAML 파일 경로
+        """
+        stat = os.stat(yml_path)
+        cache = cls._cache
+        if cache is not None:
+            hit, data = cache.get(yml_path, stat, READONLY_LOADER_KIND)
+            if hit:
+                return data
+        with open(yml_path, 'r', encoding='utf-8') as f:
+            data = cls.safe_load(f)
+        if cache is not None:
+            cache.put(yml_path, stat, READONLY_LOADER_KIND, data)
+        return data
+    
     @staticmethod
     def load_simple(yml_path: str) -> Optional[Dict[str, Any]]:
         """
-        간단한 YAML 파일 로드 (PyYAML 사용, 주석 보존 안함)
+        간단한 YAML 파일 로드 (PyYAML 사용, 주석 보존 안함, 읽기 전용)
         
         Args:
             yml_path: YAML 파일 경로
@@ -100,14 +183,11 @@ class YAMLHandler:
         Returns:
             YAML 데이터 또는 None
         """
-        import yaml as yaml_lib
-        
         if not os.path.exists(yml_path):
             return None
         
         try:
-            with open(yml_path, 'r', encoding='utf-8') as f:
-                return yaml_lib.safe_load(f)
+            return YAMLHandler.load_readonly(yml_path)
         except Exception as e:
             print(f"  오류: YML 파일 읽기 실패: {e}")
             return None
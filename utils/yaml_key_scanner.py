@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+YAML 최상위 키 스캐너 (전체 파싱 없이 줄 단위로 키만 추출)
+"""
+import os
+import re
+from typing import Any, List, Optional, Set, Tuple
+
+import yaml as yaml_lib
+
+from .yaml_handler import YAMLHandler
+
+
+# 평범한(따옴표 없는) 키가 이 문자로 시작하면 YAML 지시자일 수 있으므로 실제 파싱으로 넘김
+PLAIN_KEY_INDICATORS = set("-?:,[]{}#&*!|>'\"%@`")
+PLAIN_KEY_SEPARATOR = re.compile(r":(?:[ \t]|$)")
+# 값 뒤에 올 수 있는 것: 공백, 또는 공백 뒤의 주석
+TRAILING_COMMENT = re.compile(r"(?:[ \t]+(?:#.*)?)?$")
+# 블록 스칼라 헤더 (|, >-, |2+ 등) 뒤에는 주석만 올 수 있음
+BLOCK_SCALAR_HEADER = re.compile(r"[|>](?:[1-9][-+]?|[-+][1-9]?)?")
+STR_TAG = "tag:yaml.org,2002:str"
+# 평범한 키가 문자열인지 판단할 때 읽기 전용 로드(safe_load)와 같은 규칙을 사용
+_RESOLVER = yaml_lib.resolver.Resolver()
+
+
+class YAMLKeyScanner:
+    """
+    우리 yml 파일(최상위가 블록 매핑인 char.yml / lora.yml / checkpoint.yml 등)에서
+    최상위 키만 줄 단위로 뽑는 클래스.
+
+    - 들여쓰기 없이 시작하는 줄만 보고, 들여쓴 줄 / 빈 줄 / 주석 줄은 건너뜀
+    - 키 형식: 따옴표 없는 키, '작은따옴표' 키('' 이스케이프 포함), "큰따옴표" 키(역슬래시 이스케이프 없는 경우)
+    - 처리할 수 없는 구조(여러 문서, 플로우 매핑, 여러 줄에 걸친 키/값, 태그, 앵커 키 등)나
+      값 뒤에 주석이 아닌 내용이 남는 줄('foo: bar: baz', "k: 'a' 'b'", 'k: "a"b' 처럼 잘못된 값)을 만나면
+      None 을 반환하고, load_keys 는 실제 파싱(YAMLHandler.load_readonly)으로 대신함
+    - 들여쓴 값 부분의 문법은 검사하지 않으므로, 파일을 고쳐 저장하는 쪽은 여전히 실제로 파싱해야 함
+    """
+
+    @staticmethod
+    def _scan_quoted(line: str) -> Optional[Tuple[str, int]]:
+        """줄 맨 앞의 따옴표 키를 읽습니다. (키, 닫는 따옴표 다음 위치) 또는 None."""
+        quote = line[0]
+        if quote == "'":
+            chars = []
+            pos = 1
+            while pos < len(line):
+                if line[pos] == "'":
+                    if line[pos + 1:pos + 2] == "'":
+                        chars.append("'")
+                        pos += 2
+                        continue
+                    return "".join(chars), pos + 1
+                chars.append(line[pos])
+                pos += 1
+            return None
+
+        end = line.find('"', 1)
+        if end < 0 or "\\" in line[1:end]:
+            return None
+        return line[1:end], end + 1
+
+    @staticmethod
+    def _value_is_simple(value: str) -> bool:
+        """
+        키 뒤의 값이 한 줄 안에서 끝나는 단순한 형태인지 확인합니다.
+        (따옴표/플로우 값은 같은 줄에서 닫히고 그 뒤에 주석만 있어야 하며,
+        평범한 값 안에는 ': ' 가 없어야 함. 아니면 실제 파싱으로 넘겨 오류를 그대로 드러냄)
+        """
+        if not value or value[0] == "#":
+            return True
+        if value[0] in "|>":
+            header = BLOCK_SCALAR_HEADER.match(value)
+            return TRAILING_COMMENT.match(value, header.end()) is not None
+        if value[0] in "'\"{[":
+            end = YAMLKeyScanner._closing_end(value)
+            return end is not None and TRAILING_COMMENT.match(value, end) is not None
+        # 앵커/태그/별칭이 붙은 값이나 평범한 값이 될 수 없는 지시자는 실제 파싱으로 넘김
+        if value[0] in ",]}&*!%@`" or (value[0] in "-?:" and value[1:2] in ("", " ", "\t")):
+            return False
+        comment = re.search(r"[ \t]#", value)
+        plain = value[:comment.start()] if comment else value
+        return PLAIN_KEY_SEPARATOR.search(plain) is None
+
+    @staticmethod
+    def _closing_end(value: str) -> Optional[int]:
+        """따옴표/플로우 컬렉션으로 시작하는 값이 같은 줄에서 닫히는 위치 다음을 반환합니다. 안 닫히면 None."""
+        depth = 0
+        quote = None
+        pos = 0
+        while pos < len(value):
+            char = value[pos]
+            if quote == "'":
+                if char == "'":
+                    if value[pos + 1:pos + 2] == "'":
+                        pos += 1
+                    else:
+                        quote = None
+            elif quote == '"':
+                if char == "\\":
+                    pos += 1
+                elif char == '"':
+                    quote = None
+            elif char in "'\"":
+                quote = char
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+            elif char == "#" and depth == 0 and value[pos - 1:pos] in (" ", "\t"):
+                break
+            if quote is None and depth == 0:
+                return pos + 1
+            pos += 1
+        return None
+
+    @staticmethod
+    def _scan_line(line: str) -> Optional[str]:
+        """최상위 키 한 줄을 읽어 키를 반환합니다. 처리할 수 없으면 None."""
+        if line[0] in "'\"":
+            scanned = YAMLKeyScanner._scan_quoted(line)
+            if scanned is None:
+                return None
+            key, pos = scanned
+            rest = line[pos:].lstrip(" \t")
+            if not rest.startswith(":"):
+                return None
+            value = rest[1:]
+            if value and value[0] not in " \t":
+                return None
+        else:
+            if line[0] in PLAIN_KEY_INDICATORS:
+                return None
+            match = PLAIN_KEY_SEPARATOR.search(line)
+            if match is None:
+                return None
+            key = line[:match.start()].rstrip(" \t")
+            if not key or " #" in key or "\t#" in key:
+                return None
+            # 숫자/불리언/null 처럼 문자열이 아닌 키로 읽히는 경우
+            if _RESOLVER.resolve(yaml_lib.ScalarNode, key, (True, False)) != STR_TAG:
+                return None
+            value = line[match.end():]
+
+        if not YAMLKeyScanner._value_is_simple(value.strip(" \t")):
+            return None
+        return key
+
+    @staticmethod
+    def scan_text(text: str) -> Optional[List[str]]:
+        """
+        YAML 텍스트에서 최상위 키를 순서대로 뽑습니다 (중복 키도 그대로 포함).
+
+        Returns:
+            키 목록, 처리할 수 없는 구조가 있으면 None
+        """
+        keys: List[str] = []
+        document_started = False
+        if text.startswith("\ufeff"):
+            text = text[1:]
+        for line in text.splitlines():
+            if not line or line[0] in " \t#":
+                continue
+            if line.startswith("---") and line[3:4] in ("", " ", "\t"):
+                # 첫 문서 시작 표시만 허용 (같은 줄에 내용이 있거나 두 번째 문서면 실제 파싱)
+                rest = line[3:].strip(" \t")
+                if keys or document_started or (rest and not rest.startswith("#")):
+                    return None
+                document_started = True
+                continue
+            key = YAMLKeyScanner._scan_line(line.rstrip("\r"))
+            if key is None:
+                return None
+            keys.append(key)
+        return keys
+
+    @staticmethod
+    def scan_file(yml_path: str) -> Optional[List[str]]:
+        """파일을 읽어 scan_text 합니다. 처리할 수 없으면 None (읽기 오류는 그대로 전달)."""
+        with open(yml_path, "r", encoding="utf-8") as f:
+            return YAMLKeyScanner.scan_text(f.read())
+
+    @staticmethod
+    def load_keys(yml_path: str) -> Optional[Set[Any]]:
+        """
+        최상위 키 집합을 반환합니다. 스캐너로 처리할 수 없는 파일은 실제로 파싱합니다.
+
+        Args:
+            yml_path: YAML 파일 경로
+
+        Returns:
+            키 집합 (빈 파일이면 빈 집합) 또는 None (파일이 없거나 읽기/파싱 실패, load_simple 과 같음)
+        """
+        if not os.path.exists(yml_path):
+            return None
+        try:
+            keys = YAMLKeyScanner.scan_file(yml_path)
+            if keys is not None:
+                return set(keys)
+            yml_data = YAMLHandler.load_readonly(yml_path)
+        except Exception as e:
+            print(f"  오류: YML 파일 읽기 실패: {e}")
+            return None
+        if isinstance(yml_data, dict):
+            return set(yml_data.keys())
+        return set()